@@ -0,0 +1,84 @@
+"""
+Precomputed representative analyses for one snapshot
+Built alongside the snapshot's indexes, so /analyze and exports read a table instead of re-deriving
+each profile; entries are reused from the previous snapshot's table for members whose analyzed
+fields are unchanged, so a refresh only analyzes the legislators whose records changed.
+"""
+import dataclasses
+import hashlib
+import json
+from typing import Callable, Dict, Iterator, List, Optional
+from models import Representative, RepresentativeAnalysis
+
+# The record fields an analysis reads; contact details and profile links don't affect it
+ANALYZED_FIELDS = ('name', 'party', 'district', 'chamber', 'occupation', 'committees', 'bio')
+
+def analysis_fingerprint(rep: Representative) -> str:
+    """Hash of the fields an analysis depends on (works for compact records too)"""
+    values = []
+    for field in ANALYZED_FIELDS:
+        value = getattr(rep, field, None)
+        values.append(getattr(value, 'value', value))  # Enums by value
+    return hashlib.sha1(json.dumps(values).encode('utf-8')).hexdigest()
+
+class AnalysisTable:
+    """One analysis per member, in member order, looked up by record or fingerprint"""
+
+    def __init__(self, members: List[Representative],
+                 analyze: Callable[[List[Representative]], List[RepresentativeAnalysis]],
+                 previous: Optional['AnalysisTable'] = None):
+        self.members = members
+        self.fingerprints = [analysis_fingerprint(rep) for rep in members]
+        self.analyses: List[Optional[RepresentativeAnalysis]] = [None] * len(members)
+        stale = []
+        for member_id, (rep, fingerprint) in enumerate(zip(members, self.fingerprints)):
+            reused = previous._by_fingerprint.get(fingerprint) if previous is not None else None
+            if reused is None:
+                stale.append(member_id)
+            else:
+                # Point the entry at this snapshot's record, which may differ in unanalyzed fields
+                self.analyses[member_id] = reused if reused.representative is rep else \
+                    dataclasses.replace(reused, representative=rep)
+        for member_id, analysis in zip(stale, analyze([members[member_id] for member_id in stale])):
+            self.analyses[member_id] = analysis
+        self.computed = len(stale)
+        self.reused = len(members) - len(stale)
+
+        self._ids: Dict[int, int] = {id(rep): member_id for member_id, rep in enumerate(members)}
+        self._by_fingerprint: Dict[str, RepresentativeAnalysis] = {}
+        for fingerprint, analysis in zip(self.fingerprints, self.analyses):
+            self._by_fingerprint.setdefault(fingerprint, analysis)
+
+    def get(self, rep: Representative) -> Optional[RepresentativeAnalysis]:
+        """The analysis of a member record, or None for a record the table doesn't cover"""
+        member_id = self._ids.get(id(rep))
+        if member_id is not None and self.members[member_id] is rep:
+            return self.analyses[member_id]
+        analysis = self._by_fingerprint.get(analysis_fingerprint(rep))
+        if analysis is not None and analysis.representative is not rep:
+            analysis = dataclasses.replace(analysis, representative=rep)
+        return analysis
+
+    def __len__(self) -> int:
+        return len(self.analyses)
+
+    def __iter__(self) -> Iterator[RepresentativeAnalysis]:
+        return iter(self.analyses)
+
+    def rows(self) -> List[Dict]:
+        """Flat rows for exports and dashboards"""
+        return [{
+            'name': analysis.representative.name,
+            'district': analysis.representative.district,
+            'chamber': analysis.representative.chamber.value,
+            'party': analysis.representative.party.value,
+            'key_issues': list(analysis.key_issues),
+            'background_summary': analysis.background_summary,
+            'political_positions': dict(analysis.political_positions),
+            'seat_risk_score': analysis.seat_risk_score,
+            'likely_challengers': list(analysis.likely_challengers)
+        } for analysis in self.analyses]
+
+    def stats(self) -> Dict[str, int]:
+        """Entries, and how many were analyzed for this snapshot or carried over from the last"""
+        return {'analyses': len(self.analyses), 'computed': self.computed, 'reused': self.reused}
@@ -1,57 +1,147 @@
-import openai
-from typing import List, Dict, Optional
-from models import Representative, ProblemAnalysis, RepresentativeAnalysis
+import dataclasses
+import json
+from typing import List, Dict, Optional, Tuple
+from models import Representative, ProblemAnalysis, RepresentativeAnalysis, Party
+from legislature_index import CommitteeIndex
+from issue_lexicon import ISSUE_LEXICON, IssueMatcher
+from relevance import RelevanceRanker
+from llm_client import LLMClient
+from analysis_table import AnalysisTable
 
 class RepresentativeAnalyzer:
-    def __init__(self, api_key: Optional[str] = None):
-        self.client = openai.OpenAI(api_key=api_key) if api_key else None
+    # Committee mapping based on common Idaho legislative issues
+    COMMITTEE_MAPPING = {
+        'agriculture': ['Agriculture Affairs', 'Agricultural Affairs'],
+        'business': ['Commerce & Human Resources', 'Business'],
+        'education': ['Education', 'Educational Affairs'],
+        'environment': ['Environment, Energy & Technology', 'Resources & Environment'],
+        'health': ['Health & Welfare'],
+        'transportation': ['Transportation & Defense'],
+        'taxes': ['Revenue & Taxation', 'Ways & Means'],
+        'law enforcement': ['Judiciary, Rules & Administration'],
+        'government': ['State Affairs', 'Local Government'],
+        'budget': ['Joint Finance-Appropriations Committee', 'Ways & Means'],
+        'natural resources': ['Resources & Conservation', 'Resources & Environment']
+    }
+    MIN_ISSUE_SCORE = 1.0  # Summed term weight an issue needs before its committees are recommended
+    RELEVANCE_CUTOFF = 0.25  # Ranked committees and representatives kept, as a fraction of the top score
     
-    def analyze_problem(self, problem_description: str, all_reps: List[Representative]) -> ProblemAnalysis:
+    SYSTEM_PROMPT = ("You advise Idaho residents on working with the Idaho Legislature. "
+                     "Answer with a single JSON object and nothing else.")
+    PROBLEM_PROMPT = ("Problem: {problem}\nCommittees with jurisdiction: {committees}\n"
+                      "Legislators to contact: {representatives}\n"
+                      'Reply as {{"strategy": "<2-3 sentences>", "talking_points": ["<3-5 short points>"]}}.')
+    REPRESENTATIVE_PROMPT = ("Legislator: {name}, {party}, Idaho {chamber}, District {district}\n"
+                             "Occupation: {occupation}\nCommittees: {committees}\nBio: {bio}\n"
+                             'Reply as {{"key_issues": ["..."], "background_summary": "<2-3 sentences>", '
+                             '"political_positions": {{"<topic>": "<position>"}}, "likely_challengers": ["..."]}}.')
+    
+    def __init__(self, api_key: Optional[str] = None, lexicon_path: str = ISSUE_LEXICON,
+                 use_llm: bool = False, base_url: Optional[str] = None, model: Optional[str] = None,
+                 llm: Optional[LLMClient] = None):
+        # LLM mode is opt-in; without it (or when a request fails) every analysis is heuristic
+        self.llm = llm or (LLMClient(api_key=api_key, base_url=base_url, model=model) if use_llm else None)
+        self.issue_matcher = IssueMatcher.from_csv(lexicon_path, known_issues=self.COMMITTEE_MAPPING)
+    
+    def analyze_problem(self, problem_description: str, all_reps: List[Representative],
+                        committee_index: Optional[CommitteeIndex] = None,
+                        ranker: Optional[RelevanceRanker] = None) -> ProblemAnalysis:
         """Analyze a problem and recommend committees and representatives to contact"""
+        return self.analyze_problems([problem_description], all_reps, committee_index, ranker)[0]
+    
+    def analyze_problems(self, problem_descriptions: List[str], all_reps: List[Representative],
+                         committee_index: Optional[CommitteeIndex] = None,
+                         ranker: Optional[RelevanceRanker] = None) -> List[ProblemAnalysis]:
+        """Analyze a batch of problems (e.g. intake forms); with a ranker, committees and
+        representatives come back ordered by relevance with their scores"""
+        analyses = self._rank_problems(problem_descriptions, all_reps, committee_index, ranker)
+        if self.llm:
+            self._llm_problem_advice(analyses)
+        return analyses
+    
+    def _rank_problems(self, problem_descriptions: List[str], all_reps: List[Representative],
+                       committee_index: Optional[CommitteeIndex],
+                       ranker: Optional[RelevanceRanker]) -> List[ProblemAnalysis]:
+        if ranker is None:
+            # Find representatives on recommended committees, chairs first; callers with a
+            # snapshot's index pass it in, so rosters and member records are only merged once
+            if committee_index is None:
+                committee_index = CommitteeIndex(list(all_reps), [])
+            analyses = []
+            for problem in problem_descriptions:
+                committees = self._lexicon_committees(problem)
+                analyses.append(self._problem_analysis(problem, committees, committee_index.ranked(committees)))
+            return analyses
         
-        # Committee mapping based on common Idaho legislative issues
-        committee_mapping = {
-            'agriculture': ['Agriculture Affairs', 'Agricultural Affairs'],
-            'business': ['Commerce & Human Resources', 'Business'],
-            'education': ['Education', 'Educational Affairs'],
-            'environment': ['Environment, Energy & Technology', 'Resources & Environment'],
-            'health': ['Health & Welfare'],
-            'transportation': ['Transportation & Defense'],
-            'taxes': ['Revenue & Taxation', 'Ways & Means'],
-            'law enforcement': ['Judiciary, Rules & Administration'],
-            'government': ['State Affairs', 'Local Government'],
-            'budget': ['Joint Finance-Appropriations Committee', 'Ways & Means']
-        }
-        
-        # Simple keyword-based committee recommendation
-        problem_lower = problem_description.lower()
+        # Every issue the lexicon finds is added to the query, so its synonyms and stems count too
+        queries = [' '.join([problem] + list(self.issue_matcher.score(problem))) for problem in problem_descriptions]
+        analyses = []
+        for problem, (committees, reps) in zip(problem_descriptions, ranker.rank_batch(queries)):
+            committees = self._relevant(committees)
+            reps = self._relevant(reps)
+            analyses.append(self._problem_analysis(
+                problem, [name for name, _ in committees], [rep for rep, _ in reps],
+                committee_scores=dict(committees), representative_scores=[score for _, score in reps]))
+        return analyses
+    
+    def _lexicon_committees(self, problem_description: str) -> List[str]:
+        """Committees for the issues the lexicon finds, strongest issue first, each listed once"""
         recommended_committees = []
-        
-        for issue, committees in committee_mapping.items():
-            if issue in problem_lower:
-                recommended_committees.extend(committees)
-        
-        # Find representatives on recommended committees
-        target_reps = []
-        for rep in all_reps:
-            if any(committee in rep.committees for committee in recommended_committees):
-                target_reps.append(rep)
-        
+        for issue, score in self.issue_matcher.score(problem_description).items():
+            if score < self.MIN_ISSUE_SCORE:
+                continue
+            for committee in self.COMMITTEE_MAPPING[issue]:
+                if committee not in recommended_committees:
+                    recommended_committees.append(committee)
+        return recommended_committees
+    
+    def _relevant(self, ranked: List[Tuple]) -> List[Tuple]:
+        """Ranked (item, score) pairs scoring within RELEVANCE_CUTOFF of the best"""
+        if not ranked:
+            return []
+        floor = ranked[0][1] * self.RELEVANCE_CUTOFF
+        return [(item, score) for item, score in ranked if score >= floor]
+    
+    def _problem_analysis(self, problem_description: str, committees: List[str], reps: List[Representative],
+                          committee_scores: Optional[Dict[str, float]] = None,
+                          representative_scores: Optional[List[float]] = None) -> ProblemAnalysis:
         # Generate strategy based on problem type
-        strategy = self._generate_strategy(problem_description, recommended_committees)
+        strategy = self._generate_strategy(problem_description, committees)
         talking_points = self._generate_talking_points(problem_description)
         
         return ProblemAnalysis(
             problem_description=problem_description,
-            recommended_committees=recommended_committees,
-            target_representatives=target_reps,
+            recommended_committees=committees,
+            target_representatives=reps,
             strategy=strategy,
-            talking_points=talking_points
+            talking_points=talking_points,
+            committee_scores=committee_scores,
+            representative_scores=representative_scores
         )
     
-    def analyze_representative(self, rep: Representative) -> RepresentativeAnalysis:
+    def analyze_representative(self, rep: Representative, table: Optional[AnalysisTable] = None) -> RepresentativeAnalysis:
         """Perform deep analysis on a specific representative"""
-        
+        return self.analyze_representatives([rep], table)[0]
+    
+    def analyze_representatives(self, reps: List[Representative],
+                                table: Optional[AnalysisTable] = None) -> List[RepresentativeAnalysis]:
+        """Analyze several representatives, reading precomputed analyses from `table` where it has
+        them; in LLM mode the model's details are filled in per request, concurrently"""
+        analyses = [table.get(rep) if table is not None else None for rep in reps]
+        missing = [position for position, analysis in enumerate(analyses) if analysis is None]
+        for position, analysis in zip(missing, self.heuristic_analyses([reps[position] for position in missing])):
+            analyses[position] = analysis
+        if self.llm:
+            # Copies, so the model's answers don't overwrite the shared table entries
+            analyses = [dataclasses.replace(analysis) for analysis in analyses]
+            self._llm_representative_details(analyses)
+        return analyses
+    
+    def heuristic_analyses(self, reps: List[Representative]) -> List[RepresentativeAnalysis]:
+        """Analyses from the record alone; these are what snapshot analysis tables hold"""
+        return [self._heuristic_analysis(rep) for rep in reps]
+    
+    def _heuristic_analysis(self, rep: Representative) -> RepresentativeAnalysis:
         # Basic analysis based on available data
         key_issues = self._infer_key_issues(rep)
         background_summary = self._create_background_summary(rep)
@@ -68,6 +158,48 @@ class RepresentativeAnalyzer:
             likely_challengers=likely_challengers
         )
     
+    def _messages(self, prompt: str) -> List[Dict[str, str]]:
+        return [{'role': 'system', 'content': self.SYSTEM_PROMPT}, {'role': 'user', 'content': prompt}]
+    
+    def _llm_problem_advice(self, analyses: List[ProblemAnalysis]):
+        """Replace the template strategy and talking points with the model's, where it answers"""
+        prompts = [self._messages(self.PROBLEM_PROMPT.format(
+            problem=analysis.problem_description,
+            committees=', '.join(analysis.recommended_committees) or 'none identified',
+            representatives=', '.join(f"{rep.name} (District {rep.district} {rep.chamber.value})"
+                                      for rep in analysis.target_representatives[:5]) or 'their district delegation'
+        )) for analysis in analyses]
+        for analysis, response in zip(analyses, self.llm.complete_many(prompts)):
+            reply = _json_object(response)
+            strategy = reply.get('strategy')
+            talking_points = reply.get('talking_points')
+            if isinstance(strategy, str) and strategy.strip():
+                analysis.strategy = strategy.strip()
+            if _string_list(talking_points):
+                analysis.talking_points = talking_points
+    
+    def _llm_representative_details(self, analyses: List[RepresentativeAnalysis]):
+        """Replace inferred issues, summary, positions and challengers with the model's, where it answers"""
+        prompts = []
+        for analysis in analyses:
+            rep = analysis.representative
+            prompts.append(self._messages(self.REPRESENTATIVE_PROMPT.format(
+                name=rep.name, party=rep.party.name.title(), chamber=rep.chamber.value, district=rep.district,
+                occupation=rep.occupation or 'unknown', committees=', '.join(rep.committees) or 'none',
+                bio=rep.bio or 'none'
+            )))
+        for analysis, response in zip(analyses, self.llm.complete_many(prompts)):
+            reply = _json_object(response)
+            if _string_list(reply.get('key_issues')):
+                analysis.key_issues = reply['key_issues']
+            if isinstance(reply.get('background_summary'), str) and reply['background_summary'].strip():
+                analysis.background_summary = reply['background_summary'].strip()
+            positions = reply.get('political_positions')
+            if isinstance(positions, dict) and positions and all(isinstance(v, str) for v in positions.values()):
+                analysis.political_positions = {str(topic): position for topic, position in positions.items()}
+            if _string_list(reply.get('likely_challengers')):
+                analysis.likely_challengers = reply['likely_challengers']
+    
     def _generate_strategy(self, problem: str, committees: List[str]) -> str:
         """Generate a strategy for addressing the problem"""
         if not committees:
@@ -173,4 +305,17 @@ class RepresentativeAnalyzer:
         if rep.party == Party.REPUBLICAN:
             return ["Primary challenger from the right", "Business community candidate"]
         else:
-            return ["Republican challenger", "Independent candidate"]
\ No newline at end of file
+            return ["Republican challenger", "Independent candidate"]
+
+def _json_object(response: Optional[str]) -> Dict:
+    """A model reply parsed as a JSON object, or {} when there is none or it is malformed"""
+    if not response:
+        return {}
+    try:
+        reply = json.loads(response)
+    except ValueError:
+        return {}
+    return reply if isinstance(reply, dict) else {}
+
+def _string_list(value) -> bool:
+    return isinstance(value, list) and bool(value) and all(isinstance(item, str) for item in value)
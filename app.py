@@ -1,13 +1,21 @@
 #!/usr/bin/env python3
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, stream_with_context
+import codecs
+import gc
 import os
+import threading
+from typing import Optional
 from dotenv import load_dotenv
 from scraper import IdahoLegislatureScraper
 from analyzer import RepresentativeAnalyzer
-from models import Representative, Chamber
+from models import Chamber
 from zip_mapping import get_districts_by_zip, is_idaho_zip
+from district_boundaries import DistrictBoundaryIndex
+from bulk_resolver import BulkResolver, detect_format
 from sample_data import get_sample_data
+from legislature_index import LegislatureIndex
+from refresher import SnapshotRefresher
 
 # Load environment variables
 load_dotenv()
@@ -17,28 +25,100 @@ app = Flask(__name__)
 # Initialize tools
 scraper = IdahoLegislatureScraper()
 api_key = os.getenv('OPENAI_API_KEY')
-analyzer = RepresentativeAnalyzer(api_key=api_key)
-
-# Cache for legislative data
-legislative_data = None
-
-def get_legislative_data():
-    global legislative_data
-    if legislative_data is None:
-        try:
-            legislative_data = scraper.get_all_data()
-            # Check if scraping returned valid data
-            valid_data = (legislative_data['senators'] and 
-                         len(legislative_data['senators']) > 10 and
-                         isinstance(legislative_data['senators'][0], Representative))
-            
-            if not valid_data:
-                print("Using sample data for testing (scraper data insufficient)")
-                legislative_data = get_sample_data()
-        except Exception as e:
-            print(f"Error loading data, using sample data: {e}")
-            legislative_data = get_sample_data()
-    return legislative_data
+# Model-written strategies and profiles (OPENAI_BASE_URL can point at a compatible or mock server)
+LLM_ANALYSIS = os.getenv('LLM_ANALYSIS', '').lower() in ('1', 'true', 'yes')
+analyzer = RepresentativeAnalyzer(api_key=api_key, use_llm=LLM_ANALYSIS, base_url=os.getenv('OPENAI_BASE_URL'),
+                                  model=os.getenv('OPENAI_MODEL'))
+
+REFRESH_INTERVAL_SECONDS = int(os.getenv('REFRESH_INTERVAL_SECONDS', '900'))
+# Slotted records with interned strings, for workers that keep several sessions resident
+COMPACT_RECORDS = os.getenv('COMPACT_RECORDS', '').lower() in ('1', 'true', 'yes')
+# Build the snapshot, indexes and templates at import, for servers that fork workers after
+# loading the app (gunicorn --preload), so the workers share one copy and start warm
+PRELOAD_SNAPSHOT = os.getenv('PRELOAD_SNAPSHOT', '').lower() in ('1', 'true', 'yes')
+# District boundary polygons (GeoJSON) for locating an exact district from a point
+DISTRICT_BOUNDARIES_FILE = os.getenv('DISTRICT_BOUNDARIES_FILE', 'district_boundaries.geojson')
+
+def _usable(data) -> bool:
+    """Check that scraped data looks complete enough to serve"""
+    return not scraper.completeness_problems(data)
+
+def load_legislative_data():
+    """Refresh legislative data; None keeps whatever is being served now"""
+    data = scraper.get_all_data()
+    if not _usable(data):
+        print("Scraped data insufficient, keeping the current data")
+        return None
+    return data
+
+def load_initial_data():
+    """Serve the last saved snapshot, however old, until the first refresh finishes"""
+    try:
+        data = scraper.get_last_snapshot()
+        if _usable(data):
+            return data
+    except Exception as e:
+        print(f"Error loading saved snapshot: {e}")
+    print("No saved snapshot yet, serving sample data until the first refresh")
+    return get_sample_data()
+
+# Legislative data is refreshed in the background, so requests never wait on a scrape;
+# each new snapshot is indexed and analyzed once, before it is swapped in, re-analyzing only
+# the legislators whose records changed since the snapshot it replaces
+refresher = SnapshotRefresher(load_legislative_data, REFRESH_INTERVAL_SECONDS,
+                              initial=load_initial_data,
+                              prepare=lambda data, previous: LegislatureIndex(
+                                  data, compact=COMPACT_RECORDS, analyze=analyzer.heuristic_analyses,
+                                  previous=previous))
+
+def get_legislative_data() -> LegislatureIndex:
+    return refresher.current()
+
+_boundaries = None
+_boundaries_lock = threading.Lock()
+
+def get_district_boundaries() -> Optional[DistrictBoundaryIndex]:
+    """The district boundary index, built on first use; None without a boundaries file"""
+    global _boundaries
+    if _boundaries is None:
+        with _boundaries_lock:
+            if _boundaries is None:
+                try:
+                    _boundaries = DistrictBoundaryIndex.from_geojson(DISTRICT_BOUNDARIES_FILE)
+                    print(f"Loaded district boundaries: {_boundaries.stats()}")
+                except FileNotFoundError:
+                    _boundaries = False
+                except ValueError as e:
+                    print(f"Error loading district boundaries: {e}")
+                    _boundaries = False
+    return _boundaries or None
+
+def locate_district(lat: Optional[float], lon: Optional[float], zip_code: str = '') -> Optional[int]:
+    """The district containing a point, or None without boundaries or outside every district"""
+    boundaries = get_district_boundaries()
+    if boundaries is None or lat is None or lon is None:
+        return None
+    # A ZIP's districts are the likeliest, so their polygons are tested first
+    return boundaries.locate(lat, lon, get_districts_by_zip(zip_code) if zip_code else ())
+
+def preload():
+    """Prepare everything requests read before workers fork, and keep the GC off those pages"""
+    index = refresher.preload()
+    # SQLite connections must not be used across fork; the index has decoded every record
+    snapshot = getattr(index, 'data', None)
+    if hasattr(snapshot, 'close'):
+        snapshot.close()
+    get_district_boundaries()
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+    # Move everything loaded so far out of the collected generations: collections in the
+    # workers would otherwise write to the GC headers of these objects, copying their pages
+    gc.collect()
+    gc.freeze()
+    print(f"Preloaded snapshot and templates ({gc.get_freeze_count()} objects frozen)")
+
+if PRELOAD_SNAPSHOT:
+    preload()
 
 @app.route('/')
 def index():
@@ -61,27 +141,23 @@ def zip_lookup(zip_code):
     else:
         return render_template('zip_error.html', zip_code=zip_code)
 
+@app.route('/locate')
+def locate():
+    """Send a point (e.g. the browser's location) to its district, falling back to the ZIP code"""
+    lat = request.args.get('lat', type=float)
+    lon = request.args.get('lon', type=float)
+    zip_code = request.args.get('zip', '').strip()
+    district = locate_district(lat, lon, zip_code)
+    if district:
+        return redirect(url_for('district_lookup', district_num=district, zip_code=zip_code or None))
+    if zip_code:
+        return redirect(url_for('zip_lookup', zip_code=zip_code))
+    return render_template('zip_error.html', location=f"{lat}, {lon}")
+
 @app.route('/district/<int:district_num>')
 def district_lookup(district_num):
     zip_code = request.args.get('zip_code')
-    data = get_legislative_data()
-    
-    district_reps = {
-        'senate': None,
-        'house': []
-    }
-    
-    # Find Senate representative
-    for senator in data['senators']:
-        if senator.district == district_num:
-            district_reps['senate'] = senator
-            break
-    
-    # Find House representatives
-    for rep in data['representatives']:
-        if rep.district == district_num:
-            district_reps['house'].append(rep)
-    
+    district_reps = get_legislative_data().delegation(district_num)
     return render_template('district.html', district=district_num, reps=district_reps, zip_code=zip_code)
 
 @app.route('/problem', methods=['GET', 'POST'])
@@ -89,9 +165,9 @@ def problem_analysis():
     if request.method == 'POST':
         problem_description = request.form.get('problem_description')
         if problem_description:
-            data = get_legislative_data()
-            all_reps = data['senators'] + data['representatives']
-            analysis = analyzer.analyze_problem(problem_description, all_reps)
+            index = get_legislative_data()
+            analysis = analyzer.analyze_problem(problem_description, index.members, index.committee_members,
+                                                index.relevance)
             return render_template('problem_results.html', analysis=analysis)
     
     return render_template('problem.html')
@@ -101,19 +177,15 @@ def representative_analysis():
     if request.method == 'POST':
         rep_name = request.form.get('representative_name')
         if rep_name:
-            data = get_legislative_data()
-            all_reps = data['senators'] + data['representatives']
+            # Find the representative; a district picks between legislators with the same name
+            index = get_legislative_data()
+            matches = index.best_matches(rep_name, request.form.get('district', type=int))
             
-            # Find the representative
-            target_rep = None
-            for rep in all_reps:
-                if rep_name.lower() in rep.name.lower():
-                    target_rep = rep
-                    break
-            
-            if target_rep:
-                analysis = analyzer.analyze_representative(target_rep)
+            if len(matches) == 1:
+                analysis = analyzer.analyze_representative(matches[0], index.analyses)
                 return render_template('rep_analysis.html', analysis=analysis)
+            elif matches:
+                return render_template('analyze.html', query=rep_name, candidates=matches)
             else:
                 return render_template('analyze.html', error=f"Representative '{rep_name}' not found.")
     
@@ -121,40 +193,102 @@ def representative_analysis():
 
 @app.route('/committees')
 def committees():
-    data = get_legislative_data()
-    return render_template('committees.html', committees=data['committees'])
+    return render_template('committees.html', committees=get_legislative_data().committees)
 
 @app.route('/api/representatives')
 def api_representatives():
-    data = get_legislative_data()
-    all_reps = data['senators'] + data['representatives']
     return jsonify([{
         'name': rep.name,
         'district': rep.district,
         'chamber': rep.chamber.value,
         'party': rep.party.value
-    } for rep in all_reps])
+    } for rep in get_legislative_data().members])
+
+@app.route('/api/analyses')
+def api_analyses():
+    """The current snapshot's precomputed analyses, one row per legislator, for exports and dashboards"""
+    rows = get_legislative_data().analyses.rows()
+    district = request.args.get('district', type=int)
+    if district is not None:
+        rows = [row for row in rows if row['district'] == district]
+    return jsonify(rows)
 
 @app.route('/search')
 def search():
-    query = request.args.get('q', '').lower()
+    query = request.args.get('q', '')
     if not query:
         return jsonify([])
     
-    data = get_legislative_data()
-    all_reps = data['senators'] + data['representatives']
-    
-    matches = []
-    for rep in all_reps:
-        if query in rep.name.lower():
-            matches.append({
-                'name': rep.name,
-                'district': rep.district,
-                'chamber': rep.chamber.value,
-                'party': rep.party.value
-            })
-    
-    return jsonify(matches[:10])  # Limit to 10 results
+    # Ranked prefix / typo-tolerant matches for the type-ahead box
+    limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+    matches = get_legislative_data().names.scored(query, limit)
+    return jsonify([{
+        'name': rep.name,
+        'district': rep.district,
+        'chamber': rep.chamber.value,
+        'party': rep.party.value,
+        'score': score
+    } for score, rep in matches])
+
+@app.route('/api/problems', methods=['POST'])
+def api_problems():
+    """Rank committees and representatives for a batch of problems, e.g. intake form submissions"""
+    payload = request.get_json(silent=True) or {}
+    problems = payload.get('problems')
+    if not isinstance(problems, list) or not all(isinstance(problem, str) for problem in problems):
+        return jsonify({'error': 'problems must be a list of strings'}), 400
+    limit = payload.get('limit', 10)
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1:
+        return jsonify({'error': 'limit must be a positive integer'}), 400
+    limit = min(limit, 50)
+    index = get_legislative_data()
+    analyses = analyzer.analyze_problems(problems, index.members, index.committee_members, index.relevance)
+    return jsonify([{
+        'problem': analysis.problem_description,
+        'committees': [{'name': name, 'score': analysis.committee_scores[name]}
+                       for name in analysis.recommended_committees[:limit]],
+        'representatives': [{
+            'name': rep.name,
+            'district': rep.district,
+            'chamber': rep.chamber.value,
+            'party': rep.party.value,
+            'score': score
+        } for rep, score in zip(analysis.target_representatives[:limit], analysis.representative_scores)]
+    } for analysis in analyses])
+
+@app.route('/api/locate')
+def api_locate():
+    """District for a latitude / longitude, with the ZIP code's candidate districts"""
+    lat = request.args.get('lat', type=float)
+    lon = request.args.get('lon', type=float)
+    zip_code = request.args.get('zip', '').strip()
+    if lat is None or lon is None:
+        return jsonify({'error': 'lat and lon are required'}), 400
+    if get_district_boundaries() is None:
+        return jsonify({'error': 'District boundaries are not loaded'}), 503
+    return jsonify({
+        'lat': lat,
+        'lon': lon,
+        'district': locate_district(lat, lon, zip_code),
+        'zip_districts': get_districts_by_zip(zip_code) if zip_code else []
+    })
+
+@app.route('/api/resolve', methods=['POST'])
+def api_resolve():
+    """Stream CSV or JSON Lines rows back with their districts and legislators added"""
+    fmt = request.args.get('format') or detect_format('', request.content_type or '')
+    if fmt not in ('csv', 'jsonl'):
+        return jsonify({'error': f"Unknown format: {fmt}"}), 400
+    resolver = BulkResolver(get_legislative_data(), get_district_boundaries())
+    # The body is decoded and read a line at a time as the response is written
+    lines = codecs.getreader('utf-8')(request.stream)
+    mimetype = 'application/x-ndjson' if fmt == 'jsonl' else 'text/csv'
+    return Response(stream_with_context(resolver.stream(lines, fmt)), mimetype=mimetype)
+
+@app.route('/api/status')
+def api_status():
+    """Snapshot age and last refresh duration for monitoring"""
+    return jsonify(refresher.status())
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
\ No newline at end of file
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Time building a snapshot's analysis table from scratch and from the previous snapshot's table with
+a share of the records changed, and a precomputed /analyze lookup against analyzing on every request
+
+Usage:
+    python benchmarks/bench_analysis.py --sizes 1 10 100 --changed 0.05
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from dataclasses import replace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from analysis_table import AnalysisTable
+from analyzer import RepresentativeAnalyzer
+from bench_index import build_data, per_lookup
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Analysis table benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 100], help='Copies of the sample legislature')
+    parser.add_argument('--changed', type=float, default=0.05, help='Fraction of records changed between snapshots')
+    args = parser.parse_args()
+
+    analyzer = RepresentativeAnalyzer()
+    rng = random.Random(1)
+    print(f"{'members':>8} {'full ms':>8} {'refresh ms':>11} {'reanalyzed':>11} {'lookup us':>10} {'analyze us':>11}")
+    for copies in args.sizes:
+        data = build_data(copies)
+        members = data['senators'] + data['representatives']
+        table, full = timed(lambda: AnalysisTable(members, analyzer.heuristic_analyses))
+        # The next snapshot: new record objects, a few with a changed occupation
+        changed = set(rng.sample(range(len(members)), int(len(members) * args.changed)))
+        next_members = [replace(rep, occupation=f"{rep.occupation} and rancher") if member_id in changed
+                        else replace(rep) for member_id, rep in enumerate(members)]
+        next_table, refresh = timed(lambda: AnalysisTable(next_members, analyzer.heuristic_analyses, table))
+        sample = [rng.choice(next_members) for _ in range(2000)]
+        lookup = per_lookup(lambda rep: analyzer.analyze_representative(rep, next_table), sample)
+        analyze = per_lookup(analyzer.analyze_representative, sample)
+        print(f"{len(members):8d} {full * 1000:8.1f} {refresh * 1000:11.1f} {next_table.computed:11d} "
+              f"{lookup * 1e6:10.2f} {analyze * 1e6:11.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Time point-in-district lookups through the boundary grid against ray casting every district
+Boundaries are synthetic: 35 districts tiling Idaho's bounding box in a 5 x 7 layout, with
+jagged shared edges of many vertices each, and one district set as an enclave (a hole) in
+another. Answers are checked against the full scan.
+
+Usage:
+    python benchmarks/bench_boundaries.py --vertices 500 --queries 20000
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from district_boundaries import DistrictBoundaryIndex
+
+# Idaho's bounding box (longitude, latitude)
+WEST, SOUTH, EAST, NORTH = -117.24, 41.99, -111.04, 49.0
+COLUMNS, ROWS = 5, 7
+
+def boundary_x(column: int, y: float) -> float:
+    """The jagged line between district columns `column - 1` and `column`"""
+    base = WEST + (EAST - WEST) * column / COLUMNS
+    if column in (0, COLUMNS):
+        return base
+    return base + 0.08 * math.sin(y * 9.0 + column) + 0.03 * math.sin(y * 41.0 + 2 * column)
+
+def synthetic_geojson(vertices: int) -> dict:
+    features = []
+    enclave = None
+    for row in range(ROWS):
+        bottom = SOUTH + (NORTH - SOUTH) * row / ROWS
+        top = SOUTH + (NORTH - SOUTH) * (row + 1) / ROWS
+        ys = [bottom + (top - bottom) * i / vertices for i in range(vertices + 1)]
+        for column in range(COLUMNS):
+            district = row * COLUMNS + column + 1
+            ring = [(boundary_x(column + 1, y), y) for y in ys]
+            ring += [(boundary_x(column, y), y) for y in reversed(ys)]
+            ring.append(ring[0])
+            rings = [ring]
+            if district == 1:
+                # District 35 is cut out of the middle of district 1
+                left, right = boundary_x(0, bottom) + 0.4, boundary_x(1, bottom) - 0.4
+                low, high = bottom + 0.3, top - 0.3
+                enclave = [(left, low), (right, low), (right, high), (left, high), (left, low)]
+                rings.append(list(reversed(enclave)))
+            if district == 35:
+                continue
+            features.append({'type': 'Feature', 'properties': {'NAME': f"District {district}"},
+                             'geometry': {'type': 'Polygon', 'coordinates': rings}})
+    features.append({'type': 'Feature', 'properties': {'district': 35},
+                     'geometry': {'type': 'Polygon', 'coordinates': [enclave]}})
+    return {'type': 'FeatureCollection', 'features': features}
+
+def timed(func, points):
+    """Answers of `func` for `points`, and p50 / p99 / max latency in microseconds"""
+    latencies = []
+    answers = []
+    for lat, lon in points:
+        start = time.perf_counter()
+        answers.append(func(lat, lon))
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return answers, {label: round(latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1e6, 1)
+                     for label, fraction in (('p50', 0.5), ('p99', 0.99), ('max', 1.0))}
+
+def main():
+    parser = argparse.ArgumentParser(description='District boundary lookup benchmark')
+    parser.add_argument('--vertices', type=int, default=500, help='Vertices along each jagged district edge')
+    parser.add_argument('--queries', type=int, default=20000, help='Random points to locate')
+    parser.add_argument('--grid', type=int, default=None, help='Grid cells per side')
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix='bench-boundaries-'), 'districts.geojson')
+    with open(path, 'w') as f:
+        json.dump(synthetic_geojson(args.vertices), f)
+
+    start = time.perf_counter()
+    index = DistrictBoundaryIndex.from_geojson(path, grid_size=args.grid)
+    build = time.perf_counter() - start
+    stats = index.stats()
+    print(f"{stats['districts']} districts, {stats['edges']} edges; grid {index.grid_size}x{index.grid_size}, "
+          f"{stats['settled_cells'] / stats['cells']:.0%} of cells settled; built in {build * 1000:.0f} ms")
+
+    rng = random.Random(1)
+    points = [(rng.uniform(SOUTH, NORTH), rng.uniform(WEST, EAST)) for _ in range(args.queries)]
+
+    def scan(lat, lon):
+        return next((polygon.district for polygon in index.polygons if polygon.contains(lon, lat)), None)
+
+    def scan_all_edges(lat, lon):
+        """Ray casting over every edge of every district, with no banding"""
+        for polygon in index.polygons:
+            inside = False
+            for x1, y1, x2, y2 in polygon.edges:
+                if (y1 > lat) != (y2 > lat) and lon < x1 + (lat - y1) * (x2 - x1) / (y2 - y1):
+                    inside = not inside
+            if inside:
+                return polygon.district
+        return None
+
+    grid_answers, grid = timed(index.locate, points)
+    scan_answers, banded = timed(scan, points)
+    full_answers, full = timed(scan_all_edges, points[:max(1, args.queries // 20)])
+    mismatches = sum(1 for a, b in zip(grid_answers, scan_answers) if a != b)
+    mismatches += sum(1 for a, b in zip(full_answers, scan_answers) if a != b)
+    print(f"  grid index:        p50 {grid['p50']} us  p99 {grid['p99']} us  max {grid['max']} us")
+    print(f"  scan (banded):     p50 {banded['p50']} us  p99 {banded['p99']} us  max {banded['max']} us")
+    print(f"  scan (all edges):  p50 {full['p50']} us  p99 {full['p99']} us  max {full['max']} us")
+    print(f"  answers differing from the scan: {mismatches}")
+
+if __name__ == '__main__':
+    main()
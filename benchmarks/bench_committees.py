@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Crawl the synthetic committee fixture pages from a local server and time serial vs parallel fan-out
+The crawl results are checked against the fixtures, so this doubles as a regression run
+
+Usage:
+    python benchmarks/bench_committees.py --latency 0.2 --workers 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from models import Chamber
+from replay import ReplayServer
+from sample_data import get_sample_data
+from scraper import IdahoLegislatureScraper
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'legislature')
+
+def crawl(base_url: str, workers: int, rate: float):
+    scraper = IdahoLegislatureScraper(requests_per_second=rate, burst=workers, max_workers=workers)
+    scraper.BASE_URL = base_url
+    scraper.page_store.directory = tempfile.mkdtemp()  # never revalidate against earlier runs
+    start = time.perf_counter()
+    committees = scraper.scrape_committees()
+    return time.perf_counter() - start, committees, scraper
+
+def check(committees, scraper):
+    """Verify the crawl against what the fixtures contain"""
+    expected = sum(
+        len(os.listdir(os.path.join(FIXTURES, 'committees', index))) - 1  # less the index page itself
+        for index in ('senatecommittees', 'housecommittees')
+    )
+    assert len(committees) == expected, f"expected {expected} committees, got {len(committees)}"
+    for committee in committees:
+        assert committee.chair and committee.vice_chair, f"{committee.name} is missing officers"
+        assert 'Jane Staffer' not in committee.members, "staff rows must be skipped"
+
+    data = get_sample_data()
+    scraper._assign_committees(data['senators'] + data['representatives'], committees)
+    souza = next(rep for rep in data['senators'] if rep.name == 'Mary Souza')
+    assert 'Agricultural Affairs' in souza.committees, souza.committees
+    house = [c for c in committees if c.chamber == Chamber.HOUSE]
+    assert all(c.chamber == Chamber.HOUSE for c in house)
+
+def main():
+    parser = argparse.ArgumentParser(description='Committee crawler benchmark')
+    parser.add_argument('--latency', type=float, default=0.2, help='Server latency per page in seconds')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent committee page fetches')
+    parser.add_argument('--rate', type=float, default=50.0, help='Token bucket requests/sec')
+    args = parser.parse_args()
+
+    server = ReplayServer(FIXTURES, latency=args.latency)
+    base_url = server.start()
+
+    serial_time, committees, scraper = crawl(base_url, 1, args.rate)
+    check(committees, scraper)
+    parallel_time, committees, scraper = crawl(base_url, args.workers, args.rate)
+    check(committees, scraper)
+    server.stop()
+
+    print(f"\nCommittee pages: {len(committees)} (+2 indexes), server latency {args.latency * 1000:.0f} ms")
+    print(f"  fixed 3 s sleep (previous):  {(len(committees) + 2) * (3 + args.latency):8.2f} s (estimated)")
+    print(f"  serial crawl:                {serial_time:8.2f} s")
+    print(f"  {args.workers} workers:                   {parallel_time:8.2f} s")
+    print("  fixture checks passed")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of member record extraction over synthetic cards
+
+Usage:
+    python benchmarks/bench_extract.py --cards 20000
+"""
+import argparse
+import gc
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bs4 import BeautifulSoup
+from extractor import MemberExtractor
+from models import Representative, Contact, Party, Chamber, HouseSeat
+
+FIRST = ['Jane', 'John', 'Mary', 'Carl', 'Wendy', 'Scott', 'Laurie', 'Brian']
+LAST = ['Doe', 'Smith', 'Horman', 'Grow', 'Lickley', 'Lenney', 'Nichols', 'Souza']
+
+def synthetic_cards(count: int, layout: str):
+    """Member-card elements tagged with field classes ('structured'), as flat text ('flat'), or as
+    the legislature's pages lay them out: a profile link and one labelled line per field ('linked')"""
+    cards = []
+    for i in range(count):
+        name = f"{FIRST[i % len(FIRST)]} {LAST[(i // len(FIRST)) % len(LAST)]}"
+        party = 'R' if i % 5 else 'D'
+        seat = 'A' if i % 2 else 'B'
+        if layout == 'linked':
+            cards.append(
+                f'<div class="member-card"><h3><a href="/house/membership/h{i}/">Rep. {name}</a> ({party})</h3>'
+                f'<p>District {i % 35 + 1}</p><p>Seat {seat}</p>'
+                f'<p>Email: <a href="mailto:m{i}@house.idaho.gov">m{i}@house.idaho.gov</a></p>'
+                f'<p>Home: (208) 555-{i % 10000:04d} &middot; Statehouse: (208) 332-1000</p>'
+                f'<p>Occupation: Small Business Owner</p></div>'
+            )
+        elif layout == 'structured':
+            cards.append(
+                f'<div class="member-card"><h3 class="member-name">{name}</h3>'
+                f'<span class="member-party">({party})</span><span class="member-district">District {i % 35 + 1}</span>'
+                f'<span class="member-seat">Seat {seat}</span>'
+                f'<a href="mailto:m{i}@gov.idaho.gov">m{i}@gov.idaho.gov</a>'
+                f'<a href="tel:2085550000">(208) 555-{i % 10000:04d}</a><a href="tel:2083321000">(208) 332-1000</a>'
+                f'<span class="member-occupation">Rancher</span></div>'
+            )
+        else:
+            cards.append(
+                f'<div class="member-card"><h3>{name} ({party})</h3><p>District {i % 35 + 1}, Seat {seat}</p>'
+                f'<p>m{i}@gov.idaho.gov</p><p>(208) 555-{i % 10000:04d} (208) 332-1000</p>'
+                f'<p>Occupation: Rancher</p></div>'
+            )
+    soup = BeautifulSoup("<html><body>" + "".join(cards) + "</body></html>", 'lxml')
+    return soup.find_all('div', class_='member-card')
+
+def legacy_parse(element, chamber: Chamber):
+    """The previous seven-pass regex parser, kept here as the baseline"""
+    try:
+        text = element.get_text(strip=True)
+        name_match = re.search(r'([A-Z][a-z]+ [A-Z][a-z]+)', text)
+        if not name_match:
+            return None
+        name = name_match.group(1)
+        party = Party.REPUBLICAN if '(R)' in text else Party.DEMOCRAT
+        district_match = re.search(r'District (\d+)', text)
+        if not district_match:
+            return None
+        district = int(district_match.group(1))
+        house_seat = None
+        if chamber == Chamber.HOUSE:
+            seat_match = re.search(r'Seat ([AB])', text)
+            if seat_match:
+                house_seat = HouseSeat.A if seat_match.group(1) == 'A' else HouseSeat.B
+        email_match = re.search(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', text)
+        email = email_match.group(1) if email_match else ""
+        phone_matches = re.findall(r'(\(\d{3}\) \d{3}-\d{4})', text)
+        occupation_match = re.search(r'Occupation: ([^,\n]+)', text)
+        contact = Contact(
+            email=email,
+            home_phone=phone_matches[0] if phone_matches else None,
+            statehouse_phone=phone_matches[1] if len(phone_matches) > 1 else None
+        )
+        return Representative(name=name, party=party, district=district, chamber=chamber,
+                              contact=contact, occupation=occupation_match.group(1) if occupation_match else None,
+                              house_seat=house_seat)
+    except Exception as e:
+        print(f"Error parsing member data: {e}")
+        return None
+
+def time_parser(label: str, parse, cards, repeats: int):
+    # Best of several runs with the collector off, as timeit does; the soup
+    # holding the cards is large enough that GC passes would dominate
+    elapsed = float('inf')
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            parsed = [parse(card, Chamber.HOUSE) for card in cards]
+            elapsed = min(elapsed, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    ok = sum(1 for rep in parsed if rep)
+    print(f"  {label:<28}{len(cards) / elapsed:>12,.0f} records/s   ({ok} parsed)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Member extraction micro-benchmark')
+    parser.add_argument('--cards', type=int, default=20000, help='Synthetic cards per run')
+    parser.add_argument('--repeats', type=int, default=7, help='Runs per parser; the best is reported')
+    args = parser.parse_args()
+
+    for layout in ('flat', 'structured', 'linked'):
+        cards = synthetic_cards(args.cards, layout)
+        print(f"\n{layout.title()} cards: {args.cards}")
+        time_parser("legacy seven-pass regex", legacy_parse, cards, args.repeats)
+        time_parser("MemberExtractor", MemberExtractor().extract, cards, args.repeats)
+        extractor = MemberExtractor()
+        for card in cards:
+            extractor.extract(card, Chamber.HOUSE)
+        print(f"  counters: {extractor.stats()}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark the concurrent fetch engine against a local fixture server
+
+Usage:
+    python benchmarks/bench_fetch.py --pages 40 --latency 0.05
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from scraper import IdahoLegislatureScraper
+
+PAGE = "<html><body>" + "".join(
+    f'<div class="member-card">Jane Doe{i} (R) District {i % 35 + 1} jdoe{i}@gov.idaho.gov</div>'
+    for i in range(70)
+) + "</body></html>"
+
+def start_fixture_server(latency: float) -> ThreadingHTTPServer:
+    """Serve the same membership page on every path after `latency` seconds"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            body = PAGE.encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def run(scraper: IdahoLegislatureScraper, urls) -> float:
+    start = time.perf_counter()
+    pages = scraper.fetch_pages(urls)
+    elapsed = time.perf_counter() - start
+    assert all(pages.values()), "fixture server returned an error"
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent fetch benchmark')
+    parser.add_argument('--pages', type=int, default=40, help='Number of pages to fetch')
+    parser.add_argument('--latency', type=float, default=0.05, help='Server latency per page in seconds')
+    parser.add_argument('--rate', type=float, default=20.0, help='Token bucket requests/sec')
+    parser.add_argument('--burst', type=int, default=5, help='Token bucket burst size')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent fetches')
+    args = parser.parse_args()
+
+    server = start_fixture_server(args.latency)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/page/{i}" for i in range(args.pages)]
+
+    serial = IdahoLegislatureScraper(requests_per_second=args.rate, burst=args.burst, max_workers=1)
+    concurrent = IdahoLegislatureScraper(requests_per_second=args.rate, burst=args.burst,
+                                         max_workers=args.workers)
+
+    serial_time = run(serial, urls)
+    concurrent_time = run(concurrent, urls)
+    server.shutdown()
+
+    print(f"\nPages: {args.pages}, server latency: {args.latency * 1000:.0f} ms, "
+          f"limit: {args.rate}/s burst {args.burst}")
+    print(f"  fixed 3 s sleep (previous):  {args.pages * (3 + args.latency):8.2f} s (estimated)")
+    print(f"  serial, token bucket:        {serial_time:8.2f} s")
+    print(f"  {args.workers} workers, token bucket:    {concurrent_time:8.2f} s")
+
+if __name__ == '__main__':
+    main()
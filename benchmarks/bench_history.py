@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Time the session history store: per-session ingestion, re-ingesting unchanged sessions, and
+district and member queries over many sessions, against scanning each session's JSON cache file
+The current legislature is scraped from the replay fixtures; earlier sessions replace a share
+of its members each year.
+
+Usage:
+    python benchmarks/bench_history.py --sessions 24 --queries 200
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from history import HistoryStore
+from name_search import normalize_name
+from scraper import IdahoLegislatureScraper
+from bench_memory import build_sessions, scrape_fixtures
+
+LAST_YEAR = 2024
+
+def scan_district(paths, district: int, year: int):
+    """Who represented a district, read from that year's cache file"""
+    with open(paths[year]) as f:
+        data = json.load(f)['data']
+    return [rep['name'] for key in ('senators', 'representatives') for rep in data[key]
+            if rep['district'] == district]
+
+def scan_committees(paths, name: str):
+    """A member's committee seats, read from every cache file"""
+    key = normalize_name(name)
+    seats = []
+    for year, path in sorted(paths.items()):
+        with open(path) as f:
+            data = json.load(f)['data']
+        for rep in data['senators'] + data['representatives']:
+            if normalize_name(rep['name']) == key:
+                seats += [(year, committee) for committee in rep['committees']]
+    return seats
+
+def per_query(func, queries) -> float:
+    """Mean milliseconds per call of `func` over `queries`"""
+    start = time.perf_counter()
+    for query in queries:
+        func(*query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description='Session history store benchmark')
+    parser.add_argument('--sessions', type=int, default=24, help='Sessions to ingest')
+    parser.add_argument('--turnover', type=float, default=0.1, help='Share of members replaced per session')
+    parser.add_argument('--queries', type=int, default=200, help='Queries of each kind')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='bench-history-')
+    rng = random.Random(1)
+    sessions = build_sessions(scrape_fixtures(directory, 1), args.sessions, args.turnover, rng)
+    # build_sessions goes back in time from the current session
+    by_year = {LAST_YEAR - offset: session for offset, session in enumerate(sessions)}
+    paths = {}
+    for year, session in by_year.items():
+        paths[year] = os.path.join(directory, f'cache-{year}.json')
+        with open(paths[year], 'w') as f:
+            json.dump({'timestamp': f'{year}-04-01T00:00:00', 'data': session}, f, indent=2)
+
+    scraper = IdahoLegislatureScraper.__new__(IdahoLegislatureScraper)
+    history = HistoryStore(os.path.join(directory, 'history.db'), scraper._dict_to_rep)
+    members = sum(len(session['senators']) + len(session['representatives']) for session in sessions)
+    print(f"{len(sessions)} sessions ({min(by_year)}-{max(by_year)}), {members} member terms")
+
+    start = time.perf_counter()
+    for year in sorted(by_year):
+        history.ingest_session(year, by_year[year])
+    ingest = time.perf_counter() - start
+    start = time.perf_counter()
+    rewritten = sum(history.ingest_session(year, by_year[year]) for year in sorted(by_year))
+    unchanged = time.perf_counter() - start
+    print(f"  ingest:    {ingest / len(by_year) * 1000:7.2f} ms/session")
+    print(f"  re-ingest: {unchanged / len(by_year) * 1000:7.2f} ms/session unchanged ({rewritten} rewritten)")
+
+    years = sorted(by_year)
+    districts = sorted({rep['district'] for rep in sessions[0]['senators']})
+    names = sorted({rep['name'] for session in sessions for key in ('senators', 'representatives')
+                    for rep in session[key]})
+    district_queries = [(rng.choice(districts), rng.choice(years)) for _ in range(args.queries)]
+    member_queries = [(rng.choice(names),) for _ in range(max(1, args.queries // 10))]
+
+    for district, year in district_queries[:20]:
+        assert sorted(rep.name for rep in history.district_members(district, year)) == \
+            sorted(scan_district(paths, district, year))
+    for (name,) in member_queries[:5]:
+        indexed = {(seat['session'], seat['committee']) for seat in history.committee_history(name)}
+        assert set(scan_committees(paths, name)) <= indexed
+
+    store = per_query(history.district_members, district_queries)
+    scan = per_query(lambda district, year: scan_district(paths, district, year), district_queries)
+    print(f"  district in year:  store {store:8.3f} ms   JSON scan {scan:8.3f} ms   {scan / store:6.0f}x")
+    store = per_query(history.committee_history, member_queries)
+    scan = per_query(lambda name: scan_committees(paths, name), member_queries)
+    print(f"  member committees: store {store:8.3f} ms   JSON scan {scan:8.3f} ms   {scan / store:6.0f}x")
+    store = per_query(history.member_terms, member_queries)
+    print(f"  member terms:      store {store:8.3f} ms")
+    history.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Time LegislatureIndex lookups against the linear scans they replace as the dataset grows
+The sample legislature is repeated with shifted districts, as if several sessions or states were loaded
+
+Usage:
+    python benchmarks/bench_index.py --sizes 1 10 100 1000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from dataclasses import replace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from legislature_index import LegislatureIndex
+from sample_data import get_sample_data
+
+def build_data(copies: int):
+    """The sample legislature repeated `copies` times, each copy in its own districts and names"""
+    sample = get_sample_data()
+    data = {'senators': [], 'representatives': [], 'committees': list(sample['committees'])}
+    for copy in range(copies):
+        offset = copy * 35
+        suffix = f" {copy}" if copy else ""
+        for key in ('senators', 'representatives'):
+            data[key] += [replace(rep, district=rep.district + offset, name=rep.name + suffix)
+                          for rep in sample[key]]
+    return data
+
+def per_lookup(func, keys) -> float:
+    """Mean seconds per call of `func` over `keys`"""
+    start = time.perf_counter()
+    for key in keys:
+        func(key)
+    return (time.perf_counter() - start) / len(keys)
+
+def linear_district(data, district):
+    return [rep for rep in data['senators'] + data['representatives'] if rep.district == district]
+
+def linear_name(data, name):
+    name = name.lower()
+    return [rep for rep in data['senators'] + data['representatives'] if rep.name.lower() == name]
+
+def linear_committee(data, committee):
+    return [rep for rep in data['senators'] + data['representatives'] if committee in rep.committees]
+
+def main():
+    parser = argparse.ArgumentParser(description='Legislature index lookup benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 100, 1000],
+                        help='Copies of the sample legislature to index')
+    parser.add_argument('--lookups', type=int, default=2000, help='Indexed lookups per measurement')
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    print(f"{'members':>8} {'build ms':>9}   {'district us':>18}   {'name us':>18}   {'committee us':>18}")
+    print(f"{'':>8} {'':>9}   {'index':>8} {'scan':>9}   {'index':>8} {'scan':>9}   {'index':>8} {'scan':>9}")
+    for copies in args.sizes:
+        data = build_data(copies)
+        start = time.perf_counter()
+        index = LegislatureIndex(data)
+        build = time.perf_counter() - start
+
+        members = index.members
+        districts = [rng.randint(1, 35 * copies) for _ in range(args.lookups)]
+        names = [rng.choice(members).name for _ in range(args.lookups)]
+        committees = [rng.choice(index.committees).name for _ in range(args.lookups)]
+        # Scans get fewer calls on big datasets, or the benchmark would take minutes
+        scan_lookups = max(5, args.lookups // copies)
+
+        for key_list, found in ((districts, index.by_district), (names, index.by_name)):
+            assert all(found(key) for key in key_list[:50]), "index lookup missed a known key"
+
+        print(f"{len(members):8d} {build * 1000:9.1f}"
+              f"   {per_lookup(index.by_district, districts) * 1e6:8.2f} "
+              f"{per_lookup(lambda d: linear_district(data, d), districts[:scan_lookups]) * 1e6:9.1f}"
+              f"   {per_lookup(index.by_name, names) * 1e6:8.2f} "
+              f"{per_lookup(lambda n: linear_name(data, n), names[:scan_lookups]) * 1e6:9.1f}"
+              f"   {per_lookup(index.by_committee, committees) * 1e6:8.2f} "
+              f"{per_lookup(lambda c: linear_committee(data, c), committees[:scan_lookups]) * 1e6:9.1f}")
+
+if __name__ == '__main__':
+    main()
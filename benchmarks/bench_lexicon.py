@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Time issue matching with the Aho-Corasick automaton against testing every term with `in`, as the
+lexicon grows from the shipped terms to thousands of generated ones
+
+Usage:
+    python benchmarks/bench_lexicon.py --forms 2000 --sizes 100 1000 10000
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from issue_lexicon import ISSUE_LEXICON, IssueMatcher, normalize_text
+from bench_problem import PROBLEMS
+
+def lexicon_rows(size: int, rng: random.Random):
+    """The shipped lexicon, padded (or cut) to `size` terms with made-up words and phrases"""
+    rows = list(IssueMatcher.from_csv(ISSUE_LEXICON).terms)[:size]
+    issues = sorted({issue for _, issue, _ in rows})
+    seen = {term for term, _, _ in rows}
+    while len(rows) < size:
+        words = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randrange(4, 10)))
+                 for _ in range(rng.choice((1, 1, 2, 3)))]
+        term = ' '.join(words) + ('*' if rng.random() < 0.3 else '')
+        if term not in seen:
+            seen.add(term)
+            rows.append((term, rng.choice(issues), rng.choice((0.5, 1.0))))
+    return rows
+
+def scan_score(patterns, text: str):
+    """Every term tested against the text in turn"""
+    normalized = normalize_text(text)
+    scores = {}
+    for pattern, issue, weight in patterns:
+        if pattern in normalized:
+            scores[issue] = scores.get(issue, 0.0) + weight
+    return scores
+
+def main():
+    parser = argparse.ArgumentParser(description='Issue lexicon matching benchmark')
+    parser.add_argument('--forms', type=int, default=2000, help='Problem descriptions to score')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000], help='Lexicon sizes')
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    forms = [' '.join(rng.sample(PROBLEMS, 2)) for _ in range(args.forms)]
+    print(f"{'terms':>7} {'states':>8} {'build ms':>9} {'scan us/form':>13} {'automaton us/form':>18}")
+    for size in args.sizes:
+        rows = lexicon_rows(size, rng)
+        start = time.perf_counter()
+        matcher = IssueMatcher(rows)
+        build = time.perf_counter() - start
+        patterns = [(f" {normalize_text(term.rstrip('*')).strip()}" + ('' if term.endswith('*') else ' '), issue, weight)
+                    for term, issue, weight in rows]
+
+        start = time.perf_counter()
+        expected = [scan_score(patterns, form) for form in forms]
+        scan = time.perf_counter() - start
+        start = time.perf_counter()
+        found = [matcher.score(form) for form in forms]
+        automaton = time.perf_counter() - start
+        assert all(a == b for a, b in zip(expected, found))
+
+        print(f"{size:7d} {matcher.stats()['states']:8d} {build * 1000:9.0f} "
+              f"{scan / len(forms) * 1e6:13.1f} {automaton / len(forms) * 1e6:18.1f}")
+
+if __name__ == '__main__':
+    main()
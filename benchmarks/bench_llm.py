@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Time LLM-mode analysis against the mock chat completions server: one request at a time, with
+concurrent requests behind the semaphore, and again from a warm response cache; also counts the
+requests a batch of repeated intake forms needs and the timeouts that fell back to heuristics
+
+Usage:
+    python benchmarks/bench_llm.py --latency 0.3 --jitter 0.2 --stall-rate 0.02 --concurrency 8
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from analyzer import RepresentativeAnalyzer
+from legislature_index import LegislatureIndex
+from llm_client import LLMClient
+from mock_llm import MockLLMServer
+from response_cache import ResponseCache
+from sample_data import get_sample_data
+from bench_problem import PROBLEMS
+
+def run(label: str, analyzer: RepresentativeAnalyzer, work):
+    llm = analyzer.llm
+    before = dict(llm.stats())
+    start = time.perf_counter()
+    work()
+    elapsed = time.perf_counter() - start
+    after = llm.stats()
+    delta = {key: after[key] - before.get(key, 0) for key in ('requests', 'timeouts', 'errors', 'hits')}
+    print(f"  {label:32s} {elapsed:7.2f} s  {delta['requests']:5d} requests  {delta['hits']:5d} cache hits  "
+          f"{delta['timeouts']:3d} timeouts  {delta['errors']:3d} errors")
+
+def main():
+    parser = argparse.ArgumentParser(description='LLM analysis benchmark against a mock server')
+    parser.add_argument('--latency', type=float, default=0.3, help='Mock seconds per response')
+    parser.add_argument('--jitter', type=float, default=0.2, help='Up to this many extra random seconds')
+    parser.add_argument('--stall-rate', type=float, default=0.02, help='Fraction of requests that hang')
+    parser.add_argument('--timeout', type=float, default=2.0, help='Client timeout per request')
+    parser.add_argument('--concurrency', type=int, default=8, help='Requests in flight at once')
+    parser.add_argument('--forms', type=int, default=200, help='Intake forms in the repeated batch')
+    args = parser.parse_args()
+
+    index = LegislatureIndex(get_sample_data())
+    reps = index.members
+    rng = random.Random(1)
+    forms = [rng.choice(PROBLEMS) for _ in range(args.forms)]
+    cache_dirs = []
+
+    def analyzer_for(base_url: str, concurrency: int) -> RepresentativeAnalyzer:
+        cache_dirs.append(tempfile.mkdtemp(prefix='bench-llm-'))
+        llm = LLMClient(base_url=base_url, max_concurrency=concurrency, timeout=args.timeout,
+                        cache=ResponseCache(cache_dirs[-1]))
+        return RepresentativeAnalyzer(llm=llm)
+
+    with MockLLMServer(latency=args.latency, jitter=args.jitter, stall_rate=args.stall_rate,
+                       stall_seconds=args.timeout * 3, seed=1) as server:
+        print(f"{len(reps)} legislators, {len(forms)} intake forms ({len(set(forms))} distinct)")
+        sequential = analyzer_for(server.base_url, 1)
+        run('profiles, one at a time', sequential, lambda: sequential.analyze_representatives(reps))
+
+        concurrent = analyzer_for(server.base_url, args.concurrency)
+        run(f'profiles, {args.concurrency} concurrent', concurrent, lambda: concurrent.analyze_representatives(reps))
+        run('profiles, warm cache', concurrent, lambda: concurrent.analyze_representatives(reps))
+        run('intake forms, batched', concurrent,
+            lambda: concurrent.analyze_problems(forms, reps, index.committee_members, index.relevance))
+        run('intake forms, warm cache', concurrent,
+            lambda: concurrent.analyze_problems(forms, reps, index.committee_members, index.relevance))
+        print(f"  most requests the server saw at once: {server.stats()['max_in_flight']} "
+              f"(timed-out requests stay open on the server until they finish)")
+
+    for directory in cache_dirs:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
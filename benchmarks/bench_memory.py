@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Measure the resident memory of several legislative sessions held in one worker, with the
+standard dataclass records and with compact (slotted, interned) records
+The current legislature is scraped once from the replay fixtures; each earlier session keeps
+most of its members and replaces the rest. Every mode is measured in a fresh subprocess.
+
+Usage:
+    python benchmarks/bench_memory.py --sessions 1 10 --turnover 0.1
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from compact import compact_legislature
+from legislature_index import LegislatureIndex
+from replay import ReplayServer
+from scraper import IdahoLegislatureScraper
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'legislature')
+
+def rss_kb() -> int:
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+def make_scraper(directory: str) -> IdahoLegislatureScraper:
+    scraper = IdahoLegislatureScraper(requests_per_second=1000.0, burst=8, max_workers=8)
+    scraper.CACHE_FILE = os.path.join(directory, 'cache.json')
+    scraper.SNAPSHOT_FILE = os.path.join(directory, 'snapshot.db')
+    scraper.JOURNAL_FILE = os.path.join(directory, 'changes.jsonl')
+    scraper.LOCK_FILE = os.path.join(directory, 'refresh.lock')
+    scraper.HISTORY_FILE = os.path.join(directory, 'history.db')
+    scraper.page_store.directory = os.path.join(directory, 'page_cache')
+    return scraper
+
+def scrape_fixtures(directory: str, multiply: int) -> dict:
+    """The current legislature, scraped from the replay fixtures, as cache-file dictionaries"""
+    with ReplayServer(FIXTURES, multiply=multiply) as server:
+        scraper = make_scraper(directory)
+        scraper.BASE_URL = server.base_url
+        scraper.CACHE_DURATION_HOURS = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            data = scraper.get_all_data()
+    return {
+        'senators': [scraper._rep_to_dict(rep) for rep in data['senators']],
+        'representatives': [scraper._rep_to_dict(rep) for rep in data['representatives']],
+        'committees': [scraper._committee_to_dict(committee) for committee in data['committees']]
+    }
+
+def build_sessions(current: dict, count: int, turnover: float, rng: random.Random) -> list:
+    """`count` sessions, each earlier one replacing a `turnover` share of the next one's members"""
+    sessions = [current]
+    for number in range(1, count):
+        session = json.loads(json.dumps(sessions[-1]))
+        for key in ('senators', 'representatives'):
+            for rep in rng.sample(session[key], max(1, int(len(session[key]) * turnover))):
+                rep['name'] = f"{rep['name'].split(' (')[0]} ({number})"
+                rep['contact']['email'] = f"member{number}.{rng.randrange(10 ** 6)}@legislature.idaho.gov"
+                rep['bio'] = f"{rep['bio'] or ''} Served in session {number}."
+                rep['profile_url'] = f"{rep['profile_url']}-{number}"
+        sessions.append(session)
+    return sessions
+
+def load_sessions(path: str, compact: bool, indexed: bool = True) -> list:
+    """Decode every session as the scraper does on a cache load, and index it unless `indexed` is false"""
+    scraper = IdahoLegislatureScraper.__new__(IdahoLegislatureScraper)
+    with open(path) as f:
+        encoded = f.read().splitlines()
+    indexes = []
+    for line in encoded:
+        raw = json.loads(line)
+        data = {
+            'senators': [scraper._dict_to_rep(rep) for rep in raw['senators']],
+            'representatives': [scraper._dict_to_rep(rep) for rep in raw['representatives']],
+            'committees': [scraper._dict_to_committee(committee) for committee in raw['committees']]
+        }
+        if indexed:
+            indexes.append(LegislatureIndex(data, compact=compact))
+        else:
+            indexes.append(compact_legislature(data) if compact else data)
+    return indexes
+
+def child(path: str, compact: bool, metric: str):
+    """Print the growth in RSS, or in traced allocations for the records alone and once indexed"""
+    gc.collect()
+    if metric == 'rss':
+        before = rss_kb()
+        indexes = load_sessions(path, compact)
+        gc.collect()
+        print(json.dumps({'rss_kb': rss_kb() - before, 'members': sum(len(index.members) for index in indexes)}))
+        return
+    tracemalloc.start()
+    indexes = load_sessions(path, compact, indexed=metric == 'indexed')
+    gc.collect()
+    print(json.dumps({'traced_bytes': tracemalloc.get_traced_memory()[0]}))
+
+def measure(path: str, compact: bool, metric: str) -> dict:
+    """Run one measurement in a fresh interpreter, so earlier loads cannot skew it"""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', path, '--metric', metric] +
+        (['--compact'] if compact else []),
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description='Resident memory of loaded sessions')
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 10], help='Sessions held in memory')
+    parser.add_argument('--turnover', type=float, default=0.1, help='Share of members replaced per session')
+    parser.add_argument('--multiply', type=int, default=1, help='Copies of each member card in the fixtures')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--compact', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--metric', default='rss', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.compact, args.metric)
+        return
+
+    directory = tempfile.mkdtemp(prefix='bench-memory-')
+    current = scrape_fixtures(directory, args.multiply)
+    rng = random.Random(1)
+    print(f"{'sessions':>8} {'members':>8} {'records':>10} {'RSS KiB':>8} "
+          f"{'records KiB':>12} {'indexed KiB':>12} {'record bytes/member':>20}")
+    for count in args.sessions:
+        path = os.path.join(directory, f'sessions-{count}.jsonl')
+        with open(path, 'w') as f:
+            for session in build_sessions(current, count, args.turnover, rng):
+                f.write(json.dumps(session) + '\n')
+        for compact in (False, True):
+            result = measure(path, compact, 'rss')
+            records = measure(path, compact, 'records')['traced_bytes']
+            indexed = measure(path, compact, 'indexed')['traced_bytes']
+            print(f"{count:8d} {result['members']:8d} {'compact' if compact else 'dataclass':>10} "
+                  f"{result['rss_kb']:8d} {records // 1024:12d} {indexed // 1024:12d} "
+                  f"{records // result['members']:20d}")
+
+if __name__ == '__main__':
+    main()
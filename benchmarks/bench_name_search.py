@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Time ranked name search on a type-ahead workload: every prefix of a name as it is typed,
+last names, and names with a typo
+Members are synthetic names drawn from the sample legislature's first and last names
+
+Usage:
+    python benchmarks/bench_name_search.py --sizes 105 1000 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from dataclasses import replace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from name_search import NameSearchIndex
+from sample_data import get_sample_data
+
+def build_members(count: int, rng: random.Random):
+    sample = get_sample_data()
+    reps = sample['senators'] + sample['representatives']
+    firsts = sorted({rep.name.split()[0] for rep in reps})
+    lasts = sorted({rep.name.split(' ', 1)[1] for rep in reps})
+    members = []
+    for i in range(count):
+        name = f"{rng.choice(firsts)} {rng.choice(lasts)}"
+        members.append(replace(reps[i % len(reps)], name=name, district=i // 3 + 1))
+    return members
+
+def typo(name: str, rng: random.Random) -> str:
+    """Swap two neighbouring letters"""
+    if len(name) < 4:
+        return name
+    i = rng.randrange(1, len(name) - 2)
+    return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+def workload(members, rng: random.Random, names: int):
+    queries = []
+    for rep in rng.sample(members, min(names, len(members))):
+        queries += [rep.name[:length] for length in range(1, len(rep.name) + 1)]
+        queries.append(rep.name.split()[-1])
+        queries.append(typo(rep.name, rng))
+    return queries
+
+def substring_scan(members, query: str, limit: int = 10):
+    query = query.lower()
+    return [rep for rep in members if query in rep.name.lower()][:limit]
+
+def timed(func, queries):
+    """p50 / p90 / p99 / max latency of `func` over `queries`, in microseconds"""
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        func(query)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return {label: round(latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1e6)
+            for label, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0))}
+
+def main():
+    parser = argparse.ArgumentParser(description='Type-ahead name search benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[105, 1000, 10000], help='Members to index')
+    parser.add_argument('--names', type=int, default=50, help='Names typed out per size')
+    parser.add_argument('--limit', type=int, default=10, help='Results per query')
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    for size in args.sizes:
+        members = build_members(size, rng)
+        start = time.perf_counter()
+        index = NameSearchIndex(members)
+        build = time.perf_counter() - start
+        queries = workload(members, rng, args.names)
+
+        ranked = timed(lambda query: index.scored(query, args.limit), queries)
+        scan = timed(lambda query: substring_scan(members, query, args.limit), queries)
+        print(f"\n{size} members: index built in {build * 1000:.1f} ms, {len(queries)} queries")
+        print(f"  ranked search (us):  p50 {ranked['p50']}  p90 {ranked['p90']}  p99 {ranked['p99']}  max {ranked['max']}")
+        print(f"  substring scan (us): p50 {scan['p50']}  p90 {scan['p90']}  p99 {scan['p99']}  max {scan['max']}")
+
+        typos = [typo(rep.name, rng) for rep in rng.sample(members, min(200, len(members)))]
+        hits = sum(1 for query in typos if index.search(query, args.limit))
+        print(f"  names with a typo found: ranked {hits}/{len(typos)}, "
+              f"substring {sum(1 for query in typos if substring_scan(members, query))}/{len(typos)}")
+
+if __name__ == '__main__':
+    main()
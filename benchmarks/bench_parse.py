@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Compare parse time and peak memory of the scraper's HTML parser backends
+
+Usage:
+    python benchmarks/bench_parse.py --cards 2000
+    python benchmarks/bench_parse.py --page saved/senate_membership.html
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from scraper import IdahoLegislatureScraper, PARSER_BACKENDS
+
+def synthetic_page(cards: int) -> bytes:
+    """Build a membership page padded with the navigation and script noise of a real site"""
+    nav = "<nav><ul>" + "".join(f'<li><a href="/link/{i}">Link {i}</a></li>' for i in range(300)) + "</ul></nav>"
+    script = "<script>" + "var x = 1;" * 2000 + "</script>"
+    body = "".join(
+        f'<div class="member-card"><h3><a href="/senate/member{i}/">Jane Doe</a> (R)</h3>'
+        f'<p>District {i % 35 + 1}</p><p><a href="mailto:jdoe{i}@gov.idaho.gov">jdoe{i}@gov.idaho.gov</a></p>'
+        f'<p>Home (208) 555-{i % 10000:04d} Statehouse (208) 332-1000</p>'
+        f'<p>Occupation: Rancher</p></div>'
+        for i in range(cards)
+    )
+    footer = "<footer>" + "<p>Idaho Legislature</p>" * 200 + "</footer>"
+    return f"<html><head>{script}</head><body>{nav}{body}{footer}</body></html>".encode()
+
+def measure(scraper: IdahoLegislatureScraper, content: bytes, repeats: int):
+    tracemalloc.start()
+    soup = scraper._parse_html(content, targets=scraper.MEMBER_TARGETS)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del soup
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        soup = scraper._parse_html(content, targets=scraper.MEMBER_TARGETS)
+        cards = soup.find_all('div', class_='member-card') or soup.find_all('tr')
+    elapsed = (time.perf_counter() - start) / repeats
+    return elapsed, peak, len(cards)
+
+def main():
+    parser = argparse.ArgumentParser(description='HTML parser backend benchmark')
+    parser.add_argument('--page', type=str, help='Saved legislature page to parse')
+    parser.add_argument('--cards', type=int, default=2000, help='Member cards in the synthetic page')
+    parser.add_argument('--repeats', type=int, default=3, help='Timed parses per backend')
+    args = parser.parse_args()
+
+    if args.page:
+        with open(args.page, 'rb') as f:
+            content = f.read()
+    else:
+        content = synthetic_page(args.cards)
+
+    print(f"\nPage size: {len(content) / 1024:.0f} KiB")
+    print(f"{'backend':<14}{'parse ms':>10}{'peak MiB':>10}{'elements':>10}")
+    for backend in PARSER_BACKENDS:
+        scraper = IdahoLegislatureScraper(parser_backend=backend)
+        elapsed, peak, found = measure(scraper, content, args.repeats)
+        print(f"{backend:<14}{elapsed * 1000:>10.1f}{peak / 2 ** 20:>10.1f}{found:>10}")
+
+if __name__ == '__main__':
+    main()
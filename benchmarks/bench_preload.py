@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Compare forked web workers that each load the snapshot themselves with workers forked from a
+master that preloaded it (PRELOAD_SNAPSHOT=1, as under gunicorn --preload)
+Each worker serves a first and a second request and runs a full GC collection, then reports its
+first-request latency and memory (PSS, and pages it has copied or allocated privately) while
+all workers are still alive. The snapshot is scraped once from the replay fixtures.
+
+Usage:
+    python benchmarks/bench_preload.py --workers 4 --multiply 10
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+def memory_kb() -> dict:
+    """Pss and Private_Dirty of this process, in KiB"""
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            key, _, rest = line.partition(':')
+            if key in ('Pss', 'Private_Dirty'):
+                values[key] = int(rest.split()[0])
+    return values
+
+def worker(app_module, results_fd: int, release_fd: int):
+    client = app_module.app.test_client()
+    start = time.perf_counter()
+    client.get('/district/14')
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    client.get('/search?q=gro')
+    second = time.perf_counter() - start
+    gc.collect()
+    os.write(results_fd, (json.dumps({'first_ms': first * 1000, 'second_ms': second * 1000, **memory_kb()}) + '\n').encode())
+    # Stay alive until every worker has measured, so shared pages are counted as shared
+    os.read(release_fd, 1)
+    os._exit(0)
+
+def master(directory: str, workers: int):
+    """Import the app like a server master, fork workers and print their measurements"""
+    os.chdir(directory)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app as app_module
+    imported = time.perf_counter() - start
+    master_memory = memory_kb()
+
+    results_read, results_write = os.pipe()
+    release_read, release_write = os.pipe()
+    pids = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            os.close(results_read)
+            os.close(release_write)
+            sys.stdout = io.StringIO()
+            worker(app_module, results_write, release_read)
+        pids.append(pid)
+    os.close(results_write)
+    results = []
+    with os.fdopen(results_read) as lines:
+        for line in lines:
+            results.append(json.loads(line))
+            if len(results) == workers:
+                break
+    os.close(release_write)
+    for pid in pids:
+        os.waitpid(pid, 0)
+    print(json.dumps({'import_s': imported, 'master': master_memory, 'workers': results}))
+
+def main():
+    parser = argparse.ArgumentParser(description='Preloaded vs per-worker snapshot benchmark')
+    parser.add_argument('--workers', type=int, default=4, help='Workers to fork')
+    parser.add_argument('--multiply', type=int, default=10, help='Copies of each member card in the fixtures')
+    parser.add_argument('--compact', action='store_true', help='Use compact records (COMPACT_RECORDS=1)')
+    parser.add_argument('--master', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.master:
+        master(args.master, args.workers)
+        return
+
+    from bench_memory import scrape_fixtures
+    directory = tempfile.mkdtemp(prefix='bench-preload-')
+    scrape_fixtures(directory, args.multiply)
+    print(f"{args.workers} workers, fixtures x{args.multiply}{', compact records' if args.compact else ''}")
+    print(f"{'mode':>10} {'master import':>14} {'first req':>10} {'second req':>11} "
+          f"{'worker PSS':>11} {'private dirty':>14} {'total PSS':>10}")
+    for preload in (False, True):
+        env = dict(os.environ, PRELOAD_SNAPSHOT='1' if preload else '0',
+                   COMPACT_RECORDS='1' if args.compact else '0',
+                   REFRESH_INTERVAL_SECONDS='3600', PYTHONPATH=ROOT)
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--master', directory, '--workers', str(args.workers)],
+            env=env, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.splitlines()[-1])
+        workers = result['workers']
+
+        def mean(key):
+            return sum(worker[key] for worker in workers) / len(workers)
+
+        total = result['master']['Pss'] + sum(worker['Pss'] for worker in workers)
+        print(f"{'preload' if preload else 'per-worker':>10} {result['import_s'] * 1000:11.0f} ms "
+              f"{mean('first_ms'):7.1f} ms {mean('second_ms'):8.1f} ms {mean('Pss') / 1024:7.1f} MiB "
+              f"{mean('Private_Dirty') / 1024:10.1f} MiB {total / 1024:6.1f} MiB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Time bulk problem analysis (intake forms) with the committee index against the nested scan it replaced
+
+Usage:
+    python benchmarks/bench_problem.py --forms 5000 --sizes 1 10 100
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from analyzer import RepresentativeAnalyzer
+from legislature_index import LegislatureIndex
+from bench_index import build_data
+
+PROBLEMS = [
+    "Rural schools need better education funding",
+    "Property taxes are too high for small business owners",
+    "Water rights for agriculture in the Magic Valley",
+    "Road maintenance and transportation safety on US-95",
+    "Mental health services and health care access",
+    "Local government zoning and state affairs",
+    "Budget transparency for state agencies",
+    "Environment and wildfire management",
+    "Law enforcement staffing in small counties",
+    "Broadband for rural businesses"
+]
+
+def legacy_targets(all_reps, recommended_committees):
+    """The per-request scan analyze_problem used before the committee index"""
+    return [rep for rep in all_reps
+            if any(committee in rep.committees for committee in recommended_committees)]
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk problem analysis benchmark')
+    parser.add_argument('--forms', type=int, default=5000, help='Intake forms to analyze')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 100],
+                        help='Copies of the sample legislature')
+    args = parser.parse_args()
+
+    analyzer = RepresentativeAnalyzer()
+    rng = random.Random(1)
+    forms = [rng.choice(PROBLEMS) for _ in range(args.forms)]
+    print(f"{'members':>8} {'scan forms/s':>13} {'index forms/s':>14} {'speedup':>8} {'chairs first':>13}")
+    for copies in args.sizes:
+        data = build_data(copies)
+        index = LegislatureIndex(data)
+        members = index.members
+
+        start = time.perf_counter()
+        for form in forms:
+            committees = [name for issue, names in analyzer.COMMITTEE_MAPPING.items()
+                          if issue in form.lower() for name in names]
+            legacy_targets(members, committees)
+        scan = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyses = [analyzer.analyze_problem(form, members, index.committee_members) for form in forms]
+        indexed = time.perf_counter() - start
+
+        # Chairs named on committee rosters should lead the target list
+        education = next(a for a in analyses if 'Education' in a.recommended_committees)
+        chairs = {c.chair for c in index.committees if c.name == 'Education'}
+        first = education.target_representatives[0].name in chairs
+
+        print(f"{len(members):8d} {len(forms) / scan:13.0f} {len(forms) / indexed:14.0f} "
+              f"{scan / indexed:7.1f}x {'yes' if first else 'no':>13}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Time ranking a batch of problems against every committee and legislator with the BM25 matrices,
+against scoring each problem in turn and against the same BM25 sums in pure Python
+
+Usage:
+    python benchmarks/bench_relevance.py --batch 100 500 --sizes 1 10
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from legislature_index import LegislatureIndex
+from relevance import tokenize
+from bench_index import build_data
+from bench_problem import PROBLEMS
+
+def python_scores(ranker, problems):
+    """Committee and member BM25 sums with dicts, one problem and one document at a time"""
+    committee_rows = [{term: float(ranker._committee_weights[row, column]) for term, column in ranker.vocabulary.items()
+                       if ranker._committee_weights[row, column]} for row in range(len(ranker.committee_names))]
+    member_rows = [{term: float(ranker._member_weights[row, column]) for term, column in ranker.vocabulary.items()
+                    if ranker._member_weights[row, column]} for row in range(len(ranker.members))]
+    roles = [{member: float(ranker._roles[row, member]) for member in range(len(ranker.members)) if ranker._roles[row, member]}
+             for row in range(len(ranker.committee_names))]
+
+    def score():
+        results = []
+        for problem in problems:
+            terms = set(tokenize(problem))
+            committees = [sum(weights.get(term, 0.0) for term in terms) for weights in committee_rows]
+            members = [sum(weights.get(term, 0.0) for term in terms) for weights in member_rows]
+            for row, committee_score in enumerate(committees):
+                for member, weight in roles[row].items():
+                    members[member] += committee_score * weight
+            results.append((committees, members))
+        return results
+    return score
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Relevance ranking benchmark')
+    parser.add_argument('--batch', type=int, nargs='+', default=[100, 500], help='Problems per batch')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10], help='Copies of the sample legislature')
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    print(f"{'members':>8} {'terms':>6} {'batch':>6} {'matrix ms':>10} {'one by one ms':>14} {'python ms':>10}")
+    for copies in args.sizes:
+        index = LegislatureIndex(build_data(copies))
+        ranker = index.relevance
+        for size in args.batch:
+            problems = [' '.join(rng.sample(PROBLEMS, 2)) for _ in range(size)]
+            matrix = timed(lambda: ranker.rank_batch(problems, limit=10))
+            single = timed(lambda: [ranker.rank(problem, limit=10) for problem in problems])
+            pure = timed(python_scores(ranker, problems))
+            print(f"{len(ranker.members):8d} {len(ranker.vocabulary):6d} {size:6d} {matrix * 1000:10.1f} "
+                  f"{single * 1000:14.1f} {pure * 1000:10.1f}")
+
+if __name__ == '__main__':
+    main()
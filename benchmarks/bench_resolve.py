@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Measure bulk resolver throughput (rows/sec) and peak memory on generated constituent files, and
+compare it with resolving each row through the web app's /zip and /district pages
+
+Usage:
+    python benchmarks/bench_resolve.py --rows 10000 200000
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bulk_resolver import BulkResolver
+from legislature_index import LegislatureIndex
+from sample_data import get_sample_data
+from zip_mapping import ZIP_TABLE
+
+class NullSink:
+    """Counts what would be written"""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, text: str):
+        self.bytes += len(text)
+
+def zip_codes():
+    with open(ZIP_TABLE, newline='') as f:
+        return sorted({row['zip'] for row in csv.DictReader(f)})
+
+def generate_rows(count: int, zips, seed: int = 1):
+    """Constituent rows, one at a time: mostly ZIP codes, some ZIP+4, a few districts and bad ZIPs"""
+    rng = random.Random(seed)
+    for number in range(count):
+        roll = rng.random()
+        zip_code = rng.choice(zips)
+        if roll < 0.2:
+            zip_code = f"{zip_code}-{rng.randrange(10000):04d}"
+        elif roll < 0.22:
+            zip_code = f"{rng.randrange(10000, 99999)}"
+        district = str(rng.randrange(1, 36)) if roll > 0.95 else ''
+        yield {'id': str(number), 'name': f"Constituent {number}", 'email': f"c{number}@example.com",
+               'zip': zip_code, 'district': district}
+
+def csv_lines(rows):
+    buffer = io.StringIO()
+    writer = None
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(row))
+            writer.writeheader()
+        writer.writerow(row)
+        buffer.seek(0)
+        for line in buffer.read().splitlines(keepends=True):
+            yield line
+        buffer.seek(0)
+        buffer.truncate()
+
+def jsonl_lines(rows):
+    for row in rows:
+        yield json.dumps(row) + '\n'
+
+def run(index, fmt: str, count: int, zips):
+    """Rows/sec and peak traced memory of resolving `count` generated rows"""
+    lines = csv_lines(generate_rows(count, zips)) if fmt == 'csv' else jsonl_lines(generate_rows(count, zips))
+    resolver = BulkResolver(index)
+    sink = NullSink()
+    tracemalloc.start()
+    start = time.perf_counter()
+    resolver.resolve_file(lines, sink, fmt)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return resolver, elapsed, peak, sink.bytes
+
+def per_row_http(index, count: int, zips) -> float:
+    """Rows/sec resolving each row with a /zip request and, when that redirects, a /district request"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app as app_module
+    app_module.refresher._swap(index)
+    client = app_module.app.test_client()
+    rows = list(generate_rows(count, zips))
+    start = time.perf_counter()
+    for row in rows:
+        response = client.get(f"/zip/{row['zip'][:5]}")
+        if response.status_code == 302:
+            client.get(response.headers['Location'])
+    return count / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk resolver throughput benchmark')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 200000], help='Rows per run')
+    parser.add_argument('--http-rows', type=int, default=500, help='Rows resolved one request at a time')
+    args = parser.parse_args()
+
+    index = LegislatureIndex(get_sample_data())
+    zips = zip_codes()
+    print(f"{'format':>6} {'rows':>8} {'rows/s':>9} {'peak KiB':>9} {'resolved':>9} {'output MiB':>11}")
+    for fmt in ('csv', 'jsonl'):
+        for count in args.rows:
+            resolver, elapsed, peak, written = run(index, fmt, count, zips)
+            print(f"{fmt:>6} {count:8d} {count / elapsed:9.0f} {peak / 1024:9.0f} "
+                  f"{resolver.resolved / count:9.1%} {written / 2 ** 20:11.1f}")
+    print(f"\nper-row HTTP (/zip then /district): {per_row_http(index, args.http_rows, zips):.0f} rows/s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Run a full scraper refresh against replayed fixtures and report throughput and latency
+Each run starts cold (empty page store) and is followed by a warm refresh that revalidates
+every page with conditional GETs, so both paths are measured on fixed inputs
+
+Usage:
+    python benchmarks/bench_scraper.py --latency 0.05 --multiply 10 --error-rate 0.02
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from replay import ReplayServer, latency_summary
+from scraper import IdahoLegislatureScraper
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'legislature')
+
+def make_scraper(base_url: str, directory: str, args) -> IdahoLegislatureScraper:
+    scraper = IdahoLegislatureScraper(
+        requests_per_second=args.rate,
+        burst=args.workers,
+        max_workers=args.workers,
+        parser_backend=args.parser
+    )
+    scraper.BASE_URL = base_url
+    scraper.CACHE_DURATION_HOURS = 0  # every get_all_data() call refreshes
+    scraper.CACHE_FILE = os.path.join(directory, 'cache.json')
+    scraper.SNAPSHOT_FILE = os.path.join(directory, 'snapshot.db')
+    scraper.JOURNAL_FILE = os.path.join(directory, 'changes.jsonl')
+    scraper.LOCK_FILE = os.path.join(directory, 'refresh.lock')
+    scraper.HISTORY_FILE = os.path.join(directory, 'history.db')
+    scraper.page_store.directory = os.path.join(directory, 'page_cache')
+    return scraper
+
+def timed_refresh(scraper: IdahoLegislatureScraper, server: ReplayServer):
+    """One get_all_data() call with its wall time and client-side response latencies"""
+    latencies = []
+    lock = threading.Lock()
+
+    def on_response(response, *args, **kwargs):
+        with lock:
+            latencies.append(response.elapsed.total_seconds())
+        return response
+
+    scraper.session.hooks['response'] = [on_response]
+    server.reset_stats()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        data = scraper.get_all_data()
+    return time.perf_counter() - start, data, latencies, server.stats()
+
+def report(label: str, elapsed: float, data, latencies, stats):
+    members = len(data['senators']) + len(data['representatives'])
+    records = members + len(data['committees'])
+    summary = latency_summary(latencies)
+    print(f"\n{label}: {elapsed:.2f} s")
+    print(f"  pages:    {stats['requests']:6d}  ({stats['requests'] / elapsed:7.1f} pages/s)  statuses {stats['statuses']}")
+    print(f"  records:  {records:6d}  ({records / elapsed:7.1f} records/s)  {members} members, {len(data['committees'])} committees")
+    print(f"  bytes:    {stats['bytes']:6d}")
+    print(f"  latency:  p50 {summary['p50']} ms  p90 {summary['p90']} ms  p99 {summary['p99']} ms  max {summary['max']} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end scraper benchmark on replayed pages')
+    parser.add_argument('--latency', type=float, default=0.05, help='Server latency per page in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random latency per page in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered 503')
+    parser.add_argument('--multiply', type=int, default=1, help='Copies of each member card or roster row')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent fetches')
+    parser.add_argument('--rate', type=float, default=100.0, help='Token bucket requests/sec')
+    parser.add_argument('--parser', default='lxml', help='Parser backend')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for jitter and errors')
+    args = parser.parse_args()
+
+    server = ReplayServer(
+        FIXTURES,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        multiply=args.multiply,
+        seed=args.seed
+    )
+    base_url = server.start()
+    directory = tempfile.mkdtemp(prefix='bench-scraper-')
+    print(f"Replaying {FIXTURES}: latency {args.latency * 1000:.0f} ms, jitter {args.jitter * 1000:.0f} ms, "
+          f"errors {args.error_rate:.0%}, {args.multiply}x cards, {args.workers} workers, {args.parser}")
+
+    report('cold refresh', *timed_refresh(make_scraper(base_url, directory, args), server))
+    # A new scraper, as in a new process: validators and page bodies on disk
+    report('warm refresh', *timed_refresh(make_scraper(base_url, directory, args), server))
+    server.stop()
+
+if __name__ == '__main__':
+    main()
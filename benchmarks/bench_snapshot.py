@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Compare startup load time and RSS of the JSON cache and the SQLite snapshot
+
+Each measurement runs in a fresh interpreter and looks up one district through a lazy
+LegislatureIndex, the way a CLI call would.
+
+Usage:
+    python benchmarks/bench_snapshot.py --copies 100
+"""
+import argparse
+import contextlib
+import io
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import replace
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+def build_cache(directory: str, copies: int):
+    """Write the sample legislature, repeated `copies` times, in both cache formats"""
+    from sample_data import get_sample_data
+    from scraper import IdahoLegislatureScraper
+
+    sample = get_sample_data()
+    data = {'senators': [], 'representatives': [], 'committees': []}
+    for copy in range(copies):
+        offset = copy * 35
+        data['senators'] += [replace(rep, district=rep.district + offset) for rep in sample['senators']]
+        data['representatives'] += [replace(rep, district=rep.district + offset) for rep in sample['representatives']]
+        data['committees'] += sample['committees']
+
+    for cache_format in ('json', 'snapshot'):
+        scraper = IdahoLegislatureScraper(cache_format=cache_format)
+        scraper.CACHE_FILE = os.path.join(directory, 'cache.json')
+        scraper.SNAPSHOT_FILE = os.path.join(directory, 'snapshot.db')
+        scraper.RECORD_HISTORY = False  # The repeated sample is no session to keep
+        with contextlib.redirect_stdout(io.StringIO()):
+            scraper._save_cache(data)
+    return len(data['senators']) + len(data['representatives'])
+
+def current_rss_kib() -> int:
+    """Resident set size right now; ru_maxrss would carry the parent's peak across fork"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def measure(directory: str, cache_format: str):
+    """Run inside a child process: load the cache and look up one district"""
+    from legislature_index import LegislatureIndex
+    from scraper import IdahoLegislatureScraper
+    rss_before = current_rss_kib()
+
+    start = time.perf_counter()
+    scraper = IdahoLegislatureScraper(cache_format=cache_format)
+    scraper.CACHE_FILE = os.path.join(directory, 'cache.json')
+    scraper.SNAPSHOT_FILE = os.path.join(directory, 'snapshot.db')
+    with contextlib.redirect_stdout(io.StringIO()):
+        data = scraper._load_cache()
+    load = time.perf_counter() - start
+    reps = LegislatureIndex(data, lazy=True).by_district(19)
+    total = time.perf_counter() - start
+
+    rss_after = current_rss_kib()
+    print(f"{load * 1000:.1f} {total * 1000:.1f} {(rss_after - rss_before) / 1024:.1f} {len(reps)}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Cache format load benchmark')
+    parser.add_argument('--copies', type=int, default=100, help='Copies of the sample legislature')
+    parser.add_argument('--measure', nargs=2, metavar=('DIR', 'FORMAT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        members = build_cache(directory, args.copies)
+        sizes = {
+            'json': os.path.getsize(os.path.join(directory, 'cache.json')),
+            'snapshot': os.path.getsize(os.path.join(directory, 'snapshot.db'))
+        }
+        print(f"\nMembers: {members}")
+        print(f"{'format':<10}{'file KiB':>10}{'load ms':>10}{'lookup ms':>11}{'+RSS MiB':>10}")
+        for cache_format in ('json', 'snapshot'):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--measure', directory, cache_format],
+                capture_output=True, text=True, check=True
+            ).stdout.split()
+            load, total, rss, _ = output
+            print(f"{cache_format:<10}{sizes[cache_format] / 1024:>10.0f}{float(load):>10.1f}"
+                  f"{float(total):>11.1f}{float(rss):>10.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Time ZIP code lookups in the packed ZIP index against a dict of lists built from the same table,
+and compare the memory each holds
+
+Usage:
+    python benchmarks/bench_zip.py --lookups 200000
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from zip_mapping import ZIP_TABLE, ZipDistrictIndex
+
+def build_dict(path: str):
+    """The ZIP table as a dict of district lists, largest share first, as it would be kept in a literal"""
+    zips = {}
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            share = float(row['share']) if (row.get('share') or '').strip() else 0.0
+            zips.setdefault(row['zip'], []).append((-share, int(row['district'])))
+    return {zip_code: [district for _, district in sorted(districts)] for zip_code, districts in zips.items()}
+
+def traced(build):
+    """An object built by `build` and the bytes it holds"""
+    tracemalloc.start()
+    obj = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+def main():
+    parser = argparse.ArgumentParser(description='ZIP index benchmark')
+    parser.add_argument('--lookups', type=int, default=200000, help='Lookups per structure')
+    args = parser.parse_args()
+
+    index, index_bytes = traced(lambda: ZipDistrictIndex.from_csv(ZIP_TABLE))
+    table, table_bytes = traced(lambda: build_dict(ZIP_TABLE))
+    rng = random.Random(1)
+    known = sorted(table)
+    # Mostly known ZIP codes, with some from elsewhere in Idaho's range
+    queries = [rng.choice(known) if rng.random() < 0.9 else f"{rng.randrange(83200, 83900)}"
+               for _ in range(args.lookups)]
+    assert all(index.districts(query) == table.get(query, []) for query in queries[:5000])
+
+    multi = sum(1 for districts in table.values() if len(districts) > 1)
+    print(f"{len(index)} ZIP codes, {multi} spanning more than one district")
+    for label, lookup, size in (('packed index', index.districts, index_bytes),
+                                ('dict of lists', lambda query: table.get(query, []), table_bytes)):
+        start = time.perf_counter()
+        for query in queries:
+            lookup(query)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:14s} {elapsed / len(queries) * 1e9:6.0f} ns/lookup  {size / 1024:6.1f} KiB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Build a statewide ZIP+4 range index from a synthetic table and time lookups against it, with
+the memory it holds next to the same ranges kept as a sorted list of tuples
+Each ZIP code in zip_districts.csv is cut into contiguous +4 ranges; in ZIP codes that span
+several districts, consecutive ranges are dealt out among those districts.
+
+Usage:
+    python benchmarks/bench_zip4.py --ranges-per-zip 700 --lookups 200000
+"""
+import argparse
+import bisect
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from zip_mapping import ZIP_INDEX, ZIP_TABLE, ZipPlus4Index
+
+def zip_districts():
+    with open(ZIP_TABLE, newline='') as f:
+        zips = {}
+        for row in csv.DictReader(f):
+            zips.setdefault(row['zip'], []).append(int(row['district']))
+    return zips
+
+def write_table(path: str, ranges_per_zip: int, rng: random.Random) -> int:
+    """Write the synthetic table; returns the number of ranges"""
+    count = 0
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['zip', 'plus4_low', 'plus4_high', 'district'])
+        for zip_code, districts in sorted(zip_districts().items()):
+            cuts = sorted(rng.sample(range(1, 10000), ranges_per_zip - 1))
+            for low, high in zip([0] + cuts, [cut - 1 for cut in cuts] + [9999]):
+                writer.writerow([zip_code, low, high, districts[count % len(districts)]])
+                count += 1
+    return count
+
+def traced(build):
+    """An object built by `build` and the bytes it holds"""
+    tracemalloc.start()
+    obj = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+def main():
+    parser = argparse.ArgumentParser(description='ZIP+4 range index benchmark')
+    parser.add_argument('--ranges-per-zip', type=int, default=700, help='+4 ranges cut from each ZIP code')
+    parser.add_argument('--lookups', type=int, default=200000, help='ZIP+4 codes to look up')
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    path = os.path.join(tempfile.mkdtemp(prefix='bench-zip4-'), 'zip4_districts.csv')
+    ranges = write_table(path, args.ranges_per_zip, rng)
+
+    start = time.perf_counter()
+    ZipPlus4Index.from_csv(path)
+    build = time.perf_counter() - start
+    index, index_bytes = traced(lambda: ZipPlus4Index.from_csv(path))
+    with open(path, newline='') as f:
+        rows, rows_bytes = traced(lambda: sorted((r['zip'], int(r['plus4_low']), int(r['plus4_high']), int(r['district']))
+                                                 for r in csv.DictReader(f)))
+    print(f"{ranges} ranges in {len(index.zips)} ZIP codes; built in {build * 1000:.0f} ms")
+    print(f"  packed arrays   {index.nbytes() / 2 ** 20:6.2f} MiB  (traced {index_bytes / 2 ** 20:.2f} MiB)")
+    print(f"  list of tuples  {rows_bytes / 2 ** 20:6.2f} MiB")
+
+    zips = sorted(index.zips)
+    queries = [(f"{rng.choice(zips):05d}", f"{rng.randrange(10000):04d}") for _ in range(args.lookups)]
+
+    def tuple_lookup(zip5, plus4):
+        position = bisect.bisect_right(rows, (zip5, int(plus4), 10000)) - 1
+        if position >= 0 and rows[position][0] == zip5 and rows[position][2] >= int(plus4):
+            return rows[position][3]
+        return 0
+
+    assert all(index.district(*query) == tuple_lookup(*query) for query in queries[:5000])
+    for label, lookup in (('packed index', index.district), ('list of tuples', tuple_lookup)):
+        start = time.perf_counter()
+        for zip5, plus4 in queries:
+            lookup(zip5, plus4)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:14s} {elapsed / len(queries) * 1e9:6.0f} ns/lookup")
+
+    split = [query for query in queries if len(ZIP_INDEX.districts(query[0])) > 1]
+    settled = sum(1 for query in split if index.district(*query))
+    print(f"  {len(split)} lookups in split ZIP codes, {settled / max(1, len(split)):.0%} settled to one district")
+
+if __name__ == '__main__':
+    main()
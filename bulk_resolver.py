@@ -0,0 +1,204 @@
+"""
+Streaming bulk resolver: constituent rows (CSV or JSON Lines) in, the same rows out with their
+district and legislators added
+Rows are read, resolved and written a chunk at a time, so memory stays flat however long the
+input is. Lookups are memoized per ZIP code and per district, which a campaign list repeats
+many times over.
+"""
+import csv
+import json
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from legislature_index import LegislatureIndex
+from district_boundaries import DistrictBoundaryIndex
+from zip_mapping import DISTRICT_COUNT, get_district_shares, get_districts_by_zip, plus4_district, split_zip
+
+# Input columns read, in the order they are tried
+ZIP_COLUMNS = ('zip', 'zip_code', 'zipcode', 'postal_code', 'ZIP', 'Zip')
+DISTRICT_COLUMNS = ('district', 'District', 'DISTRICT')
+LAT_COLUMNS = ('lat', 'latitude', 'Latitude')
+LON_COLUMNS = ('lon', 'lng', 'longitude', 'Longitude')
+
+# Columns added to every row
+DISTRICT_COLUMN = 'resolved_district'
+SOURCE_COLUMN = 'district_source'  # 'district', 'location', 'zip4', 'zip', 'zip_share', 'zip_ambiguous' or ''
+CANDIDATES_COLUMN = 'zip_districts'
+LEGISLATOR_COLUMNS = ('senator', 'senator_email', 'house_a', 'house_a_email', 'house_b', 'house_b_email')
+OUTPUT_COLUMNS = (DISTRICT_COLUMN, SOURCE_COLUMN, CANDIDATES_COLUMN) + LEGISLATOR_COLUMNS
+# A JSON Lines input line that isn't a JSON object comes out as {"line": n, "error": "..."}
+LINE_COLUMN = 'line'
+ERROR_COLUMN = 'error'
+
+FORMATS = ('csv', 'jsonl')
+
+def detect_format(name: str, content_type: str = '') -> str:
+    """'jsonl' for .jsonl/.ndjson files or JSON content types, otherwise 'csv'"""
+    if name.endswith(('.jsonl', '.ndjson')) or 'json' in content_type:
+        return 'jsonl'
+    return 'csv'
+
+def _first(row: Dict, columns: Tuple[str, ...]) -> str:
+    for column in columns:
+        value = row.get(column)
+        if value not in (None, ''):
+            return str(value).strip()
+    return ''
+
+def _number(value: str, kind=float):
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        return None
+
+class _BadLine:
+    """An input line that could not be read as a row, passed through in place of its row"""
+    __slots__ = ('line', 'error')
+
+    def __init__(self, line: int, error: str):
+        self.line = line
+        self.error = error
+
+def _jsonl_rows(source: Iterable[str]) -> Iterator:
+    """Rows from JSON Lines, with a _BadLine for each line that isn't a JSON object"""
+    for number, line in enumerate(source, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield _BadLine(number, f"Invalid JSON: {e}")
+            continue
+        yield row if isinstance(row, dict) else _BadLine(number, f"Expected a JSON object, got {type(row).__name__}")
+
+class BulkResolver:
+    """Resolves rows against the ZIP index, the boundary index (when loaded) and the legislator index"""
+    CHUNK_ROWS = 1000  # Rows read before a chunk is resolved and written
+
+    def __init__(self, index: LegislatureIndex, boundaries: Optional[DistrictBoundaryIndex] = None):
+        self.index = index
+        self.boundaries = boundaries
+        # District -> legislator columns, and ZIP -> (district, source, candidates), filled as seen
+        self._legislators: Dict[int, Dict[str, str]] = {}
+        self._zips: Dict[str, Tuple[Optional[int], str, str]] = {}
+        self.rows = 0
+        self.resolved = 0
+        self.errors = 0
+
+    def _legislator_columns(self, district: Optional[int]) -> Dict[str, str]:
+        if district is None:
+            return dict.fromkeys(LEGISLATOR_COLUMNS, '')
+        columns = self._legislators.get(district)
+        if columns is None:
+            delegation = self.index.delegation(district)
+            senator = delegation['senate']
+            house = sorted(delegation['house'], key=lambda rep: rep.house_seat.value if rep.house_seat else '')
+            columns = dict.fromkeys(LEGISLATOR_COLUMNS, '')
+            if senator:
+                columns['senator'] = senator.name
+                columns['senator_email'] = senator.contact.email or ''
+            for prefix, rep in zip(('house_a', 'house_b'), house):
+                columns[prefix] = rep.name
+                columns[f'{prefix}_email'] = rep.contact.email or ''
+            self._legislators[district] = columns
+        return columns
+
+    def _zip_district(self, zip_code: str) -> Tuple[Optional[int], str, str]:
+        zip5, plus4 = split_zip(zip_code)
+        resolved = self._zips.get(zip5)
+        if resolved is None:
+            districts = get_districts_by_zip(zip5)
+            candidates = ';'.join(str(district) for district in districts)
+            if not districts:
+                resolved = (None, '', '')
+            elif len(districts) == 1:
+                resolved = (districts[0], 'zip', candidates)
+            elif get_district_shares(zip5):
+                # The district holding most of the ZIP's population; the rest stay listed as candidates
+                resolved = (districts[0], 'zip_share', candidates)
+            else:
+                # Nothing ranks this split ZIP's districts, so it stays unresolved with every candidate listed
+                resolved = (None, 'zip_ambiguous', candidates)
+            self._zips[zip5] = resolved
+        if resolved[1] in ('zip_ambiguous', 'zip_share'):
+            # ZIP+4 ranges are only looked up (not memoized) in the ZIP codes they can settle
+            district = plus4_district(zip5, plus4)
+            if district:
+                return district, 'zip4', resolved[2]
+        return resolved
+
+    def resolve_row(self, row: Dict) -> Dict:
+        """The row with its district, how it was found, and that district's legislators"""
+        zip_code = _first(row, ZIP_COLUMNS)
+        district, source, candidates = self._zip_district(zip_code) if zip_code else (None, '', '')
+
+        explicit = _number(_first(row, DISTRICT_COLUMNS), int)
+        if explicit is not None and 1 <= explicit <= DISTRICT_COUNT:
+            district, source = explicit, 'district'
+        elif self.boundaries is not None:
+            lat, lon = _number(_first(row, LAT_COLUMNS)), _number(_first(row, LON_COLUMNS))
+            if lat is not None and lon is not None:
+                located = self.boundaries.locate(lat, lon, [int(d) for d in candidates.split(';') if d])
+                if located:
+                    district, source = located, 'location'
+
+        self.rows += 1
+        if district is not None:
+            self.resolved += 1
+        out = dict(row)
+        out[DISTRICT_COLUMN] = district if district is not None else ''
+        out[SOURCE_COLUMN] = source
+        out[CANDIDATES_COLUMN] = candidates
+        out.update(self._legislator_columns(district))
+        return out
+
+    def resolve_chunks(self, rows: Iterable[Dict]) -> Iterator[List[Dict]]:
+        """Resolved rows, `CHUNK_ROWS` at a time"""
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.CHUNK_ROWS))
+            if not chunk:
+                return
+            yield [self.resolve_row(row) if type(row) is not _BadLine else self._error_row(row) for row in chunk]
+
+    def _error_row(self, bad: _BadLine) -> Dict:
+        # Reported in place, so one bad line doesn't end the run or cut a streamed response short
+        self.errors += 1
+        return {LINE_COLUMN: bad.line, ERROR_COLUMN: bad.error}
+
+    def stream(self, source: Iterable[str], fmt: str) -> Iterator[str]:
+        """Read CSV or JSON Lines from an iterable of lines, and yield the output text a chunk at a time"""
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format: {fmt}")
+        if fmt == 'jsonl':
+            for chunk in self.resolve_chunks(_jsonl_rows(source)):
+                yield ''.join(json.dumps(row) + '\n' for row in chunk)
+            return
+
+        reader = csv.DictReader(source)
+        fieldnames = list(reader.fieldnames or []) + [column for column in OUTPUT_COLUMNS
+                                                      if column not in (reader.fieldnames or [])]
+        buffer = _LineBuffer()
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        yield buffer.take()
+        for chunk in self.resolve_chunks(reader):
+            writer.writerows(chunk)
+            yield buffer.take()
+
+    def resolve_file(self, source: TextIO, destination: TextIO, fmt: str):
+        for text in self.stream(source, fmt):
+            destination.write(text)
+
+class _LineBuffer:
+    """A write target for csv.writer that hands back what was written since the last take()"""
+
+    def __init__(self):
+        self._parts: List[str] = []
+
+    def write(self, text: str):
+        self._parts.append(text)
+
+    def take(self) -> str:
+        text = ''.join(self._parts)
+        self._parts = []
+        return text
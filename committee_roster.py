@@ -0,0 +1,41 @@
+"""
+Matching committee roster names to member records
+Rosters print names as the committee page does, often without middle names or initials, so a name
+with no exact match in the committee's chamber falls back to a last name unique in that chamber
+"""
+from typing import Dict, Iterator, List, Optional, Tuple
+from models import Chamber, Committee, Representative
+
+# Roles yielded by RosterMatcher.roles, strongest first
+CHAIR = 'chair'
+VICE_CHAIR = 'vice_chair'
+MEMBER = 'member'
+
+class RosterMatcher:
+    """Finds the members a committee roster names, within the committee's chamber"""
+
+    def __init__(self, members: List[Representative]):
+        self._by_name: Dict[Tuple[Chamber, str], int] = {}
+        self._by_last_name: Dict[Tuple[Chamber, str], List[int]] = {}
+        for member_id, rep in enumerate(members):
+            self._by_name[(rep.chamber, rep.name.lower())] = member_id
+            self._by_last_name.setdefault((rep.chamber, rep.name.split()[-1].lower()), []).append(member_id)
+
+    def match(self, chamber: Chamber, person: str) -> Optional[int]:
+        """Index of the member a roster name refers to, or None when no member or several could be meant"""
+        member_id = self._by_name.get((chamber, person.lower()))
+        if member_id is None:
+            candidates = self._by_last_name.get((chamber, person.split()[-1].lower()), [])
+            member_id = candidates[0] if len(candidates) == 1 else None
+        return member_id
+
+    def roles(self, committee: Committee) -> Iterator[Tuple[int, str]]:
+        """(member index, role) for each roster name that matches a member, chair first"""
+        people = [(committee.chair, CHAIR), (committee.vice_chair, VICE_CHAIR)]
+        people += [(person, MEMBER) for person in committee.members or []]
+        for person, role in people:
+            if not person or not person.strip():
+                continue
+            member_id = self.match(committee.chamber, person)
+            if member_id is not None:
+                yield member_id, role
@@ -0,0 +1,114 @@
+"""
+Compact, slotted legislator records for keeping many sessions resident in a worker
+Records have no per-instance __dict__, strings repeated across records and sessions are
+interned, and members refer to their committees by integer id
+"""
+import sys
+import threading
+from collections.abc import Mapping
+from typing import Dict, List, Optional
+from models import Representative, Committee, Contact
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+class CommitteeTable:
+    """Committee names by integer id, shared by every session loaded in the process"""
+
+    def __init__(self):
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def id_for(self, name: str) -> int:
+        """The id of a committee name, assigning the next one to a new name"""
+        committee_id = self._ids.get(name)
+        if committee_id is None:
+            with self._lock:
+                committee_id = self._ids.get(name)
+                if committee_id is None:
+                    committee_id = len(self.names)
+                    self.names.append(sys.intern(name))
+                    self._ids[name] = committee_id
+        return committee_id
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+COMMITTEES = CommitteeTable()
+
+_set = object.__setattr__
+
+class _ReadOnly:
+    """Slotted record whose fields are set once, in __init__"""
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+class CompactContact(_ReadOnly):
+    """Read-only, slotted Contact"""
+    __slots__ = ('email', 'home_phone', 'business_phone', 'statehouse_phone', 'mailing_address')
+
+    def __init__(self, contact: Contact):
+        _set(self, 'email', _intern(contact.email))
+        _set(self, 'home_phone', _intern(contact.home_phone))
+        _set(self, 'business_phone', _intern(contact.business_phone))
+        _set(self, 'statehouse_phone', _intern(contact.statehouse_phone))
+        _set(self, 'mailing_address', _intern(contact.mailing_address))
+
+    def __repr__(self) -> str:
+        return f"CompactContact(email={self.email!r})"
+
+class CompactRepresentative(_ReadOnly):
+    """Read-only, slotted Representative; `committees` is rebuilt from committee ids when read"""
+    __slots__ = ('name', 'party', 'district', 'chamber', 'contact', 'occupation', 'term_number',
+                 'house_seat', 'committee_ids', 'bio', 'profile_url')
+
+    def __init__(self, rep: Representative):
+        _set(self, 'name', sys.intern(rep.name))
+        _set(self, 'party', rep.party)
+        _set(self, 'district', rep.district)
+        _set(self, 'chamber', rep.chamber)
+        _set(self, 'contact', CompactContact(rep.contact))
+        _set(self, 'occupation', _intern(rep.occupation))
+        _set(self, 'term_number', rep.term_number)
+        _set(self, 'house_seat', rep.house_seat)
+        _set(self, 'committee_ids', tuple(COMMITTEES.id_for(name) for name in rep.committees))
+        # Bios repeat word for word from one session to the next
+        _set(self, 'bio', _intern(rep.bio))
+        _set(self, 'profile_url', _intern(rep.profile_url))
+
+    @property
+    def committees(self) -> List[str]:
+        names = COMMITTEES.names
+        return [names[committee_id] for committee_id in self.committee_ids]
+
+    def __repr__(self) -> str:
+        return f"CompactRepresentative(name={self.name!r}, district={self.district}, chamber={self.chamber.value!r})"
+
+class CompactCommittee(_ReadOnly):
+    """Read-only, slotted Committee; roster names are interned, so they share the members' name strings"""
+    __slots__ = ('committee_id', 'name', 'chamber', 'chair', 'vice_chair', 'members')
+
+    def __init__(self, committee: Committee):
+        _set(self, 'committee_id', COMMITTEES.id_for(committee.name))
+        _set(self, 'name', COMMITTEES.names[self.committee_id])
+        _set(self, 'chamber', committee.chamber)
+        _set(self, 'chair', _intern(committee.chair))
+        _set(self, 'vice_chair', _intern(committee.vice_chair))
+        _set(self, 'members', tuple(sys.intern(name) for name in committee.members or ()))
+
+    def __repr__(self) -> str:
+        return f"CompactCommittee(name={self.name!r}, chamber={self.chamber.value!r})"
+
+def compact_legislature(data: Mapping) -> Dict[str, list]:
+    """Copy a snapshot's records into compact ones"""
+    return {
+        'senators': [CompactRepresentative(rep) for rep in data['senators']],
+        'representatives': [CompactRepresentative(rep) for rep in data['representatives']],
+        'committees': [CompactCommittee(committee) for committee in data['committees']]
+    }
@@ -0,0 +1,162 @@
+"""
+Point-in-district lookup from legislative district boundary polygons
+Boundaries are read from a GeoJSON FeatureCollection (a shapefile can be converted with
+`ogr2ogr -f GeoJSON -t_srs EPSG:4326 districts.geojson districts.shp`). A uniform grid over the
+state answers most points outright; the rest are settled by ray casting against the few
+districts whose edges cross the point's grid cell.
+"""
+import json
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+Point = Tuple[float, float]
+Edge = Tuple[float, float, float, float]
+
+# Feature properties that may hold the district number, in the order they are tried
+DISTRICT_PROPERTIES = ('district', 'DISTRICT', 'District', 'DISTRICTN', 'DIST', 'LD', 'SLDUST', 'NAME', 'name')
+DISTRICT_NUMBER = re.compile(r'\d+')
+
+class DistrictPolygon:
+    """One district's rings (outer boundaries and holes alike), with edges bucketed into horizontal bands"""
+    BANDS = 64  # Edge buckets per polygon; a ray only crosses the edges in its point's band
+
+    def __init__(self, district: int, rings: Sequence[Sequence[Point]]):
+        self.district = district
+        self.edges: List[Edge] = []
+        for ring in rings:
+            for (x1, y1), (x2, y2) in zip(ring, list(ring[1:]) + [ring[0]]):
+                if (x1, y1) != (x2, y2):
+                    self.edges.append((x1, y1, x2, y2))
+        xs = [x for edge in self.edges for x in (edge[0], edge[2])]
+        ys = [y for edge in self.edges for y in (edge[1], edge[3])]
+        self.bbox = (min(xs), min(ys), max(xs), max(ys))
+        self._band_height = (self.bbox[3] - self.bbox[1]) / self.BANDS or 1.0
+        self._bands: List[List[Edge]] = [[] for _ in range(self.BANDS)]
+        for edge in self.edges:
+            low, high = sorted((edge[1], edge[3]))
+            for band in range(self._band(low), self._band(high) + 1):
+                self._bands[band].append(edge)
+
+    def _band(self, y: float) -> int:
+        return min(self.BANDS - 1, max(0, int((y - self.bbox[1]) / self._band_height)))
+
+    def contains(self, x: float, y: float) -> bool:
+        """Even-odd ray casting, so holes and multi-part districts need no special case"""
+        min_x, min_y, max_x, max_y = self.bbox
+        if not (min_x <= x <= max_x and min_y <= y <= max_y):
+            return False
+        inside = False
+        for x1, y1, x2, y2 in self._bands[self._band(y)]:
+            if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+                inside = not inside
+        return inside
+
+class DistrictBoundaryIndex:
+    """Uniform grid over the districts: each cell is either settled (one district, or none) or
+    lists the districts to ray-cast against, those whose edges cross it first"""
+    GRID_SIZE = 128  # Cells along each side of the state's bounding box
+
+    def __init__(self, polygons: Iterable[DistrictPolygon], grid_size: Optional[int] = None):
+        self.polygons: List[DistrictPolygon] = list(polygons)
+        self.grid_size = grid_size or self.GRID_SIZE
+        if not self.polygons:
+            raise ValueError("No district boundaries to index")
+        self.bbox = (min(p.bbox[0] for p in self.polygons), min(p.bbox[1] for p in self.polygons),
+                     max(p.bbox[2] for p in self.polygons), max(p.bbox[3] for p in self.polygons))
+        size = self.grid_size
+        self._cell_width = (self.bbox[2] - self.bbox[0]) / size or 1.0
+        self._cell_height = (self.bbox[3] - self.bbox[1]) / size or 1.0
+
+        # Cells each polygon's edges pass through (by the edge's bounding box, so a superset)
+        crossing: List[set] = [set() for _ in range(size * size)]
+        for polygon_id, polygon in enumerate(self.polygons):
+            for x1, y1, x2, y2 in polygon.edges:
+                col_low, row_low = self._cell(min(x1, x2), min(y1, y2))
+                col_high, row_high = self._cell(max(x1, x2), max(y1, y2))
+                for row in range(row_low, row_high + 1):
+                    for col in range(col_low, col_high + 1):
+                        crossing[row * size + col].add(polygon_id)
+
+        # A district whose edges don't cross a cell covers all of it or none of it, so its
+        # cell-center test settles the whole cell; a cell no edge crosses needs no test at all
+        self._settled: List[Optional[int]] = [None] * (size * size)
+        self._candidates: List[Tuple[int, ...]] = [()] * (size * size)
+        for cell in range(size * size):
+            row, col = divmod(cell, size)
+            x = self.bbox[0] + (col + 0.5) * self._cell_width
+            y = self.bbox[1] + (row + 0.5) * self._cell_height
+            covering = [polygon_id for polygon_id, polygon in enumerate(self.polygons)
+                        if polygon_id not in crossing[cell] and polygon.contains(x, y)]
+            if crossing[cell]:
+                self._candidates[cell] = tuple(sorted(crossing[cell])) + tuple(covering)
+            else:
+                self._settled[cell] = self.polygons[covering[0]].district if covering else 0
+        self.settled_cells = sum(1 for district in self._settled if district is not None)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        size = self.grid_size
+        col = min(size - 1, max(0, int((x - self.bbox[0]) / self._cell_width)))
+        row = min(size - 1, max(0, int((y - self.bbox[1]) / self._cell_height)))
+        return col, row
+
+    def locate(self, lat: float, lon: float, districts_first: Sequence[int] = ()) -> Optional[int]:
+        """The district containing a point; `districts_first` (e.g. a ZIP's districts) are tested first"""
+        x, y = lon, lat
+        min_x, min_y, max_x, max_y = self.bbox
+        if not (min_x <= x <= max_x and min_y <= y <= max_y):
+            return None
+        col, row = self._cell(x, y)
+        cell = row * self.grid_size + col
+        settled = self._settled[cell]
+        if settled is not None:
+            return settled or None
+        candidates = self._candidates[cell]
+        if districts_first:
+            preferred = {district: rank for rank, district in enumerate(districts_first)}
+            candidates = sorted(candidates, key=lambda polygon_id: preferred.get(self.polygons[polygon_id].district,
+                                                                              len(preferred)))
+        for polygon_id in candidates:
+            polygon = self.polygons[polygon_id]
+            if polygon.contains(x, y):
+                return polygon.district
+        return None
+
+    @classmethod
+    def from_geojson(cls, path: str, district_property: Optional[str] = None,
+                     grid_size: Optional[int] = None) -> 'DistrictBoundaryIndex':
+        """Index the Polygon and MultiPolygon features of a GeoJSON file (longitude, latitude)"""
+        with open(path) as f:
+            collection = json.load(f)
+        polygons = []
+        for feature in collection.get('features', []):
+            geometry = feature.get('geometry') or {}
+            district = feature_district(feature.get('properties') or {}, district_property)
+            if district is None:
+                raise ValueError(f"Feature without a district number: {feature.get('properties')}")
+            if geometry.get('type') == 'Polygon':
+                rings = geometry['coordinates']
+            elif geometry.get('type') == 'MultiPolygon':
+                rings = [ring for part in geometry['coordinates'] for ring in part]
+            else:
+                continue
+            polygons.append(DistrictPolygon(district, [[(point[0], point[1]) for point in ring] for ring in rings]))
+        return cls(polygons, grid_size)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'districts': len({polygon.district for polygon in self.polygons}),
+            'edges': sum(len(polygon.edges) for polygon in self.polygons),
+            'cells': self.grid_size * self.grid_size,
+            'settled_cells': self.settled_cells
+        }
+
+def feature_district(properties: Dict, district_property: Optional[str] = None) -> Optional[int]:
+    """The district number in a feature's properties, e.g. 19 from {"NAME": "District 19"}"""
+    for key in ((district_property,) if district_property else DISTRICT_PROPERTIES):
+        value = properties.get(key)
+        if isinstance(value, int):
+            return value
+        match = DISTRICT_NUMBER.search(str(value)) if value is not None else None
+        if match:
+            return int(match.group())
+    return None
@@ -0,0 +1,368 @@
+"""
+Single-pass extraction of legislator records from membership page elements
+One walk over a card reads its tagged child elements and collects its text; precompiled
+patterns over that text fill in only the fields the markup didn't tag
+Member profile pages are read the same way for the details the cards leave out
+"""
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from bs4 import NavigableString, Tag
+from models import Representative, Contact, Party, Chamber, HouseSeat
+
+# Name words: capitalized (with accents, inner capitals as in DeMordaunt, and apostrophes or
+# hyphens between parts), initials such as "C.", and lower-case particles; labels and titles
+# never start one
+NAME_LETTERS = "A-Za-zÀ-ÖØ-öø-ÿ"
+NAME_WORD = rf"(?:[A-ZÀ-ÖØ-Þ][{NAME_LETTERS}]*(?:['’-][{NAME_LETTERS}]+)*|[A-Z]\.)"
+NAME_PARTICLE = r"(?:de|del|der|den|van|von|da|la|le)\b"
+NON_NAME = (r"(?!(?:District|Seat|Email|Home|Business|Statehouse|Phone|Occupation|Sen|Senator|Rep"
+            r"|Representative|Senate|House|Committees?)\b)")
+
+# Fallback patterns for fields a card doesn't tag. Separate patterns with literal
+# prefixes scan faster under the re module than one combined alternation does.
+TEXT_PATTERNS = {
+    'name': re.compile(rf"(?<![\w.]){NON_NAME}({NAME_WORD}(?:\s+{NON_NAME}(?:{NAME_PARTICLE}\s+)*{NAME_WORD})+)"),
+    'party': re.compile(r'\(([RD])\)'),
+    'district': re.compile(r'District\s*(\d+)'),
+    'seat': re.compile(r'Seat\s*([AB])\b'),
+    'email': re.compile(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'),
+    'occupation': re.compile(r'Occupation:\s*([^,\n]+)')
+}
+# Card text is joined with spaces, so cut an occupation off where the next label starts;
+# only labels, so "Small Business Owner" keeps its "Business"
+OCCUPATION_END = re.compile(r'\s+(?:District\s+\d|Seat\s+[AB]\b|(?:Home|Business|Statehouse)(?:\s+(?:Phone|Address)\b|:)'
+                            r'|Email\b)|\s*\(\d{3}\)')
+PHONE_PATTERN = re.compile(r'(\(\d{3}\)\s?\d{3}-\d{4})')
+FIELD_COUNT = len(TEXT_PATTERNS) + 1  # plus 'phones'
+
+# Links from a card or roster row to the member's own page, e.g. /senate/membership/smarysouz/
+MEMBER_PROFILE_LINK = re.compile(r'/(?:senate|house)/membership/[^/?#]+')
+
+DISTRICT_PATTERN = re.compile(r'(\d+)')
+# Text pieces that start with their label carry that field alone, e.g. "Occupation: Small Business Owner"
+LABELLED_PIECE = re.compile(r'(District|Seat|Occupation)\b:?\s*([^,]*)')
+LABELLED_FIELDS = {'District': 'district', 'Seat': 'seat', 'Occupation': 'occupation'}
+LABEL_INITIALS = frozenset(label[0] for label in LABELLED_FIELDS)
+PARTY_PIECES = {'(R)': 'R', '(D)': 'D'}
+# Titles in front of a profile link's text, e.g. "Sen. Lori Den Hartog"
+MEMBER_TITLE = re.compile(r'^(?:Sen(?:ator)?|Rep(?:resentative)?)\.?\s+')
+SEAT_PATTERN = re.compile(r'\b([AB])\b')
+PARTIES = {'R': Party.REPUBLICAN, 'D': Party.DEMOCRAT}
+SEATS = {'A': HouseSeat.A, 'B': HouseSeat.B}
+
+# CSS classes on card children that carry a single field
+STRUCTURED_CLASSES = {
+    'member-name': 'name',
+    'name': 'name',
+    'member-party': 'party',
+    'party': 'party',
+    'member-district': 'district',
+    'district': 'district',
+    'member-seat': 'seat',
+    'seat': 'seat',
+    'member-occupation': 'occupation',
+    'occupation': 'occupation'
+}
+
+# Member profile pages
+TERM_PATTERN = re.compile(r'\b(\d+)(?:st|nd|rd|th)\s+term\b|\bterms?(?:\s+number)?:\s*(\d+)', re.IGNORECASE)
+BUSINESS_PHONE_PATTERN = re.compile(r'\bBus(?:iness|\.)?:?\s*(\(\d{3}\)\s?\d{3}-\d{4})')
+ADDRESS_LABEL = re.compile(r'^(?:Mailing\s+)?Address:?\s*(.*)$', re.IGNORECASE)
+CITY_LINE = re.compile(r',\s*(?:ID|Idaho)\s+\d{5}(?:-\d{4})?$')
+COMMITTEE_LINK = re.compile(r'/committees/(?:senate|house)committees/[^/?#]+')
+BIO_CLASSES = re.compile(r'(^|\s)(?:member-)?bio(?:graphy)?(\s|$)')
+BIO_HEADING = re.compile(r'^(?:Biography|About)\b', re.IGNORECASE)
+HEADINGS = ('h1', 'h2', 'h3', 'h4')
+
+@dataclass
+class MemberProfile:
+    term_number: Optional[int] = None
+    business_phone: Optional[str] = None
+    mailing_address: Optional[str] = None
+    committees: List[str] = field(default_factory=list)
+    bio: Optional[str] = None
+
+def _tag_text(tag: Tag) -> str:
+    # Most tagged fields hold a single string, which skips a get_text() walk
+    contents = tag.contents
+    if len(contents) == 1 and type(contents[0]) is NavigableString:
+        return contents[0].strip()
+    return tag.get_text(' ', strip=True)
+
+def _next_outside(node, top=None):
+    """The first node after `node` and its descendants, or None past the end of `top`"""
+    while node is not top and node is not None:
+        sibling = node.next_sibling
+        if sibling is not None:
+            return sibling
+        node = node.parent
+    return None
+
+class MemberExtractor:
+    """Turn member-card or table-row elements into Representative records"""
+
+    def __init__(self):
+        self.failures: Counter = Counter()
+        self.records = 0
+        self._lock = threading.Lock()
+
+    def _walk(self, element) -> Tuple[Dict[str, object], List[str], Optional[str]]:
+        """Collect tagged fields, labelled text pieces, phone numbers, the card's text and its profile
+        link in a single walk over its descendants"""
+        fields: Dict[str, object] = {}
+        phones: List[str] = []
+        text_phones: List[str] = []
+        pieces: List[str] = []
+        profile_url = None
+        # Followed by hand rather than through .descendants, so a tag whose field has been
+        # read can skip its own text
+        stop = _next_outside(element)
+        node = element.next_element
+        while node is not None and node is not stop:
+            node_type = type(node)
+            if node_type is NavigableString:
+                piece = node.strip()
+                if piece:
+                    pieces.append(piece)
+                    # Most pieces are neither labelled nor hold a phone number; the first
+                    # character and a substring test rule them out without a pattern
+                    labelled = LABELLED_PIECE.match(piece) if piece[0] in LABEL_INITIALS else None
+                    if labelled is not None:
+                        value = labelled.group(2).strip()
+                        if value:
+                            fields.setdefault(LABELLED_FIELDS[labelled.group(1)], value)
+                    elif '(' in piece:
+                        party = PARTY_PIECES.get(piece)
+                        if party is not None:
+                            fields.setdefault('party', party)
+                        elif not phones:
+                            text_phones += PHONE_PATTERN.findall(piece)
+                node = node.next_element
+                continue
+            attrs = node.attrs if node_type is Tag else None
+            if not attrs:
+                node = node.next_element
+                continue
+            read = False
+            href = attrs.get('href')
+            if href:
+                if href.startswith('mailto:'):
+                    fields.setdefault('email', href[len('mailto:'):].split('?')[0])
+                    read = True
+                elif href.startswith('tel:'):
+                    phones.append(_tag_text(node))
+                    read = True
+                elif profile_url is None and MEMBER_PROFILE_LINK.search(href):
+                    profile_url = href
+                    # The link text is the member's name, after their title
+                    name = MEMBER_TITLE.sub('', _tag_text(node))
+                    if name:
+                        fields.setdefault('name', name)
+                        read = True
+            else:
+                for css_class in attrs.get('class') or ():
+                    field = STRUCTURED_CLASSES.get(css_class)
+                    if field and field not in fields:
+                        value = _tag_text(node)
+                        if field == 'name':
+                            value = MEMBER_TITLE.sub('', value)
+                        if value:
+                            fields[field] = value
+                            read = True
+                        break
+            node = _next_outside(node, element) if read else node.next_element
+        # Numbers on tel: links, otherwise the ones written in the card's text
+        if phones or text_phones:
+            fields['phones'] = phones or text_phones
+        return fields, pieces, profile_url
+    
+    def _scan_text(self, text: str, fields: Dict[str, object], chamber: Chamber):
+        """Fill fields missing from the structured walk from the card's text"""
+        for field, pattern in TEXT_PATTERNS.items():
+            if field not in fields and (field != 'seat' or chamber == Chamber.HOUSE):
+                match = pattern.search(text)
+                if match:
+                    fields[field] = match.group(1)
+                    if field == 'occupation':
+                        # Flattened text runs on into the next label
+                        fields[field] = OCCUPATION_END.split(match.group(1), 1)[0].strip()
+        if 'phones' not in fields:
+            phones = PHONE_PATTERN.findall(text)
+            if phones:
+                fields['phones'] = phones
+
+    def extract(self, element, chamber: Chamber) -> Optional[Representative]:
+        """Parse one member element, counting any field that can't be read"""
+        failed: List[str] = []
+        try:
+            fields, pieces, profile_url = self._walk(element)
+            # Senators have no seat; the text is only scanned when the walk left a field unread
+            if len(fields) < (FIELD_COUNT if chamber == Chamber.HOUSE else FIELD_COUNT - 1):
+                self._scan_text(' '.join(pieces), fields, chamber)
+
+            name = fields.get('name')
+            district = fields.get('district')
+            if district and not district.isdigit():
+                # Tagged values carry their label, e.g. "District 5"
+                district_match = DISTRICT_PATTERN.search(district)
+                district = district_match.group(1) if district_match else None
+            if not name:
+                failed.append('name')
+            if not district:
+                failed.append('district')
+            if failed:
+                return None
+
+            party_text = fields.get('party')
+            if not party_text:
+                failed.append('party')
+            # Unlabelled cards default to Democrat, as the scraper always has
+            party = PARTIES.get(party_text.lstrip('( ')[:1].upper(), Party.DEMOCRAT) if party_text else Party.DEMOCRAT
+
+            house_seat = None
+            if chamber == Chamber.HOUSE:
+                seat = fields.get('seat')
+                if seat and seat not in SEATS:
+                    seat_match = SEAT_PATTERN.search(seat)
+                    seat = seat_match.group(1) if seat_match else None
+                if seat:
+                    house_seat = SEATS[seat]
+                else:
+                    failed.append('seat')
+
+            email = fields.get('email') or ""
+            if not email:
+                failed.append('email')
+
+            phones = fields.get('phones') or []
+            if not phones:
+                failed.append('phone')
+
+            occupation = fields.get('occupation') or None
+            if not occupation:
+                failed.append('occupation')
+
+            contact = Contact(
+                email=email,
+                home_phone=phones[0] if len(phones) > 0 else None,
+                statehouse_phone=phones[1] if len(phones) > 1 else None
+            )
+
+            return Representative(
+                name=name,
+                party=party,
+                district=int(district),
+                chamber=chamber,
+                contact=contact,
+                occupation=occupation,
+                house_seat=house_seat,
+                profile_url=profile_url
+            )
+        except Exception:
+            failed.append('error')
+            return None
+        finally:
+            with self._lock:
+                self.records += 1
+                for field in failed:
+                    self.failures[field] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of records seen and per-field failure counts"""
+        with self._lock:
+            return {'records': self.records, **self.failures}
+
+    def reset(self):
+        """Start counting afresh, e.g. at the start of each refresh"""
+        with self._lock:
+            self.records = 0
+            self.failures.clear()
+
+class ProfileExtractor:
+    """Read the details only a member's own page carries: term, business phone, address, committees, bio"""
+
+    def __init__(self):
+        self.failures: Counter = Counter()
+        self.records = 0
+        self._lock = threading.Lock()
+
+    def _mailing_address(self, lines: List[str]) -> Optional[str]:
+        for index, line in enumerate(lines):
+            match = ADDRESS_LABEL.match(line)
+            if not match:
+                continue
+            # The label and the address are often separate strings, and <br> splits street from city
+            parts = [match.group(1)] if match.group(1) else []
+            following = lines[index + 1:index + 3]
+            if not parts and following:
+                parts.append(following.pop(0))
+            if parts and not CITY_LINE.search(parts[-1]) and following and CITY_LINE.search(following[0]):
+                parts.append(following[0])
+            return ', '.join(parts) or None
+        return None
+
+    def _bio(self, root) -> Optional[str]:
+        tagged = root.find(class_=BIO_CLASSES)
+        if tagged is not None:
+            return tagged.get_text(' ', strip=True) or None
+        heading = root.find(HEADINGS, string=BIO_HEADING)
+        if heading is None:
+            return None
+        paragraphs = []
+        for sibling in heading.find_next_siblings():
+            if sibling.name in HEADINGS:
+                break
+            if sibling.name == 'p':
+                paragraphs.append(sibling.get_text(' ', strip=True))
+        return ' '.join(part for part in paragraphs if part) or None
+
+    def extract(self, soup) -> Optional[MemberProfile]:
+        """Parse one profile page, counting any field it doesn't carry"""
+        failed: List[str] = []
+        try:
+            root = soup.find(class_='member-profile') or soup.find('main') or soup
+            lines = root.get_text('\n', strip=True).split('\n')
+            text = '\n'.join(lines)
+
+            profile = MemberProfile()
+            term_match = TERM_PATTERN.search(text)
+            if term_match:
+                profile.term_number = int(term_match.group(1) or term_match.group(2))
+            phone_match = BUSINESS_PHONE_PATTERN.search(text)
+            if phone_match:
+                profile.business_phone = phone_match.group(1)
+            profile.mailing_address = self._mailing_address(lines)
+            for link in root.find_all('a', href=COMMITTEE_LINK):
+                name = link.get_text(' ', strip=True)
+                if name and name not in profile.committees:
+                    profile.committees.append(name)
+            profile.bio = self._bio(root)
+
+            for name, value in (('term', profile.term_number), ('business_phone', profile.business_phone),
+                                ('mailing_address', profile.mailing_address),
+                                ('committees', profile.committees), ('bio', profile.bio)):
+                if not value:
+                    failed.append(name)
+            return profile
+        except Exception:
+            failed.append('error')
+            return None
+        finally:
+            with self._lock:
+                self.records += 1
+                for name in failed:
+                    self.failures[name] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of profiles seen and per-field failure counts"""
+        with self._lock:
+            return {'records': self.records, **self.failures}
+
+    def reset(self):
+        """Start counting afresh, e.g. at the start of each refresh"""
+        with self._lock:
+            self.records = 0
+            self.failures.clear()
@@ -0,0 +1,105 @@
+"""
+Concurrent page fetching for the Idaho legislature scraper
+Work runs on a bounded thread pool and every request is paced by a per-host token bucket
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+from urllib.parse import urlparse
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+class TokenBucket:
+    """Allow `rate` requests per second on average with bursts of up to `burst` requests"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and consume it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token now and sleep off the debt outside the lock,
+            # so waiting callers are served in the order they arrived
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+class HostRateLimiter:
+    """Keep a separate token bucket for every host we talk to"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str):
+        """Wait for permission to send a request to the host of `url`"""
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+        bucket.acquire()
+
+class ConcurrentFetcher:
+    """Run blocking fetch/parse jobs on a bounded thread pool"""
+
+    def __init__(self, max_workers: int = 4):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        # Held around each request: jobs may start map() or stream() themselves, and those
+        # nested pools share these slots, so no more than max_workers requests are in flight
+        self.slots = threading.BoundedSemaphore(max_workers)
+
+    def map(self, func: Callable[[T], R], items: Iterable[T]) -> List[R]:
+        """Apply `func` to every item concurrently, returning results in input order"""
+        items = list(items)
+        if len(items) <= 1 or self.max_workers == 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as pool:
+            return list(pool.map(func, items))
+
+    def stream(self, func: Callable[[T], Optional[R]], items: Iterable[T], attempts: int = 1,
+               retry_delay: float = 0.0) -> Iterator[Tuple[T, Optional[R]]]:
+        """Apply `func` to every item concurrently, yielding (item, result) pairs as each finishes"""
+        items = list(items)
+        if not items:
+            return
+
+        # A call that raises or returns None is resubmitted on its own, backing off a little
+        # more each time, until `attempts` calls have failed; its result is then None
+        def call(item: T, attempt: int) -> Optional[R]:
+            if attempt > 1 and retry_delay:
+                time.sleep(retry_delay * (attempt - 1))
+            try:
+                return func(item)
+            except Exception:
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as pool:
+            pending = {pool.submit(call, item, 1): (item, 1) for item in items}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item, attempt = pending.pop(future)
+                    result = future.result()
+                    if result is None and attempt < attempts:
+                        pending[pool.submit(call, item, attempt + 1)] = (item, attempt + 1)
+                    else:
+                        yield item, result
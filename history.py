@@ -0,0 +1,218 @@
+"""
+Historical store of legislative sessions in SQLite
+Each session's roster, committee seats and contact records are kept side by side, and are
+looked up through indexes on district, person and committee rather than by reading old snapshots
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from committee_roster import CHAIR, VICE_CHAIR, RosterMatcher
+from models import Chamber, Committee, Representative
+from name_search import normalize_name
+from snapshot import MEMBER_LISTS, COMMITTEE_LIST
+
+HISTORY_VERSION = 1
+
+ROLE_CHAIR = 'chair'
+ROLE_VICE_CHAIR = 'vice chair'
+ROLE_MEMBER = 'member'
+
+# Stored role for each role RosterMatcher yields
+ROSTER_ROLES = {CHAIR: ROLE_CHAIR, VICE_CHAIR: ROLE_VICE_CHAIR}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS sessions (
+    year INTEGER PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    ingested TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS people (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS terms (
+    session INTEGER NOT NULL,
+    person INTEGER NOT NULL,
+    chamber TEXT NOT NULL,
+    district INTEGER NOT NULL,
+    party TEXT NOT NULL,
+    record BLOB NOT NULL,
+    PRIMARY KEY (session, person, chamber)
+);
+CREATE INDEX IF NOT EXISTS terms_district ON terms (district, session);
+CREATE INDEX IF NOT EXISTS terms_person ON terms (person, session);
+CREATE TABLE IF NOT EXISTS committees (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    chamber TEXT NOT NULL,
+    UNIQUE (name, chamber)
+);
+CREATE TABLE IF NOT EXISTS seats (
+    session INTEGER NOT NULL,
+    person INTEGER NOT NULL,
+    committee INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    PRIMARY KEY (session, person, committee)
+);
+CREATE INDEX IF NOT EXISTS seats_person ON seats (person, session);
+CREATE INDEX IF NOT EXISTS seats_committee ON seats (committee, session);
+"""
+
+def session_fingerprint(data: Dict[str, List[Dict]]) -> str:
+    """Hash of a serialized session, so re-ingesting an unchanged one can be skipped"""
+    canonical = json.dumps({key: data.get(key, []) for key in MEMBER_LISTS + (COMMITTEE_LIST,)},
+                           sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+class HistoryStore:
+    """Legislative sessions by year, each ingested on its own and queried through indexes"""
+
+    def __init__(self, path: str, rep_decoder: Callable[[Dict], Representative]):
+        self.path = path
+        self._rep_decoder = rep_decoder
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+            self._conn.execute("INSERT OR IGNORE INTO meta VALUES ('version', ?)", (str(HISTORY_VERSION),))
+
+    def _query(self, sql: str, params: tuple = ()) -> list:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def sessions(self) -> List[int]:
+        """Years with an ingested session, oldest first"""
+        return [row[0] for row in self._query("SELECT year FROM sessions ORDER BY year")]
+
+    def _person_id(self, name: str) -> int:
+        key = normalize_name(name)
+        self._conn.execute("INSERT OR IGNORE INTO people (name, name_key) VALUES (?, ?)", (name, key))
+        # Keep the most recently seen spelling of the name
+        self._conn.execute("UPDATE people SET name = ? WHERE name_key = ?", (name, key))
+        return self._conn.execute("SELECT id FROM people WHERE name_key = ?", (key,)).fetchone()[0]
+
+    def _committee_id(self, name: str, chamber: str) -> int:
+        self._conn.execute("INSERT OR IGNORE INTO committees (name, chamber) VALUES (?, ?)", (name, chamber))
+        return self._conn.execute("SELECT id FROM committees WHERE name = ? AND chamber = ?",
+                                  (name, chamber)).fetchone()[0]
+
+    def ingest_session(self, year: int, data: Dict[str, List[Dict]], force: bool = False) -> bool:
+        """Store one session's serialized records, replacing only that session; False if it was unchanged"""
+        fingerprint = session_fingerprint(data)
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT fingerprint FROM sessions WHERE year = ?", (year,)).fetchone()
+            if row and row[0] == fingerprint and not force:
+                return False
+            self._conn.execute("DELETE FROM terms WHERE session = ?", (year,))
+            self._conn.execute("DELETE FROM seats WHERE session = ?", (year,))
+
+            # Committees by name, with the chambers that have one by that name
+            rosters: Dict[str, Dict[str, Dict]] = {}
+            for committee in data.get(COMMITTEE_LIST, []):
+                rosters.setdefault(committee['name'], {})[committee['chamber']] = committee
+
+            # Person ids in step with the decoded members, for matching roster names
+            members: List[Representative] = []
+            people: List[int] = []
+            seats: Dict[Tuple[int, int], str] = {}
+            for list_name in MEMBER_LISTS:
+                for record in data.get(list_name, []):
+                    person = self._person_id(record['name'])
+                    members.append(self._rep_decoder(record))
+                    people.append(person)
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO terms VALUES (?, ?, ?, ?, ?, ?)",
+                        (year, person, record['chamber'], record['district'], record['party'],
+                         json.dumps(record, separators=(',', ':')).encode('utf-8'))
+                    )
+                    for name in record.get('committees') or []:
+                        chambers = rosters.get(name, {})
+                        # A member sits on their own chamber's committee; joint committees have one roster
+                        chamber = record['chamber'] if record['chamber'] in chambers or not chambers else next(iter(chambers))
+                        seats.setdefault((person, self._committee_id(name, chamber)), ROLE_MEMBER)
+
+            # Rosters are matched within the committee's chamber, falling back to a unique last name
+            matcher = RosterMatcher(members)
+            for record in data.get(COMMITTEE_LIST, []):
+                committee = Committee(name=record['name'], chamber=Chamber(record['chamber']),
+                                      chair=record.get('chair'), vice_chair=record.get('vice_chair'),
+                                      members=record.get('members') or [])
+                committee_id = self._committee_id(committee.name, record['chamber'])
+                for member_id, role in matcher.roles(committee):
+                    if role in ROSTER_ROLES:
+                        seats[(people[member_id], committee_id)] = ROSTER_ROLES[role]
+                    else:
+                        seats.setdefault((people[member_id], committee_id), ROLE_MEMBER)
+
+            self._conn.executemany(
+                "INSERT INTO seats VALUES (?, ?, ?, ?)",
+                [(year, person, committee_id, role) for (person, committee_id), role in seats.items()]
+            )
+            self._conn.execute("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)",
+                               (year, fingerprint, datetime.now().isoformat()))
+        return True
+
+    def _people_named(self, name: str) -> List[int]:
+        """People whose name is `name`, or failing that contains it"""
+        key = normalize_name(name)
+        rows = self._query("SELECT id FROM people WHERE name_key = ?", (key,))
+        if not rows:
+            pattern = '%' + key.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            rows = self._query("SELECT id FROM people WHERE name_key LIKE ? ESCAPE '\\' ORDER BY name_key", (pattern,))
+        return [row[0] for row in rows]
+
+    def district_members(self, district: int, year: int) -> List[Representative]:
+        """Who represented a district in the session of `year`"""
+        rows = self._query(
+            "SELECT record FROM terms WHERE district = ? AND session = ? ORDER BY chamber DESC, record",
+            (district, year)
+        )
+        return [self._rep_decoder(json.loads(row[0])) for row in rows]
+
+    def member_terms(self, name: str) -> List[Tuple[int, Representative]]:
+        """Every session a member served in, as (year, record) pairs, oldest first"""
+        rows = []
+        for person in self._people_named(name):
+            rows += self._query("SELECT session, record FROM terms WHERE person = ? ORDER BY session", (person,))
+        return [(year, self._rep_decoder(json.loads(record))) for year, record in sorted(rows)]
+
+    def committee_history(self, name: str) -> List[Dict]:
+        """Every committee seat a member has held, oldest session first"""
+        rows = []
+        for person in self._people_named(name):
+            rows += self._query(
+                "SELECT seats.session, people.name, committees.name, committees.chamber, seats.role "
+                "FROM seats JOIN committees ON committees.id = seats.committee "
+                "JOIN people ON people.id = seats.person "
+                "WHERE seats.person = ? ORDER BY seats.session, committees.name",
+                (person,)
+            )
+        return [{'session': year, 'member': member, 'committee': committee, 'chamber': chamber, 'role': role}
+                for year, member, committee, chamber, role in sorted(rows)]
+
+    def committee_members(self, committee: str, year: int, chamber: Optional[str] = None) -> List[Dict]:
+        """A committee's members in the session of `year`, chairs first"""
+        sql = ("SELECT people.name, committees.chamber, seats.role FROM committees "
+               "JOIN seats ON seats.committee = committees.id AND seats.session = ? "
+               "JOIN people ON people.id = seats.person WHERE committees.name = ?")
+        params: tuple = (year, committee)
+        if chamber:
+            sql += " AND committees.chamber = ?"
+            params += (chamber,)
+        order = {ROLE_CHAIR: 0, ROLE_VICE_CHAIR: 1, ROLE_MEMBER: 2}
+        rows = sorted(self._query(sql, params), key=lambda row: (order.get(row[2], 3), row[0]))
+        return [{'member': member, 'chamber': chamber, 'role': role} for member, chamber, role in rows]
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self) -> 'HistoryStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
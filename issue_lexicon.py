@@ -0,0 +1,110 @@
+"""
+Issue lexicon matching for problem descriptions
+issue_lexicon.csv maps terms to issues with a weight: single words, multi-word phrases, and stems
+(a term ending in '*' matches any word starting with it, e.g. farm* for farms, farmer, farming).
+Every term is compiled into one Aho-Corasick automaton, so a description is scanned once
+however many terms the lexicon holds.
+"""
+import csv
+import os
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+ISSUE_LEXICON = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'issue_lexicon.csv')
+NON_WORD = re.compile(r'[^a-z0-9]+')
+
+def normalize_text(text: str) -> str:
+    """Lowercase words separated by single spaces, padded with a space on each side"""
+    return f" {NON_WORD.sub(' ', text.lower()).strip()} "
+
+class IssueMatcher:
+    """Aho-Corasick automaton over the lexicon's terms, scoring the issues found in a text"""
+
+    def __init__(self, rows: Iterable[Tuple[str, str, float]], known_issues: Optional[Iterable[str]] = None):
+        known = set(known_issues) if known_issues is not None else None
+        self.terms: List[Tuple[str, str, float]] = []  # (term, issue, weight) by term id
+        patterns: Dict[str, int] = {}
+        problems = []
+        for row, (term, issue, weight) in enumerate(rows, 1):
+            stem = term.endswith('*')
+            words = normalize_text(term.rstrip('*')).strip()
+            if not words:
+                problems.append(f"row {row}: empty term")
+                continue
+            if known is not None and issue not in known:
+                problems.append(f"row {row}: {term!r} names unknown issue {issue!r}")
+                continue
+            if weight <= 0:
+                problems.append(f"row {row}: {term!r} has weight {weight}")
+                continue
+            # Spaces anchor each pattern to word boundaries; a stem is left open at the end
+            pattern = f" {words}" if stem else f" {words} "
+            if pattern in patterns:
+                problems.append(f"row {row}: {term!r} repeats row {patterns[pattern]}")
+                continue
+            patterns[pattern] = row
+            self.terms.append((term, issue, weight))
+        if problems:
+            raise ValueError("Conflicting issue lexicon:\n  " + "\n  ".join(problems))
+
+        # Trie: state -> {char: next state}, with each state's terms (its own and its suffixes')
+        self._goto: List[Dict[str, int]] = [{}]
+        self._outputs: List[Tuple[int, ...]] = [()]
+        for term_id, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = self._goto[state][char] = len(self._goto)
+                    self._goto.append({})
+                    self._outputs.append(())
+                state = next_state
+            self._outputs[state] += (term_id,)
+
+        # Failure links, breadth first: the longest proper suffix of a state that is also a state
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._outputs[next_state] += self._outputs[self._fail[next_state]]
+                queue.append(next_state)
+
+    @classmethod
+    def from_csv(cls, path: str, known_issues: Optional[Iterable[str]] = None) -> 'IssueMatcher':
+        """Build the matcher from a CSV file with term, issue and weight columns"""
+        with open(path, newline='') as f:
+            return cls(((row['term'].strip(), row['issue'].strip(), float(row['weight']))
+                        for row in csv.DictReader(f) if row['term'].strip()), known_issues)
+
+    def matches(self, text: str) -> List[int]:
+        """Ids of the distinct terms found in a text, in the order they end"""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found: Dict[int, None] = {}
+        state = 0
+        for char in normalize_text(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for term_id in outputs[state]:
+                found[term_id] = None
+        return list(found)
+
+    def score(self, text: str) -> Dict[str, float]:
+        """Issues found in a text with the summed weights of their distinct terms, highest first"""
+        scores: Dict[str, float] = {}
+        for term_id in self.matches(text):
+            _, issue, weight = self.terms[term_id]
+            scores[issue] = scores.get(issue, 0.0) + weight
+        return dict(sorted(scores.items(), key=lambda item: -item[1]))
+
+    def stats(self) -> Dict[str, int]:
+        return {'terms': len(self.terms), 'states': len(self._goto)}
+
+    def __len__(self) -> int:
+        return len(self.terms)
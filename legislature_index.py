@@ -0,0 +1,268 @@
+"""
+Lookup maps over one snapshot of the legislature
+Built once when a snapshot is loaded, so requests answer from dictionaries instead of scanning every member;
+a lazy index over a saved snapshot answers district and name lookups from the snapshot until then
+"""
+import re
+import threading
+from collections.abc import Mapping
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional
+from models import Representative, RepresentativeAnalysis, Committee, Chamber, Party
+from name_search import NameSearchIndex
+from compact import compact_legislature
+from relevance import RelevanceRanker, load_jurisdictions
+from analysis_table import AnalysisTable
+from committee_roster import CHAIR, VICE_CHAIR, RosterMatcher
+from snapshot import LazySnapshot
+
+COMMITTEE_CHAMBER = re.compile(r'^(senate|house)\s+')
+COMMITTEE_AFFIXES = re.compile(r'^joint\s+|\s+committee$')
+NON_WORD = re.compile(r'[^a-z0-9]+')
+
+def committee_key(name: str, chamber: Optional[Chamber] = None) -> str:
+    """Match key for a committee, with its chamber when the name or `chamber` gives one, e.g.
+    'House Ways & Means Committee' or ('Ways & Means', Chamber.HOUSE) -> 'house ways and means'"""
+    key = NON_WORD.sub(' ', name.lower().replace('&', ' and ')).strip()
+    match = COMMITTEE_CHAMBER.match(key)
+    if match:
+        prefix, key = match.group(1), key[match.end():]
+    else:
+        # Joint committees sit across both chambers
+        prefix = chamber.value.lower() if chamber is not None and not key.startswith('joint ') else ''
+    key = COMMITTEE_AFFIXES.sub('', key).strip()
+    return f"{prefix} {key}" if prefix else key
+
+def _bare_key(key: str) -> str:
+    """A committee key without its chamber, e.g. 'house ways and means' -> 'ways and means'"""
+    match = COMMITTEE_CHAMBER.match(key)
+    return key[match.end():] if match else key
+
+# Committee key (without chamber) -> jurisdiction text, for relevance ranking
+JURISDICTIONS = {_bare_key(committee_key(name)): text for name, text in load_jurisdictions().items()}
+
+class CommitteeIndex:
+    """Inverted committee -> member index merging member records with committee rosters"""
+    CHAIR_WEIGHT = 3.0
+    VICE_CHAIR_WEIGHT = 2.0
+    MEMBER_WEIGHT = 1.0
+
+    def __init__(self, members: List[Representative], committees: Iterable[Committee]):
+        self.members = members
+        # Committee key -> {member id: weight of their strongest role on it}; keys carry the
+        # chamber, and a name without one (e.g. 'Education') is looked up in both chambers
+        self._weights: Dict[str, Dict[int, float]] = {}
+        # Key without chamber -> the committee's name as first seen, and its keys in each chamber
+        self._names: Dict[str, str] = {}
+        self._chamber_keys: Dict[str, List[str]] = {}
+
+        for member_id, rep in enumerate(members):
+            for name in rep.committees:
+                self._add(name, rep.chamber, member_id, self.MEMBER_WEIGHT)
+
+        role_weights = {CHAIR: self.CHAIR_WEIGHT, VICE_CHAIR: self.VICE_CHAIR_WEIGHT}
+        matcher = RosterMatcher(members)
+        for committee in committees:
+            for member_id, role in matcher.roles(committee):
+                self._add(committee.name, committee.chamber, member_id, role_weights.get(role, self.MEMBER_WEIGHT))
+
+        self._sets: Dict[str, FrozenSet[int]] = {key: frozenset(weights) for key, weights in self._weights.items()}
+        # Ranked targets per set of committees; intake forms keep asking for the same few sets
+        self._ranked: Dict[tuple, List[Representative]] = {(key,): self._rank([key]) for key in self._weights}
+
+    def _add(self, name: str, chamber: Chamber, member_id: int, weight: float):
+        key = committee_key(name, chamber)
+        bare = _bare_key(key)
+        self._names.setdefault(bare, name)
+        if key not in self._weights:
+            self._chamber_keys.setdefault(bare, []).append(key)
+        weights = self._weights.setdefault(key, {})
+        if weight > weights.get(member_id, 0.0):
+            weights[member_id] = weight
+
+    def _keys(self, names: Iterable[str]) -> FrozenSet[str]:
+        """Index keys for committee names, each chamber's for a name that doesn't give one"""
+        keys = set()
+        for name in names:
+            key = committee_key(name)
+            keys.update([key] if key in self._weights else self._chamber_keys.get(key, ()))
+        return frozenset(keys)
+
+    def member_ids(self, names: Iterable[str]) -> FrozenSet[int]:
+        """Ids of members on any of the named committees"""
+        return frozenset().union(*(self._sets[key] for key in self._keys(names)))
+
+    def ranked(self, names: Iterable[str]) -> List[Representative]:
+        """Members on any of the named committees, chairs first, then by how many of them they sit on"""
+        keys = tuple(sorted(self._keys(names)))
+        ranked = self._ranked.get(keys)
+        if ranked is None:
+            ranked = self._ranked[keys] = self._rank(keys)
+        return list(ranked)
+
+    def _rank(self, keys) -> List[Representative]:
+        if not keys:
+            return []
+        scores: Dict[int, float] = {}
+        for member_id in frozenset().union(*(self._sets[key] for key in keys)):
+            scores[member_id] = sum(self._weights[key].get(member_id, 0.0) for key in keys)
+        order = sorted(scores, key=lambda member_id: (-scores[member_id], self.members[member_id].name))
+        return [self.members[member_id] for member_id in order]
+
+    def role_weights(self, name: str) -> Dict[int, float]:
+        """Member id -> weight of their strongest role on a committee"""
+        weights: Dict[int, float] = {}
+        for key in self._keys([name]):
+            for member_id, weight in self._weights[key].items():
+                weights[member_id] = max(weight, weights.get(member_id, 0.0))
+        return weights
+
+    def committee_names(self) -> List[str]:
+        """Every committee in the index, as first named, once for both chambers"""
+        return sorted(self._names.values())
+
+class LegislatureIndex:
+    """Read-only by-district, by-chamber, by-party, by-committee and by-name maps over a snapshot"""
+    # Set by _build; a lazy index builds them when one is first read
+    DEFERRED = ('members', 'committees', '_by_district', '_by_chamber', '_by_party', '_by_name',
+                '_committees_by_name', 'committee_members', 'names', 'relevance', 'analyses')
+
+    def __init__(self, data: Mapping, compact: bool = False,
+                 analyze: Optional[Callable[[List[Representative]], List[RepresentativeAnalysis]]] = None,
+                 previous: Optional['LegislatureIndex'] = None, lazy: bool = False):
+        # Snapshots carry a timestamp; a refresh that finds the same one keeps this index
+        self.timestamp: Optional[str] = getattr(data, 'timestamp', None)
+        if compact:
+            # Keep only the compact copies; the snapshot's own records can then be freed
+            data = compact_legislature(data)
+        self.data = data
+        self._analyze = analyze
+        self._previous = previous
+        self._lock = threading.Lock()
+        self._built = False
+        # A lazy index over a saved snapshot answers by_district, delegation and by_name from the
+        # snapshot's SQLite indexes, decoding only the rows asked for, until anything else is used.
+        # One CLI lookup then skips decoding every record and building the search and relevance maps
+        self._snapshot: Optional[LazySnapshot] = data if lazy and isinstance(data, LazySnapshot) else None
+        if self._snapshot is None:
+            self._build()
+
+    def __getattr__(self, name: str):
+        # Only reached for attributes not set yet, i.e. the maps of a lazy index before its build
+        if name in LegislatureIndex.DEFERRED:
+            self._build()
+            return object.__getattribute__(self, name)
+        raise AttributeError(name)
+
+    def _build(self):
+        """Build every map; a lazy index does this on first use, once"""
+        with self._lock:
+            if self._built:
+                return
+            data = self.data
+            self.members: List[Representative] = list(data['senators']) + list(data['representatives'])
+            self.committees: List[Committee] = list(data['committees'])
+
+            self._by_district: Dict[int, List[Representative]] = {}
+            self._by_chamber: Dict[Chamber, List[Representative]] = {}
+            self._by_party: Dict[Party, List[Representative]] = {}
+            self._by_name: Dict[str, List[Representative]] = {}
+            # Committee key -> its committee; a key without chamber -> that committee in each chamber
+            self._committees_by_name: Dict[str, List[Committee]] = {}
+            for rep in self.members:
+                self._by_district.setdefault(rep.district, []).append(rep)
+                self._by_chamber.setdefault(rep.chamber, []).append(rep)
+                self._by_party.setdefault(rep.party, []).append(rep)
+                self._by_name.setdefault(rep.name.lower(), []).append(rep)
+            for committee in self.committees:
+                key = committee_key(committee.name, committee.chamber)
+                if key not in self._committees_by_name:
+                    self._committees_by_name[key] = [committee]
+                    if key != _bare_key(key):
+                        self._committees_by_name.setdefault(_bare_key(key), []).append(committee)
+            # Committee memberships from both member records and committee rosters
+            self.committee_members = CommitteeIndex(self.members, self.committees)
+            # Ranked prefix / fuzzy search, rebuilt with every snapshot
+            self.names = NameSearchIndex(self.members)
+            # BM25 relevance of problems to committees (by jurisdiction) and members (by profile)
+            names = self.committee_members.committee_names()
+            self.relevance = RelevanceRanker(
+                self.members,
+                {name: JURISDICTIONS.get(_bare_key(committee_key(name)), '') for name in names},
+                {name: {member_id: weight / CommitteeIndex.CHAIR_WEIGHT
+                        for member_id, weight in self.committee_members.role_weights(name).items()} for name in names})
+            # Per-member analyses, reusing the previous index's entries for unchanged records
+            self.analyses: Optional[AnalysisTable] = None
+            if self._analyze is not None:
+                self.analyses = AnalysisTable(self.members, self._analyze, getattr(self._previous, 'analyses', None))
+            self._previous = None  # The old index can be freed once its analyses are reused
+            self._built = True
+
+    def by_district(self, district: int) -> List[Representative]:
+        """Members of both chambers for one district"""
+        if not self._built and self._snapshot is not None:
+            return self._snapshot.by_district(district)
+        return self._by_district.get(district, [])
+
+    def delegation(self, district: int) -> Dict:
+        """A district's senator and House members, as the district page and CLI show them"""
+        senate = None
+        house = []
+        for rep in self.by_district(district):
+            if rep.chamber == Chamber.SENATE:
+                senate = senate or rep
+            else:
+                house.append(rep)
+        return {'senate': senate, 'house': house}
+
+    def by_chamber(self, chamber: Chamber) -> List[Representative]:
+        """Every member of one chamber"""
+        return self._by_chamber.get(chamber, [])
+
+    def by_party(self, party: Party) -> List[Representative]:
+        """Every member of one party, across both chambers"""
+        return self._by_party.get(party, [])
+
+    def by_committee(self, name: str) -> List[Representative]:
+        """Members of a committee, chair and vice chair first"""
+        return self.committee_members.ranked([name])
+
+    def committee(self, name: str, chamber: Optional[Chamber] = None) -> Optional[Committee]:
+        """A committee by name and chamber; None when a name without a chamber fits one in each"""
+        found = self._committees_by_name.get(committee_key(name, chamber), [])
+        return found[0] if len(found) == 1 else None
+
+    def committees_named(self, name: str) -> List[Committee]:
+        """The committees a name refers to: one, or one per chamber for a name without a chamber"""
+        return list(self._committees_by_name.get(committee_key(name), []))
+
+    def by_name(self, name: str) -> List[Representative]:
+        """Members whose full name is exactly `name`, ignoring case"""
+        if not self._built and self._snapshot is not None:
+            return self._snapshot.by_name(name)
+        return self._by_name.get(name.strip().lower(), [])
+
+    def find_by_name(self, query: str, limit: int = 10) -> List[Representative]:
+        """Members matching a full, partial or misspelled name, best match first"""
+        return self.names.search(query, limit)
+
+    def best_matches(self, query: str, district: Optional[int] = None) -> List[Representative]:
+        """The members tied for the best match to `query`; more than one means the name is ambiguous"""
+        scored = self.names.scored(query, limit=10)
+        if district is not None:
+            scored = [(score, rep) for score, rep in scored if rep.district == district]
+        if not scored:
+            return []
+        top = scored[0][0]
+        return [rep for score, rep in scored if score == top]
+
+    def stats(self) -> Dict[str, int]:
+        """Sizes of the index maps"""
+        return {
+            'members': len(self.members),
+            'committees': len(self.committees),
+            'districts': len(self._by_district),
+            'committee_keys': len(self.committee_members._sets),
+            'names': len(self._by_name),
+            'name_keys': len(self.names._keys),
+            'analyses': len(self.analyses) if self.analyses is not None else 0
+        }
@@ -0,0 +1,105 @@
+"""
+Concurrent, cached chat completions for the analyzer's optional LLM mode
+Requests run on one background event loop shared by every caller, behind a semaphore that
+bounds how many are in flight at once. Identical prompts in a batch are sent once, answers are
+cached on disk, and a request that times out or fails comes back as None so the caller can
+fall back to its heuristics.
+"""
+import asyncio
+import threading
+from typing import Dict, List, Optional, Sequence
+import openai
+from response_cache import ResponseCache, prompt_key
+
+Messages = List[Dict[str, str]]
+
+class LLMClient:
+    """Chat completions through an OpenAI-compatible API (set `base_url` for a local or mock server)"""
+    MODEL = "gpt-4o-mini"
+    MAX_CONCURRENCY = 8  # Requests in flight at once, across all callers
+    TIMEOUT_SECONDS = 20.0  # Per request, once it has a slot; slower answers fall back
+    MAX_TOKENS = 600
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, model: Optional[str] = None,
+                 max_concurrency: Optional[int] = None, timeout: Optional[float] = None,
+                 cache: Optional[ResponseCache] = None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model = model or self.MODEL
+        self.max_concurrency = max_concurrency or self.MAX_CONCURRENCY
+        self.timeout = timeout or self.TIMEOUT_SECONDS
+        self.cache = cache if cache is not None else ResponseCache()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[openai.AsyncOpenAI] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._start_lock = threading.Lock()
+        self.requests = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the event loop thread on first use (after any preload fork, so each worker has its own)"""
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='llm-client', daemon=True).start()
+                self._client = openai.AsyncOpenAI(api_key=self.api_key or 'unused', base_url=self.base_url,
+                                                  timeout=self.timeout, max_retries=0)
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._loop = loop
+            return self._loop
+
+    def complete_many(self, batch: Sequence[Messages]) -> List[Optional[str]]:
+        """Responses for a batch of conversations, in order; None where a request timed out or failed"""
+        if not batch:
+            return []
+        keys = [prompt_key(self.model, messages) for messages in batch]
+        responses: Dict[str, Optional[str]] = {}
+        pending: Dict[str, Messages] = {}
+        for key, messages in zip(keys, batch):
+            if key in responses or key in pending:
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                responses[key] = cached
+            else:
+                pending[key] = messages
+        if pending:
+            future = asyncio.run_coroutine_threadsafe(self._complete_all(pending), self._ensure_loop())
+            responses.update(future.result())
+        return [responses[key] for key in keys]
+
+    def complete(self, messages: Messages) -> Optional[str]:
+        return self.complete_many([messages])[0]
+
+    async def _complete_all(self, pending: Dict[str, Messages]) -> Dict[str, Optional[str]]:
+        keys = list(pending)
+        results = await asyncio.gather(*(self._complete_one(key, pending[key]) for key in keys))
+        return dict(zip(keys, results))
+
+    async def _complete_one(self, key: str, messages: Messages) -> Optional[str]:
+        async with self._semaphore:
+            self.requests += 1
+            try:
+                response = await asyncio.wait_for(self._client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0,
+                    max_tokens=self.MAX_TOKENS,
+                    response_format={'type': 'json_object'}
+                ), self.timeout)
+            except (asyncio.TimeoutError, openai.APITimeoutError):
+                self.timeouts += 1
+                return None
+            except (openai.OpenAIError, ValueError) as e:
+                self.errors += 1
+                print(f"LLM request failed: {e}")
+                return None
+        content = response.choices[0].message.content if response.choices else None
+        if content:
+            # Written from the loop thread; the cache's own lock keeps concurrent writes apart
+            self.cache.put(key, content)
+        return content
+
+    def stats(self) -> Dict[str, int]:
+        return {'requests': self.requests, 'timeouts': self.timeouts, 'errors': self.errors, **self.cache.stats()}
@@ -1,13 +1,18 @@
 #!/usr/bin/env python3
 
 import argparse
+import contextlib
 import json
 import os
+import sys
 from typing import List, Optional, Dict
 from dotenv import load_dotenv
 from scraper import IdahoLegislatureScraper
 from analyzer import RepresentativeAnalyzer
 from models import Representative, Chamber
+from legislature_index import LegislatureIndex
+from bulk_resolver import BulkResolver, detect_format
+from district_boundaries import DistrictBoundaryIndex
 
 # Load environment variables
 load_dotenv()
@@ -16,13 +21,18 @@ class IdahoRepsTool:
     def __init__(self):
         self.scraper = IdahoLegislatureScraper()
         api_key = os.getenv('OPENAI_API_KEY')
-        self.analyzer = RepresentativeAnalyzer(api_key=api_key)
+        use_llm = os.getenv('LLM_ANALYSIS', '').lower() in ('1', 'true', 'yes')
+        self.analyzer = RepresentativeAnalyzer(api_key=api_key, use_llm=use_llm,
+                                               base_url=os.getenv('OPENAI_BASE_URL'), model=os.getenv('OPENAI_MODEL'))
         self.data = None
+        self.index: Optional[LegislatureIndex] = None
     
     def load_data(self):
         """Load representative and committee data"""
         print("Loading Idaho legislature data...")
         self.data = self.scraper.get_all_data()
+        # Lazy, so a one-off district or name lookup reads just those rows from the snapshot
+        self.index = LegislatureIndex(self.data, analyze=self.analyzer.heuristic_analyses, lazy=True)
         print(f"Loaded {len(self.data['senators'])} senators and {len(self.data['representatives'])} house members")
     
     def find_my_representatives(self, district: int) -> Dict:
@@ -30,41 +40,30 @@ class IdahoRepsTool:
         if not self.data:
             self.load_data()
         
-        district_reps = {
-            'senate': None,
-            'house': []
-        }
-        
-        # Find Senate representative
-        for senator in self.data['senators']:
-            if senator.district == district:
-                district_reps['senate'] = senator
-                break
-        
-        # Find House representatives (usually 2 per district)
-        for rep in self.data['representatives']:
-            if rep.district == district:
-                district_reps['house'].append(rep)
-        
-        return district_reps
+        # One senator and (usually) two House representatives per district
+        return self.index.delegation(district)
     
     def analyze_problem(self, problem_description: str):
         """Analyze a problem and recommend action"""
         if not self.data:
             self.load_data()
         
-        all_reps = self.data['senators'] + self.data['representatives']
-        analysis = self.analyzer.analyze_problem(problem_description, all_reps)
+        analysis = self.analyzer.analyze_problem(problem_description, self.index.members,
+                                                 self.index.committee_members, self.index.relevance)
+        scores = analysis.committee_scores or {}
+        rep_scores = analysis.representative_scores or []
         
         print(f"\nPROBLEM ANALYSIS")
         print(f"Problem: {analysis.problem_description}")
         print(f"\nRecommended Committees:")
         for committee in analysis.recommended_committees:
-            print(f"  - {committee}")
+            score = f" (relevance {scores[committee]:.1f})" if committee in scores else ""
+            print(f"  - {committee}{score}")
         
         print(f"\nTarget Representatives:")
-        for rep in analysis.target_representatives[:5]:  # Show top 5
-            print(f"  - {rep.name} (District {rep.district}, {rep.chamber.value})")
+        for position, rep in enumerate(analysis.target_representatives[:5]):  # Show top 5
+            score = f", relevance {rep_scores[position]:.1f}" if position < len(rep_scores) else ""
+            print(f"  - {rep.name} (District {rep.district}, {rep.chamber.value}{score})")
         
         print(f"\nStrategy: {analysis.strategy}")
         
@@ -72,25 +71,25 @@ class IdahoRepsTool:
         for point in analysis.talking_points:
             print(f"  - {point}")
     
-    def analyze_representative(self, name: str):
+    def analyze_representative(self, name: str, district: Optional[int] = None):
         """Perform deep analysis on a representative"""
         if not self.data:
             self.load_data()
         
         # Find the representative
-        all_reps = self.data['senators'] + self.data['representatives']
-        target_rep = None
-        
-        for rep in all_reps:
-            if name.lower() in rep.name.lower():
-                target_rep = rep
-                break
+        matches = self.index.best_matches(name, district)
+        if len(matches) > 1:
+            print(f"Several legislators match '{name}'; add --district to pick one:")
+            for rep in matches:
+                print(f"  - {rep.name} (District {rep.district}, {rep.chamber.value})")
+            return
+        target_rep = matches[0] if matches else None
         
         if not target_rep:
             print(f"Representative '{name}' not found.")
             return
         
-        analysis = self.analyzer.analyze_representative(target_rep)
+        analysis = self.analyzer.analyze_representative(target_rep, self.index.analyses)
         
         print(f"\nREPRESENTATIVE ANALYSIS: {analysis.representative.name}")
         print(f"District: {analysis.representative.district}")
@@ -110,13 +109,73 @@ class IdahoRepsTool:
         print(f"\nSeat Risk Score: {analysis.seat_risk_score}/10")
         print(f"Likely Challengers: {', '.join(analysis.likely_challengers)}")
     
+    def district_history(self, district: int, year: int):
+        """Show who represented a district in a past session"""
+        with self.scraper.open_history() as history:
+            members = history.district_members(district, year)
+            sessions = history.sessions()
+        if not members:
+            print(f"No record of district {district} in {year}. Sessions on record: "
+                  f"{', '.join(str(session) for session in sessions) or 'none'}")
+            return
+        print(f"\nDISTRICT {district} IN {year}")
+        for rep in members:
+            print(f"  {rep.chamber.value}: {rep.name} ({rep.party.value})")
+    
+    def member_history(self, name: str):
+        """Show every session and committee seat a member has held"""
+        with self.scraper.open_history() as history:
+            terms = history.member_terms(name)
+            seats = history.committee_history(name)
+        if not terms:
+            print(f"No record of '{name}' in the session history.")
+            return
+        print(f"\nSESSION HISTORY: {name}")
+        for year, rep in terms:
+            print(f"  {year}: {rep.name}, {rep.chamber.value} District {rep.district} ({rep.party.value})")
+        print(f"\nCommittee Seats:")
+        for seat in seats:
+            role = f" ({seat['role']})" if seat['role'] != 'member' else ''
+            print(f"  {seat['session']}: {seat['chamber']} {seat['committee']}{role}")
+    
+    def ingest_history(self, path: str, year: int):
+        """Add a saved snapshot or cache file to the session history"""
+        if self.scraper.ingest_history_file(path, year):
+            print(f"Recorded {path} as the {year} session")
+        else:
+            print(f"The {year} session is already recorded and unchanged")
+    
+    def resolve_file(self, input_path: str, output_path: str = '-', fmt: Optional[str] = None,
+                     boundaries_path: Optional[str] = None):
+        """Add districts and legislators to every row of a CSV or JSON Lines file"""
+        if not self.data:
+            # Progress messages would be mixed into the rows when those go to stdout
+            with contextlib.redirect_stdout(sys.stderr if output_path == '-' else sys.stdout):
+                self.load_data()
+        
+        boundaries = None
+        boundaries_path = boundaries_path or os.getenv('DISTRICT_BOUNDARIES_FILE', 'district_boundaries.geojson')
+        if os.path.exists(boundaries_path):
+            boundaries = DistrictBoundaryIndex.from_geojson(boundaries_path)
+        fmt = fmt or detect_format(input_path)
+        resolver = BulkResolver(self.index, boundaries)
+        
+        # One with statement, so the source is closed even if the destination can't be opened
+        with (contextlib.nullcontext(sys.stdin) if input_path == '-' else open(input_path, newline='')) as source, \
+             (contextlib.nullcontext(sys.stdout) if output_path == '-' else open(output_path, 'w', newline='')) as destination:
+            resolver.resolve_file(source, destination, fmt)
+        # Keep the summary out of the rows when they go to stdout
+        errors = f", {resolver.errors} unreadable lines" if resolver.errors else ""
+        print(f"Resolved {resolver.resolved} of {resolver.rows} rows{errors}",
+              file=sys.stderr if output_path == '-' else sys.stdout)
+    
     def list_committees(self):
         """List all committees and their members"""
         if not self.data:
             self.load_data()
         
         print("\nIDAHO LEGISLATIVE COMMITTEES")
-        for committee in self.data['committees']:
+        for committee in self.index.committees:
             print(f"\n{committee.name} ({committee.chamber.value})")
             if committee.chair:
                 print(f"  Chair: {committee.chair}")
@@ -129,12 +188,38 @@ def main():
     parser.add_argument('--problem', type=str, help='Describe a problem to get committee recommendations')
     parser.add_argument('--analyze', type=str, help='Analyze a specific representative')
     parser.add_argument('--committees', action='store_true', help='List all committees')
+    parser.add_argument('--year', type=int, help='Session year for --district or --ingest-history')
+    parser.add_argument('--member-history', type=str, help="List a member's past sessions and committee seats")
+    parser.add_argument('--resolve', type=str, metavar='FILE',
+                        help="Add districts and legislators to each row of a CSV or JSONL file ('-' for stdin)")
+    parser.add_argument('--output', type=str, default='-', help="Where --resolve writes rows (default stdout)")
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help='Format for --resolve (default from the file name)')
+    parser.add_argument('--boundaries', type=str, help='District boundary GeoJSON for rows with lat/lon')
+    parser.add_argument('--ingest-history', type=str, metavar='FILE',
+                        help='Record a saved snapshot.db or cache.json as the session for --year')
     
     args = parser.parse_args()
     
     tool = IdahoRepsTool()
     
-    if args.district:
+    if args.analyze:
+        tool.analyze_representative(args.analyze, args.district)
+    
+    elif args.resolve:
+        tool.resolve_file(args.resolve, args.output, args.format, args.boundaries)
+    
+    elif args.ingest_history:
+        if not args.year:
+            parser.error('--ingest-history needs --year')
+        tool.ingest_history(args.ingest_history, args.year)
+    
+    elif args.member_history:
+        tool.member_history(args.member_history)
+    
+    elif args.district and args.year:
+        tool.district_history(args.district, args.year)
+    
+    elif args.district:
         reps = tool.find_my_representatives(args.district)
         print(f"\nREPRESENTATIVES FOR DISTRICT {args.district}")
         
@@ -155,9 +240,6 @@ def main():
     elif args.problem:
         tool.analyze_problem(args.problem)
     
-    elif args.analyze:
-        tool.analyze_representative(args.analyze)
-    
     elif args.committees:
         tool.list_committees()
     
@@ -167,7 +249,12 @@ def main():
         print("  python main.py --district 15")
         print("  python main.py --problem 'Need better funding for rural schools'")
         print("  python main.py --analyze 'John Smith'")
+        print("  python main.py --analyze 'Den Hartog' --district 8")
         print("  python main.py --committees")
+        print("  python main.py --district 19 --year 2018")
+        print("  python main.py --member-history 'Wendy Horman'")
+        print("  python main.py --ingest-history old/cache.json --year 2018")
+        print("  python main.py --resolve constituents.csv --output resolved.csv")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+A local OpenAI-compatible chat completions server for exercising the analyzer's LLM mode offline
+Answers POST /v1/chat/completions with a canned JSON reply shaped like the one the prompt asks
+for, after a configurable delay; a share of requests can stall (to trigger timeouts) or fail.
+
+Usage:
+    python mock_llm.py --port 8001 --latency 0.5 --jitter 0.5 --stall-rate 0.05 --error-rate 0.02
+    LLM_ANALYSIS=1 OPENAI_BASE_URL=http://127.0.0.1:8001/v1 python main.py --analyze "Brad Little"
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from replay import latency_summary
+
+def canned_reply(prompt: str) -> Dict:
+    """A reply with the fields the analyzer's prompts ask for"""
+    if prompt.startswith('Problem:'):
+        problem = prompt.splitlines()[0][len('Problem:'):].strip()
+        return {
+            'strategy': f"Bring '{problem}' to the committees listed, starting with their chairs.",
+            'talking_points': ["Who is affected and how", "What it costs today", "The change you are asking for"]
+        }
+    name = re.match(r'Legislator: ([^,\n]+)', prompt)
+    return {
+        'key_issues': ["Budget", "Local control"],
+        'background_summary': f"{name.group(1) if name else 'This legislator'} serves in the Idaho Legislature.",
+        'political_positions': {'Fiscal Policy': 'Favors restraint'},
+        'likely_challengers': ["Primary challenger"]
+    }
+
+class MockLLMServer:
+    """Serve canned chat completions with configurable latency, stalls and errors"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, stall_rate: float = 0.0,
+                 stall_seconds: float = 60.0, error_rate: float = 0.0, seed: Optional[int] = None,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+        self.error_rate = error_rate
+        self.host = host
+        self.port = port
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self.reset_stats()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def reset_stats(self):
+        """Forget the requests served so far"""
+        with self._lock:
+            self._statuses: Dict[int, int] = {}
+            self._latencies: List[float] = []
+            self._in_flight = 0
+            self._max_in_flight = 0
+
+    def stats(self) -> Dict:
+        """Requests by status, the most handled at once, and server-side latency percentiles"""
+        with self._lock:
+            return {
+                'requests': sum(self._statuses.values()),
+                'statuses': dict(sorted(self._statuses.items())),
+                'max_in_flight': self._max_in_flight,
+                'latency_ms': latency_summary(self._latencies)
+            }
+
+    def _delay(self) -> Tuple[float, bool]:
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            if self.stall_rate > 0 and self._random.random() < self.stall_rate:
+                delay = self.stall_seconds
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+        return delay, failed
+
+    def _handle(self, handler: BaseHTTPRequestHandler):
+        start = time.perf_counter()
+        with self._lock:
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+        try:
+            length = int(handler.headers.get('Content-Length') or 0)
+            request = json.loads(handler.rfile.read(length) or b'{}')
+            delay, failed = self._delay()
+            if delay:
+                time.sleep(delay)
+            if handler.path.rstrip('/').endswith('/chat/completions') and not failed:
+                prompt = next((m['content'] for m in reversed(request.get('messages', [])) if m.get('role') == 'user'), '')
+                status = 200
+                payload = {
+                    'id': 'chatcmpl-mock',
+                    'object': 'chat.completion',
+                    'created': int(time.time()),
+                    'model': request.get('model', 'mock'),
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': json.dumps(canned_reply(prompt))}}],
+                    'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0}
+                }
+            else:
+                status = 500 if failed else 404
+                payload = {'error': {'message': 'Mock failure' if failed else 'Not found', 'type': 'server_error'}}
+            body = json.dumps(payload).encode('utf-8')
+            handler.send_response(status)
+            handler.send_header('Content-Type', 'application/json')
+            handler.send_header('Content-Length', str(len(body)))
+            handler.end_headers()
+            handler.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            status = 499  # The client gave up (e.g. timed out) before the reply
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        with self._lock:
+            self._statuses[status] = self._statuses.get(status, 0) + 1
+            self._latencies.append(time.perf_counter() - start)
+
+    def start(self) -> str:
+        """Start serving on a background thread and return the base URL"""
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                mock._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.base_url
+
+    def stop(self):
+        """Stop serving"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'MockLLMServer':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description='Mock OpenAI-compatible chat completions server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many extra random seconds')
+    parser.add_argument('--stall-rate', type=float, default=0.0, help='Fraction of requests that hang')
+    parser.add_argument('--stall-seconds', type=float, default=60.0, help='How long a stalled request hangs')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered 500')
+    parser.add_argument('--seed', type=int, help='Random seed for jitter, stalls and errors')
+    args = parser.parse_args()
+
+    server = MockLLMServer(latency=args.latency, jitter=args.jitter, stall_rate=args.stall_rate,
+                           stall_seconds=args.stall_seconds, error_rate=args.error_rate, seed=args.seed,
+                           host=args.host, port=args.port)
+    print(f"Serving mock chat completions at {server.start()} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print(f"\n{server.stats()}")
+        server.stop()
+
+if __name__ == '__main__':
+    main()
@@ -42,6 +42,8 @@ class Representative:
     house_seat: Optional[HouseSeat] = None  # Only for House members
     committees: List[str] = None
     bio: Optional[str] = None
+    profile_url: Optional[str] = None  # Path of the member's page on the legislature site
+    profile_committees: Optional[List[str]] = None  # Listed on the member's page; rosters add the rest
     
     def __post_init__(self):
         if self.committees is None:
@@ -60,6 +62,8 @@ class ProblemAnalysis:
     target_representatives: List[Representative]
     strategy: str
     talking_points: List[str]
+    committee_scores: Optional[Dict[str, float]] = None  # Relevance of each recommended committee
+    representative_scores: Optional[List[float]] = None  # Relevance of each target, in the same order
 
 @dataclass
 class RepresentativeAnalysis:
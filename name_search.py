@@ -0,0 +1,195 @@
+"""
+Ranked name search over legislators for type-ahead and lookups
+A sorted prefix list answers partial names as they are typed; a trigram index finds names
+that are misspelled. Each member is indexed under its full name and common variants:
+without initials ("C. Scott Grow" -> "scott grow"), by last name, and with nicknames.
+"""
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Set, Tuple
+from models import Representative
+
+TITLE_PREFIX = re.compile(r'^(?:sen|senator|rep|representative)\b\.?\s*')
+NON_WORD = re.compile(r"[^a-z0-9]+")
+
+# Formal first names and the nicknames legislators go by, both ways round
+NICKNAMES = {
+    'james': ['jim', 'jimmy'],
+    'robert': ['bob', 'rob', 'bobby'],
+    'william': ['bill', 'will', 'billy'],
+    'michael': ['mike'],
+    'charles': ['chuck', 'charlie'],
+    'richard': ['rick', 'dick', 'rich'],
+    'thomas': ['tom', 'tommy'],
+    'steven': ['steve'],
+    'stephen': ['steve'],
+    'joseph': ['joe'],
+    'daniel': ['dan', 'danny'],
+    'david': ['dave'],
+    'edward': ['ed', 'eddie'],
+    'gerald': ['jerry'],
+    'jeffrey': ['jeff'],
+    'geoffrey': ['geoff'],
+    'kenneth': ['ken'],
+    'ronald': ['ron'],
+    'rodney': ['rod'],
+    'timothy': ['tim'],
+    'benjamin': ['ben'],
+    'abigail': ['abby'],
+    'patricia': ['patti', 'pat'],
+    'tamara': ['tammy'],
+    'judith': ['judy'],
+    'angela': ['angie'],
+    'susan': ['sue'],
+    'elizabeth': ['liz', 'beth'],
+    'jennifer': ['jen', 'jenny'],
+    'douglas': ['doug'],
+    'gregory': ['greg'],
+    'matthew': ['matt'],
+    'christopher': ['chris'],
+    'anthony': ['tony'],
+    'frederick': ['fred']
+}
+FIRST_NAME_VARIANTS: Dict[str, Set[str]] = {}
+for formal, nicknames in NICKNAMES.items():
+    for nickname in nicknames:
+        FIRST_NAME_VARIANTS.setdefault(formal, set()).add(nickname)
+        FIRST_NAME_VARIANTS.setdefault(nickname, set()).add(formal)
+
+# Score tiers: exact names beat prefixes, which beat fuzzy (trigram) matches scored 0..1
+EXACT_NAME = 4.0
+EXACT_VARIANT = 3.0
+PREFIX_NAME = 2.0
+PREFIX_VARIANT = 1.5
+
+def normalize_name(text: str) -> str:
+    """Lowercase ASCII words only, without a leading title: "Sen. Hernán Martínez" -> "hernan martinez\""""
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii').lower()
+    text = NON_WORD.sub(' ', text).strip()
+    return TITLE_PREFIX.sub('', text)
+
+def name_variants(name: str) -> List[str]:
+    """Normalized forms a member may be searched by, the full name first"""
+    full = normalize_name(name)
+    tokens = full.split()
+    variants = [full]
+    if len(tokens) < 2:
+        return variants
+
+    named = [token for token in tokens if len(token) > 1]  # without initials
+    forms = [named] if len(named) >= 2 and named != tokens else []
+    forms.append(tokens)
+    for form in forms:
+        first, rest = form[0], form[1:]
+        variants.append(' '.join(form))
+        variants.append(f"{first} {rest[-1]}")
+        for nickname in sorted(FIRST_NAME_VARIANTS.get(first, ())):
+            variants.append(' '.join([nickname] + rest))
+        # Last names, including multi-word ones like "den hartog"
+        for start in range(1, len(form)):
+            variants.append(' '.join(form[start:]))
+
+    seen = set()
+    return [variant for variant in variants if not (variant in seen or seen.add(variant))]
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class NameSearchIndex:
+    """Prefix and trigram indexes over member names, built once per snapshot"""
+    MIN_SIMILARITY = 0.3  # Trigram (Dice) similarity below which a fuzzy match is dropped
+    PREFIX_SCAN_LIMIT = 500  # Prefix hits scored per query; very short prefixes stop here
+
+    def __init__(self, members: Iterable[Representative]):
+        self.members: List[Representative] = list(members)
+        # Each distinct variant string is indexed once with the members it belongs to, so a
+        # name repeated across sessions or chambers costs one posting, not one per member
+        key_ids: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._key_members: List[List[Tuple[int, bool]]] = []
+        for member_id, rep in enumerate(self.members):
+            for position, variant in enumerate(name_variants(rep.name)):
+                key_id = key_ids.get(variant)
+                if key_id is None:
+                    key_id = key_ids[variant] = len(self._keys)
+                    self._keys.append(variant)
+                    self._key_members.append([])
+                # Variant 0 of each member is its full name
+                self._key_members[key_id].append((member_id, position == 0))
+        self._key_trigrams: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+        for key_id, key in enumerate(self._keys):
+            grams = trigrams(key)
+            self._key_trigrams.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(key_id)
+        # Keys in sorted order, so every key starting with a prefix is one contiguous run
+        self._sorted = sorted(range(len(self._keys)), key=self._keys.__getitem__)
+        self._sorted_keys = [self._keys[key_id] for key_id in self._sorted]
+
+    def _prefix_scores(self, query: str, key_scores: Dict[int, Tuple[float, float]]):
+        start = bisect_left(self._sorted_keys, query)
+        end = min(len(self._sorted_keys), start + self.PREFIX_SCAN_LIMIT)
+        for position in range(start, end):
+            key = self._sorted_keys[position]
+            if not key.startswith(query):
+                break
+            if key == query:
+                key_scores[self._sorted[position]] = (EXACT_NAME, EXACT_VARIANT)
+            else:
+                # Among prefix hits, the one the query covers more of ranks higher
+                coverage = len(query) / len(key) * 0.5
+                key_scores[self._sorted[position]] = (PREFIX_NAME + coverage, PREFIX_VARIANT + coverage)
+
+    def _fuzzy_scores(self, query: str, key_scores: Dict[int, Tuple[float, float]]):
+        grams = trigrams(query)
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            for key_id in self._postings.get(gram, ()):
+                shared[key_id] = shared.get(key_id, 0) + 1
+        query_size = len(grams)
+        for key_id, count in shared.items():
+            similarity = 2.0 * count / (query_size + self._key_trigrams[key_id])
+            if similarity >= self.MIN_SIMILARITY and key_id not in key_scores:
+                key_scores[key_id] = (similarity, similarity)
+
+    def scored(self, query: str, limit: int = 10) -> List[Tuple[float, Representative]]:
+        """Best matches for `query` as (score, member) pairs, highest score first"""
+        query = normalize_name(query)
+        if not query or limit <= 0:
+            return []
+        # Keys scored as (score for members whose full name it is, score for other members)
+        key_scores: Dict[int, Tuple[float, float]] = {}
+        self._prefix_scores(query, key_scores)
+        # Misspellings only need looking for when the prefixes don't fill the list
+        if len(key_scores) < limit and len(query) >= 3:
+            self._fuzzy_scores(query, key_scores)
+
+        # Expand the best keys into members until no later key can place a member in the top `limit`
+        scores: Dict[int, float] = {}
+        floor: List[float] = []  # the `limit` best first-seen member scores; floor[0] bounds the cut-off
+        for key_id, (name_score, other_score) in sorted(key_scores.items(), key=lambda item: -item[1][0]):
+            if len(floor) >= limit and name_score < floor[0]:
+                break
+            for member_id, is_name in self._key_members[key_id]:
+                score = name_score if is_name else other_score
+                previous = scores.get(member_id)
+                if previous is None:
+                    if len(floor) < limit:
+                        heapq.heappush(floor, score)
+                    elif score > floor[0]:
+                        heapq.heapreplace(floor, score)
+                if previous is None or score > previous:
+                    scores[member_id] = score
+        best = heapq.nsmallest(
+            limit, scores.items(),
+            key=lambda item: (-item[1], self.members[item[0]].name, self.members[item[0]].district)
+        )
+        return [(round(score, 3), self.members[member_id]) for member_id, score in best]
+
+    def search(self, query: str, limit: int = 10) -> List[Representative]:
+        """Best matches for `query`, highest score first"""
+        return [rep for _, rep in self.scored(query, limit)]
@@ -0,0 +1,101 @@
+"""
+Per-URL response store for conditional GET revalidation
+Keeps each page body with its ETag / Last-Modified validators so unchanged pages come back as 304s
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+@dataclass
+class CachedPage:
+    url: str
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: Optional[str] = None
+
+class PageStore:
+    """Disk-backed store of response bodies and validators, one entry per URL"""
+    STORE_DIR = "page_cache"
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or self.STORE_DIR
+        self._lock = threading.Lock()
+
+    def _paths(self, url: str):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + '.json', base + '.body'
+
+    def _read_meta(self, url: str) -> Optional[Dict]:
+        meta_path, _ = self._paths(url)
+        try:
+            with open(meta_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Return the stored page for `url`, if any"""
+        meta = self._read_meta(url)
+        if meta is None:
+            return None
+        _, body_path = self._paths(url)
+        try:
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+        return CachedPage(
+            url=url,
+            body=body,
+            etag=meta.get('etag'),
+            last_modified=meta.get('last_modified'),
+            fetched_at=meta.get('fetched_at')
+        )
+
+    def put(self, url: str, body: bytes, etag: Optional[str] = None,
+            last_modified: Optional[str] = None):
+        """Store a fresh response; pages without validators are not worth keeping"""
+        if not etag and not last_modified:
+            return
+        meta_path, body_path = self._paths(url)
+        meta = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': datetime.now().isoformat()
+        }
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            # Body first, so a metadata file always points at a complete body; each file
+            # is renamed into place so other processes never read a partial write
+            self._write_atomic(body_path, body)
+            self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+
+    def _write_atomic(self, path: str, content: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a stored URL"""
+        meta = self._read_meta(url)
+        if not meta:
+            return {}
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
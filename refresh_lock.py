@@ -0,0 +1,79 @@
+"""
+Cross-process lock that lets exactly one process refresh the legislature snapshot
+Uses flock on POSIX systems and an exclusively created lock file elsewhere
+"""
+import os
+import time
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+class RefreshLock:
+    """Advisory lock on a file shared by every worker process"""
+    POLL_SECONDS = 0.1
+    # Without flock a crashed holder leaves its lock file behind; treat it as abandoned after this
+    STALE_SECONDS = 15 * 60
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def _try_acquire(self) -> bool:
+        if fcntl is not None:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return False
+            self._fd = fd
+            return True
+
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(self.path) > self.STALE_SECONDS:
+                    os.remove(self.path)
+            except OSError:
+                pass
+            return False
+        self._fd = fd
+        return True
+
+    def acquire(self, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        """Take the lock, waiting up to `timeout` seconds (forever if None) when blocking"""
+        if self._fd is not None:
+            raise RuntimeError("RefreshLock is not reentrant")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._try_acquire():
+                return True
+            if not blocking or (deadline is not None and time.monotonic() >= deadline):
+                return False
+            time.sleep(self.POLL_SECONDS)
+
+    def release(self):
+        """Give the lock back"""
+        if self._fd is None:
+            return
+        fd, self._fd = self._fd, None
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+        else:
+            os.close(fd)
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def __enter__(self) -> 'RefreshLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
@@ -0,0 +1,127 @@
+"""
+Stale-while-revalidate refresher for the web app's legislative data
+Requests always read the current in-memory snapshot; a background thread replaces it on a schedule
+"""
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+class SnapshotRefresher:
+    """Keep a snapshot in memory and refresh it on a background thread"""
+
+    def __init__(self, loader: Callable[[], Dict], interval_seconds: float,
+                 initial: Optional[Callable[[], Optional[Dict]]] = None,
+                 prepare: Optional[Callable[[Dict, Optional[object]], object]] = None):
+        self.loader = loader
+        self.interval_seconds = interval_seconds
+        self.initial = initial
+        # Builds what requests read (e.g. lookup indexes) from a new snapshot, off the request path;
+        # it also gets what it built for the snapshot being replaced, to reuse unchanged parts
+        self.prepare = prepare
+        self._snapshot: Optional[Dict] = None
+        self._swapped_at: Optional[float] = None
+        self._last_refresh_seconds: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def ensure_started(self):
+        """Start the background thread in this process, once; threads don't survive fork"""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._load_initial()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='snapshot-refresher', daemon=True)
+            self._thread.start()
+
+    def _load_initial(self):
+        if self._snapshot is None and self.initial is not None:
+            try:
+                snapshot = self.initial()
+                if snapshot is not None:
+                    self._swap(self._prepared(snapshot))
+            except Exception as e:
+                print(f"Error loading initial snapshot: {e}")
+
+    def preload(self):
+        """Load and prepare the initial snapshot without starting the thread, e.g. in a server's
+        master process; each forked worker starts its own thread and keeps this snapshot until
+        a refresh finds a newer one"""
+        with self._lock:
+            self._load_initial()
+        return self._snapshot
+
+    def current(self, wait_seconds: float = 0):
+        """The latest snapshot; with no snapshot yet, wait up to `wait_seconds` for the first one"""
+        self.ensure_started()
+        deadline = time.monotonic() + wait_seconds
+        while self._snapshot is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return self._snapshot
+
+    def refresh_now(self):
+        """Ask the background thread to refresh without waiting for the schedule"""
+        self._wake.set()
+
+    def _prepared(self, snapshot: Dict):
+        return self.prepare(snapshot, self._snapshot) if self.prepare is not None else snapshot
+
+    def _swap(self, snapshot):
+        # A single reference assignment, so readers see either the old or the new snapshot
+        self._snapshot = snapshot
+        self._swapped_at = time.time()
+
+    def _refresh(self):
+        self._refreshing = True
+        start = time.perf_counter()
+        try:
+            # The loader returns None when it has nothing better than the current snapshot
+            snapshot = self.loader()
+            if snapshot is None:
+                self._last_error = "Refresh returned no usable data"
+                return
+            current = self._snapshot
+            # Reopening an unchanged snapshot file would only throw away its decoded records
+            timestamp = getattr(snapshot, 'timestamp', None)
+            if current is None or timestamp is None or timestamp != getattr(current, 'timestamp', None):
+                self._swap(self._prepared(snapshot))
+            self._last_error = None
+        except Exception as e:
+            self._last_error = str(e)
+            print(f"Background refresh failed, keeping the current snapshot: {e}")
+        finally:
+            self._last_refresh_seconds = time.perf_counter() - start
+            self._refreshing = False
+
+    def _run(self):
+        while True:
+            self._refresh()
+            self._wake.wait(self.interval_seconds)
+            self._wake.clear()
+
+    def status(self) -> Dict:
+        """Snapshot age and refresh timings for monitoring"""
+        snapshot = self._snapshot
+        produced_at = self._swapped_at
+        timestamp = getattr(snapshot, 'timestamp', None)
+        if timestamp:
+            try:
+                produced_at = datetime.fromisoformat(timestamp).timestamp()
+            except ValueError:
+                pass
+        return {
+            'has_snapshot': snapshot is not None,
+            'snapshot_age_seconds': round(time.time() - produced_at, 1) if produced_at else None,
+            'last_refresh_seconds': round(self._last_refresh_seconds, 3) if self._last_refresh_seconds is not None else None,
+            'refreshing': self._refreshing,
+            'refresh_interval_seconds': self.interval_seconds,
+            'last_error': self._last_error
+        }
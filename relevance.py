@@ -0,0 +1,125 @@
+"""
+BM25 relevance ranking of problems against committees and legislators
+Committees are described by their jurisdiction (committee_jurisdictions.csv) and legislators by
+their committees, occupation and bio. Both are kept as BM25-weighted term matrices, so a batch
+of problems is scored against every committee and legislator with two matrix products.
+"""
+import csv
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+import numpy as np
+from models import Representative
+
+COMMITTEE_JURISDICTIONS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'committee_jurisdictions.csv')
+WORD = re.compile(r'[a-z0-9]+')
+STOP_WORDS = frozenset("""a an and are as at be been but by can do does for from has have how i in into is it its
+    me my no not of on or our so than that the their them there these they this to too us was we were what
+    when which who why will with would you your need needs want more less very high low better new get""".split())
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Strip common English suffixes, e.g. farming, farmers -> farm and taxes -> tax"""
+    if len(word) > 4:
+        if word.endswith('ies'):
+            return word[:-3] + 'y'
+        for suffix in ('ing', 'ers', 'ed', 'er'):
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                return word[:-len(suffix)]
+        if word.endswith(('xes', 'ches', 'shes', 'sses', 'zes')):
+            return word[:-2]
+        if word.endswith('s') and not word.endswith('ss'):
+            return word[:-1]
+    return word
+
+def tokenize(text: str) -> List[str]:
+    return [stem(word) for word in WORD.findall(text.lower()) if word not in STOP_WORDS]
+
+def load_jurisdictions(path: str = COMMITTEE_JURISDICTIONS) -> Dict[str, str]:
+    """Committee name -> jurisdiction text"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, newline='') as f:
+        return {row['committee']: row['jurisdiction'] for row in csv.DictReader(f)}
+
+class RelevanceRanker:
+    """BM25 term matrices for committees and legislators over one snapshot"""
+    K1 = 1.2  # Term frequency saturation
+    B = 0.75  # Document length normalization
+
+    def __init__(self, members: List[Representative], jurisdictions: Mapping[str, str],
+                 roles: Mapping[str, Mapping[int, float]]):
+        """`jurisdictions` maps committee names to their jurisdiction text and `roles` maps them to
+        {member id: role weight from 0 to 1}"""
+        self.members = members
+        self.committee_names = list(jurisdictions)
+        committee_docs = [tokenize(name) * 2 + tokenize(jurisdictions[name]) for name in self.committee_names]
+        member_docs = [tokenize(' '.join(rep.committees)) + tokenize(rep.occupation or '') + tokenize(rep.bio or '')
+                       for rep in members]
+
+        self.vocabulary: Dict[str, int] = {}
+        for doc in committee_docs + member_docs:
+            for term in doc:
+                self.vocabulary.setdefault(term, len(self.vocabulary))
+        self._committee_weights = self._bm25(committee_docs)
+        self._member_weights = self._bm25(member_docs)
+
+        # A committee's score passes to its members in proportion to their role on it
+        self._roles = np.zeros((len(self.committee_names), len(members)), dtype=np.float32)
+        for row, name in enumerate(self.committee_names):
+            for member_id, weight in roles.get(name, {}).items():
+                self._roles[row, member_id] = weight
+
+    def _bm25(self, docs: List[List[str]]) -> np.ndarray:
+        """(documents x vocabulary) matrix of BM25 term weights"""
+        weights = np.zeros((len(docs), len(self.vocabulary)), dtype=np.float32)
+        for row, doc in enumerate(docs):
+            for term in doc:
+                weights[row, self.vocabulary[term]] += 1
+        if not docs:
+            return weights
+        lengths = weights.sum(axis=1, keepdims=True)
+        average = float(lengths.mean()) or 1.0
+        df = (weights > 0).sum(axis=0)
+        idf = np.log(1 + (len(docs) - df + 0.5) / (df + 0.5)).astype(np.float32)
+        saturated = weights * (self.K1 + 1) / (weights + self.K1 * (1 - self.B + self.B * lengths / average))
+        return saturated * idf
+
+    def query_matrix(self, problems: Sequence[str]) -> np.ndarray:
+        """(problems x vocabulary) matrix marking each problem's known terms"""
+        queries = np.zeros((len(problems), len(self.vocabulary)), dtype=np.float32)
+        for row, problem in enumerate(problems):
+            columns = [self.vocabulary[term] for term in tokenize(problem) if term in self.vocabulary]
+            queries[row, columns] = 1.0
+        return queries
+
+    def score(self, problems: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(problems x committees) and (problems x members) relevance scores"""
+        queries = self.query_matrix(problems)
+        committees = queries @ self._committee_weights.T
+        members = queries @ self._member_weights.T + committees @ self._roles
+        return committees, members
+
+    def rank_batch(self, problems: Sequence[str], limit: Optional[int] = None
+                   ) -> List[Tuple[List[Tuple[str, float]], List[Tuple[Representative, float]]]]:
+        """Ranked (committee, score) and (member, score) pairs with a positive score, per problem"""
+        committees, members = self.score(problems)
+        return list(zip(self._top(committees, self.committee_names, limit), self._top(members, self.members, limit)))
+
+    def rank(self, problem: str, limit: Optional[int] = None
+             ) -> Tuple[List[Tuple[str, float]], List[Tuple[Representative, float]]]:
+        return self.rank_batch([problem], limit)[0]
+
+    @staticmethod
+    def _top(scores: np.ndarray, items: Sequence, limit: Optional[int]) -> List[List[Tuple[object, float]]]:
+        """Each row's positive scores, best first, sorted for the whole batch at once"""
+        order = np.argsort(-scores, axis=1, kind='stable')
+        if limit:
+            order = order[:, :limit]
+        ranked_scores = np.take_along_axis(scores, order, axis=1).astype(np.float64).round(3).tolist()
+        return [[(items[position], score) for position, score in zip(positions, row_scores) if score > 0]
+                for positions, row_scores in zip(order.tolist(), ranked_scores)]
+
+    def stats(self) -> Dict[str, int]:
+        return {'committees': len(self.committee_names), 'members': len(self.members), 'terms': len(self.vocabulary)}
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Record legislature pages to a fixture directory and replay them from a local HTTP server
+Fixtures mirror the site's URL paths (/senate/membership/ -> senate/membership/index.html),
+so a scraper pointed at the replay server runs unchanged and offline
+
+Usage:
+    python replay.py record fixtures/legislature
+    python replay.py serve fixtures/legislature --port 8000 --latency 0.1 --error-rate 0.05 --multiply 10
+"""
+import argparse
+import copy
+import hashlib
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup
+
+MEMBER_CARD_CLASS = re.compile(r'(^|\s)member-card(\s|$)')
+
+def fixture_path(directory: str, url: str) -> str:
+    """File a URL's response is recorded to and replayed from"""
+    parts = [part for part in urlparse(url).path.split('/') if part and part not in ('.', '..')]
+    return os.path.join(directory, *parts, 'index.html')
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def latency_summary(seconds: List[float]) -> Dict[str, Optional[float]]:
+    """p50 / p90 / p99 / max of a list of latencies, in milliseconds"""
+    summary = {}
+    for label, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0)):
+        value = _percentile(seconds, fraction)
+        summary[label] = round(value * 1000, 1) if value is not None else None
+    return summary
+
+class Recorder:
+    """Save every successful page a requests session fetches into a fixture directory"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.recorded: List[str] = []
+        self._lock = threading.Lock()
+
+    def attach(self, session):
+        """Start recording responses from `session`"""
+        session.hooks['response'].append(self._on_response)
+
+    def _on_response(self, response, *args, **kwargs):
+        if response.status_code != 200:
+            return response
+        path = fixture_path(self.directory, response.url)
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(response.content)
+            self.recorded.append(response.url)
+        return response
+
+class ReplayServer:
+    """Serve recorded fixtures with configurable latency, errors and page multiplication"""
+
+    def __init__(self, directory: str, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, multiply: int = 1, seed: Optional[int] = None,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.directory = directory
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.multiply = max(1, multiply)
+        self.host = host
+        self.port = port
+        self._random = random.Random(seed)
+        self._bodies: Dict[str, Optional[bytes]] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self.reset_stats()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reload(self):
+        """Forget the bodies read so far, so edited fixture files are served as changed"""
+        with self._lock:
+            self._bodies = {}
+
+    def reset_stats(self):
+        """Forget the requests served so far"""
+        with self._lock:
+            self._statuses: Dict[int, int] = {}
+            self._bytes = 0
+            self._latencies: List[float] = []
+
+    def stats(self) -> Dict:
+        """Requests served by status, bytes sent and server-side latency percentiles"""
+        with self._lock:
+            return {
+                'requests': sum(self._statuses.values()),
+                'statuses': dict(sorted(self._statuses.items())),
+                'bytes': self._bytes,
+                'latency_ms': latency_summary(self._latencies)
+            }
+
+    def _multiplied(self, body: bytes) -> bytes:
+        # Repeat every member card, or every table row on pages without cards
+        soup = BeautifulSoup(body, 'html.parser')
+        elements = soup.find_all('div', class_=MEMBER_CARD_CLASS) or [
+            row for row in soup.find_all('tr') if row.find('td')
+        ]
+        if not elements:
+            return body
+        for element in elements:
+            for _ in range(self.multiply - 1):
+                element.insert_after(copy.copy(element))
+        return str(soup).encode('utf-8')
+
+    def _body(self, path: str) -> Optional[bytes]:
+        if path in self._bodies:
+            return self._bodies[path]
+        filename = fixture_path(self.directory, path)
+        body = None
+        if os.path.isfile(filename):
+            with open(filename, 'rb') as f:
+                body = f.read()
+            if self.multiply > 1:
+                body = self._multiplied(body)
+        with self._lock:
+            self._bodies[path] = body
+        return body
+
+    def _delay(self) -> Tuple[float, bool]:
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+        return delay, failed
+
+    def _record(self, status: int, sent: int, seconds: float):
+        with self._lock:
+            self._statuses[status] = self._statuses.get(status, 0) + 1
+            self._bytes += sent
+            self._latencies.append(seconds)
+
+    def _handle(self, handler: BaseHTTPRequestHandler):
+        start = time.perf_counter()
+        delay, failed = self._delay()
+        if delay:
+            time.sleep(delay)
+        body = None if failed else self._body(urlparse(handler.path).path)
+
+        if failed:
+            status, payload = 503, b'Service Unavailable'
+        elif body is None:
+            status, payload = 404, b'Not Found'
+        else:
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            status = 304 if handler.headers.get('If-None-Match') == etag else 200
+            payload = body if status == 200 else b''
+
+        handler.send_response(status)
+        if body is not None and not failed:
+            handler.send_header('ETag', etag)
+        if status == 503:
+            handler.send_header('Retry-After', '1')
+        handler.send_header('Content-Type', 'text/html; charset=UTF-8')
+        handler.send_header('Content-Length', str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+        self._record(status, len(payload), time.perf_counter() - start)
+
+    def start(self) -> str:
+        """Start serving on a background thread and return the base URL"""
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                replay._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.base_url
+
+    def stop(self):
+        """Stop serving"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'ReplayServer':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+def record(directory: str, base_url: Optional[str] = None, requests_per_second: Optional[float] = None) -> List[str]:
+    """Scrape the legislature once, saving every page fetched under `directory`, profiles included"""
+    from scraper import IdahoLegislatureScraper
+
+    scraper = IdahoLegislatureScraper(requests_per_second=requests_per_second, incremental=False,
+                                      enrich_profiles=True)
+    if base_url:
+        scraper.BASE_URL = base_url.rstrip('/')
+    # An empty page store, so every page comes back in full rather than as a 304
+    scraper.page_store.directory = tempfile.mkdtemp(prefix='record-')
+    recorder = Recorder(directory)
+    recorder.attach(scraper.session)
+    # The same pages a refresh reads: rosters, every member's profile page and the committees
+    scraper.enrich_members(scraper.scrape_senate_members(), "Senate")
+    scraper.enrich_members(scraper.scrape_house_members(), "House")
+    scraper.scrape_committees()
+    return recorder.recorded
+
+def main():
+    parser = argparse.ArgumentParser(description='Record and replay legislature pages')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = commands.add_parser('record', help='Scrape the live site into a fixture directory')
+    record_parser.add_argument('directory', help='Fixture directory to write')
+    record_parser.add_argument('--base-url', help='Site to record (defaults to the scraper\'s BASE_URL)')
+    record_parser.add_argument('--rate', type=float, help='Requests/sec (defaults to the scraper\'s REQUESTS_PER_SECOND)')
+
+    serve_parser = commands.add_parser('serve', help='Serve a fixture directory over HTTP')
+    serve_parser.add_argument('directory', help='Fixture directory to serve')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8000)
+    serve_parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    serve_parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many extra random seconds')
+    serve_parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered 503')
+    serve_parser.add_argument('--multiply', type=int, default=1, help='Copies of each member card or roster row')
+    serve_parser.add_argument('--seed', type=int, help='Random seed for jitter and errors')
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        recorded = record(args.directory, args.base_url, args.rate)
+        print(f"Recorded {len(recorded)} pages to {args.directory}")
+        return
+
+    server = ReplayServer(
+        args.directory,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        multiply=args.multiply,
+        seed=args.seed,
+        host=args.host,
+        port=args.port
+    )
+    print(f"Replaying {args.directory} at {server.start()} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print(f"\n{server.stats()}")
+        server.stop()
+
+if __name__ == '__main__':
+    main()
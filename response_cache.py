@@ -0,0 +1,111 @@
+"""
+Disk cache of LLM responses, keyed by a hash of the normalized prompt
+Entries expire after a TTL, and once the cache outgrows its size limit the least recently used
+entries are removed, so repeated intake forms and profile analyses cost one API call each.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+WHITESPACE = re.compile(r'\s+')
+
+def prompt_key(model: str, messages: List[Dict[str, str]]) -> str:
+    """Hash of a request with case and runs of whitespace ignored, so trivially different prompts share an entry"""
+    normalized = [{'role': message['role'], 'content': WHITESPACE.sub(' ', message['content']).strip().lower()}
+                  for message in messages]
+    return hashlib.sha256(json.dumps([model, normalized]).encode('utf-8')).hexdigest()
+
+class ResponseCache:
+    """One JSON file per response; file modification times double as last-used times"""
+    CACHE_DIR = "llm_cache"
+    TTL_SECONDS = 7 * 24 * 3600  # Responses older than this are asked for again
+    MAX_BYTES = 50 * 1024 * 1024  # Least recently used entries are removed past this size
+    EVICT_TO = 0.9  # Fraction of MAX_BYTES left after an eviction pass
+
+    def __init__(self, directory: Optional[str] = None, ttl_seconds: Optional[float] = None,
+                 max_bytes: Optional[int] = None):
+        self.directory = directory or self.CACHE_DIR
+        self.ttl_seconds = self.TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.max_bytes = self.MAX_BYTES if max_bytes is None else max_bytes
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None  # Bytes on disk, counted on first write
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.json')
+
+    def get(self, key: str) -> Optional[str]:
+        """The cached response for a key, if present and not expired"""
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        if time.time() - entry.get('created', 0) > self.ttl_seconds:
+            self._remove(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        self.hits += 1
+        return entry.get('response')
+
+    def put(self, key: str, response: str):
+        """Store a response, then evict least recently used entries if the cache is over its size"""
+        content = json.dumps({'created': time.time(), 'response': response}).encode('utf-8')
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            if self._size is None:
+                self._size = sum(entry.stat().st_size for entry in self._entries())
+            path = self._path(key)
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(content)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+            self._size += len(content) - previous
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        return [entry for entry in os.scandir(self.directory)
+                if entry.name.endswith('.json') and entry.is_file()]
+
+    def _evict(self):
+        """Remove expired entries, then the least recently used, until under EVICT_TO of the limit"""
+        now = time.time()
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        self._size = sum(entry.stat().st_size for entry in entries)
+        target = self.max_bytes * self.EVICT_TO
+        for entry in entries:
+            if self._size <= target and now - entry.stat().st_mtime <= self.ttl_seconds:
+                break
+            size = entry.stat().st_size
+            if self._remove(entry.path):
+                self._size -= size
+                self.evictions += 1
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
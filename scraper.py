@@ -1,67 +1,315 @@
 import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+from bs4 import BeautifulSoup, SoupStrainer
+from typing import Any, Callable, List, Dict, Optional, Tuple
 import re
-import time
 import json
+import hashlib
 import os
+import sqlite3
+import tempfile
+from dataclasses import replace
 from datetime import datetime, timedelta
+from urllib.parse import urljoin, urlparse
 from models import Representative, Contact, Party, Chamber, HouseSeat, Committee
+from fetcher import ConcurrentFetcher, HostRateLimiter
+from page_store import PageStore
+from extractor import MemberExtractor, MemberProfile, ProfileExtractor, MEMBER_PROFILE_LINK
+from snapshot import open_snapshot, write_snapshot
+from history import HistoryStore
+from refresh_lock import RefreshLock
+from committee_roster import RosterMatcher
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+PARSER_BACKENDS = ('html.parser', 'lxml', 'targeted')
+
+# Committee pages title themselves e.g. "Senate Agricultural Affairs Committee"
+COMMITTEE_TITLE_PREFIX = re.compile(r'^(?:Senate|House)\s+')
+COMMITTEE_TITLE_SUFFIX = re.compile(r'\s+Committee$')
+MEMBER_TITLE = re.compile(r'^(?:Sen\.|Senator|Rep\.|Representative)\s+')
+MEMBER_NAME_END = re.compile(r'\s*(?:,|\(|\s-\s|\bVice[ -]Chair\b|\bChair\b)')
+MEMBER_NAME = re.compile(r"[A-Z][\w.'-]*(?: [A-Z][\w.'-]*)+")
+
+# Stands in for a profile page that is the one a reused record was enriched from
+UNCHANGED = object()
 
 class IdahoLegislatureScraper:
     BASE_URL = "https://legislature.idaho.gov"
     CACHE_FILE = "cache.json"
-    CACHE_DURATION_HOURS = 1
+    SNAPSHOT_FILE = "snapshot.db"
+    JOURNAL_FILE = "changes.jsonl"
+    LOCK_FILE = "refresh.lock"
+    HISTORY_FILE = "history.db"
+    REFRESH_WAIT_SECONDS = 300  # How long a process with no snapshot waits for another's refresh
+    CACHE_FORMAT = 'snapshot'  # 'snapshot' (SQLite, decoded lazily) or 'json'
+    CACHE_DURATION_HOURS = 0.25  # Pages are revalidated with conditional GETs, so refreshes are cheap
+    REQUESTS_PER_SECOND = 1.0  # Sustained request rate per host
+    BURST = 3  # Requests allowed back to back before the rate applies
+    MAX_WORKERS = 4  # Concurrent fetches
+    # 'html.parser', 'lxml', or 'targeted' (lxml, building only the subtrees a page is
+    # scraped for: lower peak memory for a little more CPU)
+    PARSER_BACKEND = 'lxml'
+    COMMITTEE_INDEX_PATHS = {
+        'senate': '/committees/senatecommittees/',
+        'house': '/committees/housecommittees/'
+    }
+    # Membership pages are read as member cards, falling back to table rows
+    MEMBER_TARGETS = [
+        SoupStrainer('div', class_=re.compile(r'(^|\s)member-card(\s|$)')),
+        SoupStrainer('tr')
+    ]
     
-    def __init__(self):
+    INCREMENTAL = True  # Reuse records whose member card or committee page is unchanged
+    ENRICH_PROFILES = True  # Follow each new or changed member's profile link for the details cards leave out
+    PROFILE_ATTEMPTS = 3  # Tries per profile page before leaving that member unenriched
+    PROFILE_RETRY_SECONDS = 2.0  # Backoff before a profile retry, times the attempt number
+    PROFILE_REVALIDATE_HOURS = 24  # How long an unchanged member's profile goes without being fetched again
+    RECORD_HISTORY = True  # Keep each refresh's roster as that year's session in the history store
+    # Fewest records a refresh may have before it is treated as a partial scrape and not saved
+    # (35 Senate and 70 House seats); saving one would replace the snapshot and that year's history
+    MIN_SENATORS = 30
+    MIN_REPRESENTATIVES = 60
+    MIN_COMMITTEES = 1
+    
+    def __init__(self, requests_per_second: Optional[float] = None, burst: Optional[int] = None,
+                 max_workers: Optional[int] = None, parser_backend: Optional[str] = None,
+                 incremental: Optional[bool] = None, cache_format: Optional[str] = None,
+                 enrich_profiles: Optional[bool] = None):
         self.session = requests.Session()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         self.session.headers.update(self.headers)
+        self.rate_limiter = HostRateLimiter(
+            requests_per_second or self.REQUESTS_PER_SECOND,
+            burst or self.BURST
+        )
+        self.fetcher = ConcurrentFetcher(max_workers or self.MAX_WORKERS)
+        self.page_store = PageStore()
+        self.extractor = MemberExtractor()
+        self.profile_extractor = ProfileExtractor()
+        self.parser_backend = parser_backend or self.PARSER_BACKEND
+        if self.parser_backend not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown parser backend: {self.parser_backend}")
+        self._page_fingerprints: Dict[str, str] = {}
+        # Validators each page's body was stored under, and what was last read from it, keyed by URL
+        self._validators: Dict[str, Dict[str, str]] = {}
+        self._extracted: Dict[str, Tuple[str, Any]] = {}
+        self.incremental = self.INCREMENTAL if incremental is None else incremental
+        self.cache_format = cache_format or self.CACHE_FORMAT
+        if self.cache_format not in ('snapshot', 'json'):
+            raise ValueError(f"Unknown cache format: {self.cache_format}")
+        self.enrich_profiles = self.ENRICH_PROFILES if enrich_profiles is None else enrich_profiles
+        # Fingerprints of the records (and enriching profile pages, with when each was last fetched)
+        # in the snapshot being built, keyed by record key
+        self.fingerprints: Dict[str, Dict[str, str]] = {'members': {}, 'committees': {}, 'profiles': {},
+                                                        'profiles_checked': {}}
+        # Records from the previous snapshot, keyed by fingerprint
+        self._previous_members: Dict[str, Representative] = {}
+        self._previous_committees: Dict[str, Committee] = {}
+        # Profile page fingerprints and fetch times from the previous snapshot, and members reused from it as-is
+        self._previous_profiles: Dict[str, str] = {}
+        self._previous_profiles_checked: Dict[str, str] = {}
+        self._reused_members = set()
+    
+    def _read_cache_file(self) -> Optional[Dict]:
+        """Read the raw JSON cache file, whatever its age"""
+        if not os.path.exists(self.CACHE_FILE):
+            return None
+        with open(self.CACHE_FILE, 'r') as f:
+            return json.load(f)
+    
+    def _cache_to_objects(self, cache_data: Dict) -> Dict:
+        """Convert cached dictionaries back to objects"""
+        cached_dict_data = cache_data.get('data', {})
+        return {
+            'senators': [self._dict_to_rep(rep_dict) for rep_dict in cached_dict_data.get('senators', [])],
+            'representatives': [self._dict_to_rep(rep_dict) for rep_dict in cached_dict_data.get('representatives', [])],
+            'committees': [self._dict_to_committee(committee_dict) for committee_dict in cached_dict_data.get('committees', [])]
+        }
+    
+    def _read_snapshot(self) -> Optional[Dict]:
+        """Read the last saved snapshot, whatever its age, in the configured cache format"""
+        if self.cache_format == 'snapshot':
+            snapshot = open_snapshot(self.SNAPSHOT_FILE, self._dict_to_rep, self._dict_to_committee)
+            if snapshot is None:
+                return None
+            return {
+                'timestamp': snapshot.timestamp,
+                'data': snapshot,
+                'fingerprints': snapshot.fingerprints
+            }
+        
+        cache_data = self._read_cache_file()
+        if not cache_data:
+            return None
+        return {
+            'timestamp': cache_data.get('timestamp', ''),
+            'data': self._cache_to_objects(cache_data),
+            'fingerprints': cache_data.get('fingerprints', {})
+        }
     
     def _load_cache(self) -> Optional[Dict]:
         """Load cached data if it exists and is fresh"""
         try:
-            if os.path.exists(self.CACHE_FILE):
-                with open(self.CACHE_FILE, 'r') as f:
-                    cache_data = json.load(f)
-                
-                cache_time = datetime.fromisoformat(cache_data.get('timestamp', ''))
+            snapshot = self._read_snapshot()
+            if snapshot:
+                cache_time = datetime.fromisoformat(snapshot['timestamp'])
                 if datetime.now() - cache_time < timedelta(hours=self.CACHE_DURATION_HOURS):
                     print(f"Using cached data from {cache_time}")
-                    
-                    # Convert dictionaries back to objects
-                    cached_dict_data = cache_data.get('data', {})
-                    return {
-                        'senators': [self._dict_to_rep(rep_dict) for rep_dict in cached_dict_data.get('senators', [])],
-                        'representatives': [self._dict_to_rep(rep_dict) for rep_dict in cached_dict_data.get('representatives', [])],
-                        'committees': [self._dict_to_committee(committee_dict) for committee_dict in cached_dict_data.get('committees', [])]
-                    }
+                    return snapshot['data']
         except Exception as e:
             print(f"Error loading cache: {e}")
         return None
     
+    def _load_previous_snapshot(self) -> Optional[Dict]:
+        """Load the last snapshot, even if expired, for an incremental refresh"""
+        try:
+            return self._read_snapshot()
+        except Exception as e:
+            print(f"Error loading previous snapshot: {e}")
+        return None
+    
+    def _prepare_incremental(self, previous: Optional[Dict]):
+        """Index the previous snapshot's records by fingerprint so unchanged ones can be reused"""
+        self.fingerprints = {'members': {}, 'committees': {}, 'profiles': {}, 'profiles_checked': {}}
+        self._previous_members = {}
+        self._previous_committees = {}
+        self._previous_profiles = {}
+        self._previous_profiles_checked = {}
+        self._reused_members = set()
+        if not previous:
+            return
+        
+        fingerprints = previous['fingerprints']
+        self._previous_profiles = dict(fingerprints.get('profiles', {}))
+        self._previous_profiles_checked = dict(fingerprints.get('profiles_checked', {}))
+        member_fingerprints = fingerprints.get('members', {})
+        for rep in previous['data']['senators'] + previous['data']['representatives']:
+            fingerprint = member_fingerprints.get(self._member_key(rep))
+            if fingerprint:
+                self._previous_members[fingerprint] = rep
+        
+        committee_fingerprints = fingerprints.get('committees', {})
+        for committee in previous['data']['committees']:
+            fingerprint = committee_fingerprints.get(self._committee_key(committee))
+            if fingerprint:
+                self._previous_committees[fingerprint] = committee
+    
+    def completeness_problems(self, data: Optional[Dict]) -> List[str]:
+        """Why data looks too incomplete to save or serve; empty when it is complete"""
+        if not data:
+            return ['no data']
+        problems = []
+        for list_name, minimum in (('senators', self.MIN_SENATORS),
+                                   ('representatives', self.MIN_REPRESENTATIVES),
+                                   ('committees', self.MIN_COMMITTEES)):
+            if len(data[list_name]) < minimum:
+                problems.append(f"{len(data[list_name])} {list_name}, expected at least {minimum}")
+        if data['senators'] and not isinstance(data['senators'][0], Representative):
+            problems.append('senators are not Representative records')
+        return problems
+    
+    def _member_key(self, rep: Representative) -> str:
+        return f"{rep.chamber.value}|{rep.district}|{rep.name}"
+    
+    def _committee_key(self, committee: Committee) -> str:
+        return f"{committee.chamber.value}|{committee.name}"
+    
+    def _write_change_journal(self, previous: Dict, data: Dict):
+        """Append the legislators added, removed and modified by this refresh to the journal"""
+        old = {self._member_key(rep): self._rep_to_dict(rep)
+               for rep in previous['senators'] + previous['representatives']}
+        new = {self._member_key(rep): self._rep_to_dict(rep)
+               for rep in data['senators'] + data['representatives']}
+        
+        entry = {
+            'timestamp': datetime.now().isoformat(),
+            'added': sorted(key for key in new if key not in old),
+            'removed': sorted(key for key in old if key not in new),
+            'modified': sorted(key for key in new if key in old and new[key] != old[key])
+        }
+        try:
+            with open(self.JOURNAL_FILE, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+        except OSError as e:
+            print(f"Error writing change journal: {e}")
+        
+        print(f"Changes: {len(entry['added'])} added, {len(entry['removed'])} removed, "
+              f"{len(entry['modified'])} modified")
+    
     def _save_cache(self, data: Dict):
         """Save data to cache with timestamp"""
         try:
-            # Convert Representative objects to dictionaries for JSON serialization
+            # Convert Representative objects to dictionaries for serialization
             serializable_data = {
                 'senators': [self._rep_to_dict(rep) for rep in data['senators']],
                 'representatives': [self._rep_to_dict(rep) for rep in data['representatives']],
                 'committees': [self._committee_to_dict(committee) for committee in data['committees']]
             }
+            timestamp = datetime.now().isoformat()
             
-            cache_data = {
-                'timestamp': datetime.now().isoformat(),
-                'data': serializable_data
-            }
-            with open(self.CACHE_FILE, 'w') as f:
-                json.dump(cache_data, f, indent=2)
+            if self.cache_format == 'snapshot':
+                write_snapshot(self.SNAPSHOT_FILE, serializable_data, timestamp, self.fingerprints)
+            else:
+                cache_data = {
+                    'timestamp': timestamp,
+                    'data': serializable_data,
+                    'fingerprints': self.fingerprints
+                }
+                # Write beside the cache and rename over it, so readers never see half a file
+                directory = os.path.dirname(os.path.abspath(self.CACHE_FILE))
+                fd, tmp_path = tempfile.mkstemp(prefix='.cache-', suffix='.json', dir=directory)
+                try:
+                    with os.fdopen(fd, 'w') as f:
+                        json.dump(cache_data, f, indent=2)
+                    os.replace(tmp_path, self.CACHE_FILE)
+                except BaseException:
+                    os.remove(tmp_path)
+                    raise
             print("Data cached successfully")
+            if self.RECORD_HISTORY:
+                self._record_history(serializable_data, datetime.fromisoformat(timestamp).year)
         except Exception as e:
             print(f"Error saving cache: {e}")
     
+    def open_history(self) -> HistoryStore:
+        """Open the historical store of past sessions"""
+        return HistoryStore(self.HISTORY_FILE, self._dict_to_rep)
+    
+    def _record_history(self, serializable_data: Dict, year: int):
+        """Store the refreshed roster as the session for `year`, unless it is unchanged"""
+        try:
+            with self.open_history() as history:
+                if history.ingest_session(year, serializable_data):
+                    print(f"Recorded the {year} session in {self.HISTORY_FILE}")
+        except sqlite3.Error as e:
+            print(f"Error recording session history: {e}")
+    
+    def ingest_history_file(self, path: str, year: int) -> bool:
+        """Add a saved snapshot or JSON cache file to the history store as the session for `year`"""
+        if path.endswith('.json'):
+            with open(path, 'r') as f:
+                serializable_data = json.load(f).get('data', {})
+        else:
+            snapshot = open_snapshot(path, self._dict_to_rep, self._dict_to_committee)
+            if snapshot is None:
+                raise ValueError(f"Not a readable snapshot: {path}")
+            try:
+                serializable_data = {
+                    'senators': [self._rep_to_dict(rep) for rep in snapshot['senators']],
+                    'representatives': [self._rep_to_dict(rep) for rep in snapshot['representatives']],
+                    'committees': [self._committee_to_dict(committee) for committee in snapshot['committees']]
+                }
+            finally:
+                snapshot.close()
+        with self.open_history() as history:
+            return history.ingest_session(year, serializable_data)
+    
     def _rep_to_dict(self, rep: Representative) -> Dict:
         """Convert Representative object to dictionary"""
         return {
@@ -80,7 +328,9 @@ class IdahoLegislatureScraper:
             'occupation': rep.occupation,
             'term_number': rep.term_number,
             'committees': rep.committees,
-            'bio': rep.bio
+            'bio': rep.bio,
+            'profile_url': rep.profile_url,
+            'profile_committees': rep.profile_committees
         }
     
     def _committee_to_dict(self, committee: Committee) -> Dict:
@@ -113,7 +363,9 @@ class IdahoLegislatureScraper:
             term_number=rep_dict.get('term_number'),
             house_seat=HouseSeat(rep_dict['house_seat']) if rep_dict.get('house_seat') else None,
             committees=rep_dict.get('committees', []),
-            bio=rep_dict.get('bio')
+            bio=rep_dict.get('bio'),
+            profile_url=rep_dict.get('profile_url'),
+            profile_committees=rep_dict.get('profile_committees')
         )
     
     def _dict_to_committee(self, committee_dict: Dict) -> Committee:
@@ -126,14 +378,79 @@ class IdahoLegislatureScraper:
             members=committee_dict.get('members', [])
         )
     
-    def _make_request(self, url: str) -> Optional[BeautifulSoup]:
+    def _parse_html(self, content: bytes, targets: Optional[List[SoupStrainer]] = None) -> BeautifulSoup:
+        """Parse a page with the configured backend"""
+        if self.parser_backend == 'html.parser' or not HAS_LXML:
+            markup_parser = 'html.parser'
+        else:
+            markup_parser = 'lxml'
+        
+        if self.parser_backend == 'targeted' and targets:
+            # Try each target in turn and keep the first one that matches anything
+            for strainer in targets:
+                soup = BeautifulSoup(content, markup_parser, parse_only=strainer)
+                if soup.contents:
+                    break
+            return soup
+        
+        return BeautifulSoup(content, markup_parser)
+    
+    def _make_request(self, url: str, targets: Optional[List[SoupStrainer]] = None) -> Optional[BeautifulSoup]:
         """Make a request with error handling and rate limiting"""
+        return self._fetch(url, targets=targets)
+    
+    def _fetch(self, url: str, extract: Optional[Callable[[BeautifulSoup], Any]] = None,
+               targets: Optional[List[SoupStrainer]] = None,
+               reuse: Optional[Callable[[str], Any]] = None) -> Any:
+        """Fetch a page and return what `extract` reads from it (the parsed page without one)
+        
+        The page is not parsed when `reuse` has a result for its fingerprint, or when the server
+        answers 304 for a page this scraper already extracted under the same validators
+        """
         try:
-            print(f"Fetching: {url}")
-            time.sleep(3)  # Rate limiting
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
+            with self.fetcher.slots:
+                self.rate_limiter.acquire(url)
+                print(f"Fetching: {url}")
+                headers = self.page_store.conditional_headers(url)
+                response = self.session.get(url, headers=headers, timeout=30)
+            
+            content = None
+            if response.status_code == 304 and headers and self._validators.get(url) == headers:
+                # The body this scraper last read, so its fingerprint is already known
+                fingerprint = self._page_fingerprints[url]
+            else:
+                if response.status_code == 304:
+                    content = self._stored_body(url)
+                else:
+                    response.raise_for_status()
+                    content = response.content
+                    self.page_store.put(
+                        url,
+                        content,
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified')
+                    )
+                fingerprint = hashlib.sha1(content).hexdigest()
+                self._page_fingerprints[url] = fingerprint
+                self._validators[url] = self.page_store.conditional_headers(url)
+            
+            if reuse is not None:
+                reused = reuse(fingerprint)
+                if reused is not None:
+                    return reused
+            if extract is not None:
+                extracted = self._extracted.get(url)
+                if extracted is not None and extracted[0] == fingerprint:
+                    return extracted[1]
+            
+            if content is None:
+                content = self._stored_body(url)
+            soup = self._parse_html(content, targets)
+            if extract is None:
+                return soup
+            result = extract(soup)
+            self._extracted[url] = (fingerprint, result)
+            return result
         except requests.exceptions.RequestException as e:
             print(f"Error fetching {url}: {e}")
             return None
@@ -141,115 +458,165 @@ class IdahoLegislatureScraper:
             print(f"Unexpected error: {e}")
             return None
     
+    def _stored_body(self, url: str) -> bytes:
+        """Body of a page the server reported unchanged, fetched in full if the stored copy vanished"""
+        cached = self.page_store.get(url)
+        if cached is not None:
+            return cached.body
+        with self.fetcher.slots:
+            response = self.session.get(url, timeout=30)
+        response.raise_for_status()
+        return response.content
+    
+    def fetch_pages(self, urls: List[str]) -> Dict[str, Optional[BeautifulSoup]]:
+        """Fetch several pages concurrently, keyed by URL"""
+        return dict(zip(urls, self.fetcher.map(self._make_request, urls)))
+    
     def scrape_senate_members(self) -> List[Representative]:
         """Scrape all Senate members from the membership page"""
-        url = f"{self.BASE_URL}/senate/membership/"
-        soup = self._make_request(url)
-        
-        if not soup:
-            return []
-        
-        senators = []
-        # Find member cards or entries
-        member_elements = soup.find_all('div', class_='member-card') or soup.find_all('tr')
-        
-        for element in member_elements:
-            senator = self._parse_member_data(element, Chamber.SENATE)
-            if senator:
-                senators.append(senator)
-        
-        return senators
+        return self._scrape_members(f"{self.BASE_URL}/senate/membership/", Chamber.SENATE)
     
     def scrape_house_members(self) -> List[Representative]:
         """Scrape all House members from the membership page"""
-        url = f"{self.BASE_URL}/house/membership/"
-        soup = self._make_request(url)
-        
-        if not soup:
+        return self._scrape_members(f"{self.BASE_URL}/house/membership/", Chamber.HOUSE)
+    
+    def _scrape_members(self, url: str, chamber: Chamber) -> List[Representative]:
+        """Records for every member card on a chamber's membership page"""
+        cards = self._fetch(url, lambda soup: self._read_cards(soup, chamber), targets=self.MEMBER_TARGETS)
+        if not cards:
             return []
-        
-        representatives = []
-        member_elements = soup.find_all('div', class_='member-card') or soup.find_all('tr')
-        
-        for element in member_elements:
-            rep = self._parse_member_data(element, Chamber.HOUSE)
-            if rep:
-                representatives.append(rep)
-        
-        return representatives
+        return [self._member_from_card(fingerprint, card, chamber) for fingerprint, card in cards]
+    
+    def _read_cards(self, soup: BeautifulSoup, chamber: Chamber) -> List[Tuple[str, Representative]]:
+        """Fingerprint and record of each member card; cards unchanged since the previous snapshot aren't parsed"""
+        cards = []
+        # Find member cards or entries
+        for element in soup.find_all('div', class_='member-card') or soup.find_all('tr'):
+            fingerprint = hashlib.sha1(str(element).encode('utf-8')).hexdigest()
+            card = self._previous_members.get(fingerprint)
+            if card is None or card.chamber != chamber:
+                card = self._parse_member_data(element, chamber)
+            if card:
+                cards.append((fingerprint, card))
+        return cards
+    
+    def _member_from_card(self, fingerprint: str, card: Representative, chamber: Chamber) -> Representative:
+        """This refresh's record for a card: the previous snapshot's when the card is unchanged"""
+        previous = self._previous_members.get(fingerprint)
+        if previous is not None and previous.chamber == chamber:
+            rep = previous
+            self._reused_members.add(self._member_key(rep))
+        else:
+            rep = card
+        # A copy, as the card may be handed back again for a page that hasn't changed. Only the
+        # memberships read from the profile page carry over; those from committee rosters are
+        # assigned again from this refresh's rosters, so a dropped seat goes away
+        rep = replace(rep, committees=list(rep.profile_committees or []))
+        self.fingerprints['members'][self._member_key(rep)] = fingerprint
+        return rep
     
     def _parse_member_data(self, element, chamber: Chamber) -> Optional[Representative]:
         """Parse individual member data from HTML element"""
+        return self.extractor.extract(element, chamber)
+    
+    def enrich_members(self, members: List[Representative], label: str = "member") -> List[Representative]:
+        """Fill in term, business phone, mailing address, committees and bio from profile pages"""
+        if not self.enrich_profiles:
+            return members
+        
+        # A record reused from the previous snapshot keeps its details without a request until its
+        # profile is PROFILE_REVALIDATE_HOURS old; new and changed cards always have theirs fetched
+        now = datetime.now()
+        pending = []
+        current = 0
+        for rep in members:
+            if not rep.profile_url:
+                continue
+            key = self._member_key(rep)
+            if self._profile_current(rep, now):
+                self.fingerprints['profiles'][key] = self._previous_profiles[key]
+                self.fingerprints['profiles_checked'][key] = self._previous_profiles_checked[key]
+                current += 1
+            else:
+                pending.append(rep)
+        if not pending:
+            return members
+        
+        # A fetched page that is the one a reused record was enriched from isn't applied again.
+        # Results are applied as each page arrives; a failed page is retried on its own
+        print(f"Enriching {len(pending)} {label} profiles ({current} checked within {self.PROFILE_REVALIDATE_HOURS}h)...")
+        failed = 0
+        unchanged = 0
+        for rep, result in self.fetcher.stream(self._fetch_profile, pending,
+                                               attempts=self.PROFILE_ATTEMPTS,
+                                               retry_delay=self.PROFILE_RETRY_SECONDS):
+            key = self._member_key(rep)
+            if result is None:
+                failed += 1
+                if key in self._reused_members and key in self._previous_profiles:
+                    # Still carries the details read last time, and is tried again next refresh
+                    self.fingerprints['profiles'][key] = self._previous_profiles[key]
+                continue
+            profile, fingerprint = result
+            if profile is None:
+                unchanged += 1
+            else:
+                self._apply_profile(rep, profile)
+            self.fingerprints['profiles'][key] = fingerprint
+            self.fingerprints['profiles_checked'][key] = now.isoformat()
+        print(f"Enriched {len(pending) - failed} of {len(pending)} {label} profiles ({unchanged} unchanged)")
+        return members
+    
+    def _profile_current(self, rep: Representative, now: datetime) -> bool:
+        """Whether a record reused from the previous snapshot was enriched recently enough to skip its profile"""
+        key = self._member_key(rep)
+        if key not in self._reused_members or key not in self._previous_profiles:
+            return False
+        if rep.profile_committees is None:
+            return False  # Enriched before profile committees were kept apart from roster ones
         try:
-            # Extract text content
-            text = element.get_text(strip=True)
-            
-            # Parse name
-            name_match = re.search(r'([A-Z][a-z]+ [A-Z][a-z]+)', text)
-            if not name_match:
-                return None
-            name = name_match.group(1)
-            
-            # Parse party
-            party = Party.REPUBLICAN if '(R)' in text else Party.DEMOCRAT
-            
-            # Parse district
-            district_match = re.search(r'District (\d+)', text)
-            if not district_match:
-                return None
-            district = int(district_match.group(1))
-            
-            # Parse house seat if applicable
-            house_seat = None
-            if chamber == Chamber.HOUSE:
-                seat_match = re.search(r'Seat ([AB])', text)
-                if seat_match:
-                    house_seat = HouseSeat.A if seat_match.group(1) == 'A' else HouseSeat.B
-            
-            # Parse contact info
-            email_match = re.search(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', text)
-            email = email_match.group(1) if email_match else ""
-            
-            # Parse phone numbers
-            phone_matches = re.findall(r'(\(\d{3}\) \d{3}-\d{4})', text)
-            home_phone = phone_matches[0] if len(phone_matches) > 0 else None
-            statehouse_phone = phone_matches[1] if len(phone_matches) > 1 else None
-            
-            # Parse occupation
-            occupation_match = re.search(r'Occupation: ([^,\n]+)', text)
-            occupation = occupation_match.group(1) if occupation_match else None
-            
-            contact = Contact(
-                email=email,
-                home_phone=home_phone,
-                statehouse_phone=statehouse_phone
-            )
-            
-            return Representative(
-                name=name,
-                party=party,
-                district=district,
-                chamber=chamber,
-                contact=contact,
-                occupation=occupation,
-                house_seat=house_seat
-            )
-            
-        except Exception as e:
-            print(f"Error parsing member data: {e}")
+            checked = datetime.fromisoformat(self._previous_profiles_checked[key])
+        except (KeyError, ValueError):
+            return False
+        return now - checked < timedelta(hours=self.PROFILE_REVALIDATE_HOURS)
+    
+    def _fetch_profile(self, rep: Representative) -> Optional[Tuple[Optional[MemberProfile], str]]:
+        """Fetch one member's profile page and its fingerprint; the profile is parsed unless the
+        record was reused and the page is the one it was enriched from (then it is None)"""
+        url = urljoin(self.BASE_URL + '/', rep.profile_url)
+        key = self._member_key(rep)
+        enriched_from = self._previous_profiles.get(key) if key in self._reused_members else None
+        profile = self._fetch(url, self.profile_extractor.extract,
+                              reuse=lambda fingerprint: UNCHANGED if fingerprint == enriched_from else None)
+        if profile is None:
             return None
+        fingerprint = self._page_fingerprints.get(url, '')
+        if profile is UNCHANGED:
+            return None, fingerprint
+        return profile, fingerprint
+    
+    def _apply_profile(self, rep: Representative, profile: MemberProfile):
+        """Copy profile details onto a record, leaving fields the page doesn't carry alone"""
+        if profile.term_number is not None:
+            rep.term_number = profile.term_number
+        if profile.bio:
+            rep.bio = profile.bio
+        rep.profile_committees = [self._committee_title(name) for name in profile.committees]
+        rep.committees = list(rep.profile_committees)
+        # A new Contact, as reused records share theirs with the previous snapshot
+        rep.contact = replace(
+            rep.contact,
+            business_phone=profile.business_phone or rep.contact.business_phone,
+            mailing_address=profile.mailing_address or rep.contact.mailing_address
+        )
     
     def scrape_committees(self) -> List[Committee]:
         """Scrape all committees and their membership"""
         committees = []
         
-        # Scrape Senate committees
-        senate_committees = self._scrape_chamber_committees("senate")
-        committees.extend(senate_committees)
-        
-        # Scrape House committees
-        house_committees = self._scrape_chamber_committees("house")
-        committees.extend(house_committees)
+        # Crawl the Senate and House committee indexes side by side
+        for chamber_committees in self.fetcher.map(self._scrape_chamber_committees, ["senate", "house"]):
+            committees.extend(chamber_committees)
         
         return committees
     
@@ -258,10 +625,102 @@ class IdahoLegislatureScraper:
         committees = []
         chamber_enum = Chamber.SENATE if chamber == "senate" else Chamber.HOUSE
         
-        # This would need to be implemented based on the actual committee page structure
-        # For now, returning empty list as placeholder
+        index_url = f"{self.BASE_URL}{self.COMMITTEE_INDEX_PATHS[chamber]}"
+        committee_urls = self._fetch(index_url, lambda soup: self._committee_links(soup, index_url))
+        if not committee_urls:
+            return committees
+        
+        # Fan out over the per-committee pages; the request slots and rate limiter bound concurrency.
+        # A page unchanged since the previous snapshot hands back that snapshot's committee unparsed
+        def previous_committee(fingerprint: str) -> Optional[Committee]:
+            committee = self._previous_committees.get(fingerprint)
+            return committee if committee is not None and committee.chamber == chamber_enum else None
+        
+        def committee_page(url: str) -> Optional[Committee]:
+            return self._fetch(url, lambda soup: self._parse_committee_page(soup, chamber_enum),
+                               reuse=previous_committee)
+        
+        for url, committee in zip(committee_urls, self.fetcher.map(committee_page, committee_urls)):
+            if committee:
+                fingerprint = self._page_fingerprints.get(url)
+                if fingerprint:
+                    self.fingerprints['committees'][self._committee_key(committee)] = fingerprint
+                committees.append(committee)
+        
         return committees
     
+    def _committee_links(self, soup: BeautifulSoup, index_url: str) -> List[str]:
+        """Collect links to individual committee pages from a chamber's committee index"""
+        index_path = urlparse(index_url).path
+        links = []
+        seen = set()
+        for anchor in soup.find_all('a', href=True):
+            url = urljoin(index_url, anchor['href']).split('#')[0]
+            path = urlparse(url).path
+            if path.startswith(index_path) and path.rstrip('/') != index_path.rstrip('/') and url not in seen:
+                seen.add(url)
+                links.append(url)
+        return links
+    
+    def _parse_committee_page(self, soup: BeautifulSoup, chamber: Chamber) -> Optional[Committee]:
+        """Parse a committee's name, officers and members from its page"""
+        heading = soup.find('h1') or soup.find('h2')
+        if not heading:
+            return None
+        name = self._committee_title(heading.get_text(' ', strip=True))
+        if not name:
+            return None
+        
+        committee = Committee(name=name, chamber=chamber, members=[])
+        rows = soup.find_all('tr') or soup.find_all('li') or soup.find_all('div', class_='member-card')
+        # Where rows link to member profiles, skip the rest (headers, staff, secretaries)
+        linked_rows = [row for row in rows if row.find('a', href=MEMBER_PROFILE_LINK)]
+        if linked_rows:
+            rows = linked_rows
+        
+        for row in rows:
+            member = self._committee_member_name(row)
+            if not member:
+                continue
+            role = row.get_text(' ', strip=True).lower()
+            if 'vice chair' in role or 'vice-chair' in role:
+                committee.vice_chair = committee.vice_chair or member
+            elif 'chair' in role:
+                committee.chair = committee.chair or member
+            elif member not in committee.members:
+                committee.members.append(member)
+        
+        return committee
+    
+    def _committee_title(self, title: str) -> str:
+        """Committee name without its chamber prefix and "Committee" suffix"""
+        return COMMITTEE_TITLE_SUFFIX.sub('', COMMITTEE_TITLE_PREFIX.sub('', title)).strip()
+    
+    def _committee_member_name(self, row) -> Optional[str]:
+        """Pull a legislator's name out of one committee roster row"""
+        link = row.find('a', href=MEMBER_PROFILE_LINK)
+        text = link.get_text(' ', strip=True) if link else row.get_text(' ', strip=True)
+        # Drop the role and anything else after the name, e.g. "Sen. Jim Guthrie, Chair"
+        text = MEMBER_NAME_END.split(text, 1)[0]
+        text = MEMBER_TITLE.sub('', text).strip()
+        if not MEMBER_NAME.fullmatch(text):
+            return None
+        return text
+    
+    def _assign_committees(self, members: List[Representative], committees: List[Committee]):
+        """Record each committee on the Representative records of its chair, vice chair and members"""
+        matcher = RosterMatcher(members)
+        for committee in committees:
+            for member_id, _ in matcher.roles(committee):
+                rep = members[member_id]
+                if committee.name not in rep.committees:
+                    rep.committees.append(committee.name)
+    
+    def get_last_snapshot(self) -> Optional[Dict]:
+        """Load the last saved snapshot without checking its age or scraping"""
+        snapshot = self._load_previous_snapshot()
+        return snapshot['data'] if snapshot else None
+    
     def get_all_data(self) -> Dict:
         """Get all legislators and committees with caching"""
         # Check cache first
@@ -269,15 +728,74 @@ class IdahoLegislatureScraper:
         if cached_data:
             return cached_data
         
+        # Only one process scrapes at a time; the others serve the previous snapshot or wait
+        lock = RefreshLock(self.LOCK_FILE)
+        if not lock.acquire(blocking=False):
+            stale = self._load_previous_snapshot()
+            if stale:
+                print("Another process is refreshing, using the previous snapshot")
+                return stale['data']
+            print("Another process is refreshing, waiting for it to finish...")
+            if not lock.acquire(timeout=self.REFRESH_WAIT_SECONDS):
+                print("Timed out waiting for the refresh, returning empty data")
+                return {
+                    'senators': [],
+                    'representatives': [],
+                    'committees': []
+                }
+        
+        try:
+            # The snapshot may have been published while we waited for the lock
+            cached_data = self._load_cache()
+            if cached_data:
+                return cached_data
+            return self._refresh()
+        finally:
+            lock.release()
+    
+    def _refresh(self) -> Dict:
+        """Scrape fresh data and publish it as the new snapshot"""
         print("Cache expired or missing, scraping fresh data...")
         
+        previous = self._load_previous_snapshot() if self.incremental else None
+        self._prepare_incremental(previous)
+        # The failure counts printed below are this refresh's alone
+        self.extractor.reset()
+        self.profile_extractor.reset()
+        
         try:
+            # The three scrapes are independent, so run them side by side; each chamber's
+            # profile pages are fetched as soon as its membership page is parsed. The nested
+            # fetches share the fetcher's request slots, so MAX_WORKERS still bounds them
+            senators, representatives, committees = self.fetcher.map(
+                lambda scrape: scrape(),
+                [
+                    lambda: self.enrich_members(self.scrape_senate_members(), "Senate"),
+                    lambda: self.enrich_members(self.scrape_house_members(), "House"),
+                    self.scrape_committees
+                ]
+            )
+            self._assign_committees(senators + representatives, committees)
             data = {
-                'senators': self.scrape_senate_members(),
-                'representatives': self.scrape_house_members(),
-                'committees': self.scrape_committees()
+                'senators': senators,
+                'representatives': representatives,
+                'committees': committees
             }
             
+            failures = self.extractor.stats()
+            if len(failures) > 1:
+                print(f"Member parse failures by field: {failures}")
+            profile_failures = self.profile_extractor.stats()
+            if len(profile_failures) > 1:
+                print(f"Profile fields missing: {profile_failures}")
+            
+            problems = self.completeness_problems(data)
+            if problems:
+                raise ValueError(f"Incomplete scrape, not saved: {'; '.join(problems)}")
+            
+            if previous:
+                self._write_change_journal(previous['data'], data)
+            
             # Save to cache
             self._save_cache(data)
             return data
@@ -287,11 +805,10 @@ class IdahoLegislatureScraper:
             
             # Try to return cached data even if expired
             try:
-                if os.path.exists(self.CACHE_FILE):
-                    with open(self.CACHE_FILE, 'r') as f:
-                        cache_data = json.load(f)
+                snapshot = self._read_snapshot()
+                if snapshot:
                     print("Website unavailable, using cached data")
-                    return cache_data.get('data', {})
+                    return snapshot['data']
             except:
                 pass
             
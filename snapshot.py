@@ -0,0 +1,177 @@
+"""
+Versioned SQLite snapshot of the scraped legislature
+Records are stored as compact JSON blobs and only turned into objects when they are asked for
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from collections.abc import Mapping, Sequence
+from typing import Callable, Dict, List, Optional
+from models import Representative, Committee
+
+SNAPSHOT_VERSION = 1
+
+# Record lists in a snapshot and the table each one lives in
+MEMBER_LISTS = ('senators', 'representatives')
+COMMITTEE_LIST = 'committees'
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE members (
+    id INTEGER PRIMARY KEY,
+    list TEXT NOT NULL,
+    district INTEGER NOT NULL,
+    name_lower TEXT NOT NULL,
+    record BLOB NOT NULL
+);
+CREATE INDEX members_list ON members (list, id);
+CREATE INDEX members_district ON members (district);
+CREATE TABLE committees (id INTEGER PRIMARY KEY, record BLOB NOT NULL);
+"""
+
+def _encode(record: Dict) -> bytes:
+    return json.dumps(record, separators=(',', ':')).encode('utf-8')
+
+def write_snapshot(path: str, data: Dict[str, List[Dict]], timestamp: str,
+                   fingerprints: Optional[Dict] = None):
+    """Write serialized records to a new snapshot file and move it into place"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.snapshot-', suffix='.db', dir=directory)
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.executescript(SCHEMA)
+            conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+                ('version', str(SNAPSHOT_VERSION)),
+                ('timestamp', timestamp),
+                ('fingerprints', json.dumps(fingerprints or {}))
+            ])
+            for list_name in MEMBER_LISTS:
+                conn.executemany(
+                    "INSERT INTO members (list, district, name_lower, record) VALUES (?, ?, ?, ?)",
+                    [(list_name, record['district'], record['name'].lower(), _encode(record))
+                     for record in data.get(list_name, [])]
+                )
+            conn.executemany(
+                "INSERT INTO committees (record) VALUES (?)",
+                [(_encode(record),) for record in data.get(COMMITTEE_LIST, [])]
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class LazyRecordList(Sequence):
+    """Read-only list of snapshot records that decodes each row on first access"""
+
+    def __init__(self, snapshot: 'LazySnapshot', list_name: str):
+        self._snapshot = snapshot
+        self._list_name = list_name
+        self._ids: Optional[List[int]] = None
+
+    def _row_ids(self) -> List[int]:
+        if self._ids is None:
+            self._ids = self._snapshot._list_ids(self._list_name)
+        return self._ids
+
+    def __len__(self) -> int:
+        return len(self._row_ids())
+
+    def __getitem__(self, index):
+        ids = self._row_ids()
+        if isinstance(index, slice):
+            return [self._snapshot._record(self._list_name, row_id) for row_id in ids[index]]
+        return self._snapshot._record(self._list_name, ids[index])
+
+    def __add__(self, other) -> list:
+        return list(self) + list(other)
+
+    def __radd__(self, other) -> list:
+        return list(other) + list(self)
+
+    def __repr__(self) -> str:
+        return f"<LazyRecordList {self._list_name}: {len(self)} records>"
+
+class LazySnapshot(Mapping):
+    """Snapshot opened from disk; behaves like the scraper's data dictionary"""
+
+    def __init__(self, path: str, rep_decoder: Callable[[Dict], Representative],
+                 committee_decoder: Callable[[Dict], Committee]):
+        self.path = path
+        self._decoders = {name: rep_decoder for name in MEMBER_LISTS}
+        self._decoders[COMMITTEE_LIST] = committee_decoder
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+        # Decoded objects, so repeated lookups hand back the same instance
+        self._objects: Dict[tuple, object] = {}
+        self._lists = {name: LazyRecordList(self, name) for name in MEMBER_LISTS + (COMMITTEE_LIST,)}
+
+        meta = dict(self._query("SELECT key, value FROM meta"))
+        self.version = int(meta.get('version', 0))
+        self.timestamp = meta.get('timestamp', '')
+        self.fingerprints = json.loads(meta.get('fingerprints') or '{}')
+
+    def _query(self, sql: str, params: tuple = ()) -> list:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _list_ids(self, list_name: str) -> List[int]:
+        if list_name == COMMITTEE_LIST:
+            return [row[0] for row in self._query("SELECT id FROM committees ORDER BY id")]
+        return [row[0] for row in self._query("SELECT id FROM members WHERE list = ? ORDER BY id", (list_name,))]
+
+    def _decode(self, list_name: str, row_id: int, blob: bytes):
+        key = (list_name, row_id)
+        obj = self._objects.get(key)
+        if obj is None:
+            obj = self._objects[key] = self._decoders[list_name](json.loads(blob))
+        return obj
+
+    def _record(self, list_name: str, row_id: int):
+        cached = self._objects.get((list_name, row_id))
+        if cached is not None:
+            return cached
+        table = 'committees' if list_name == COMMITTEE_LIST else 'members'
+        rows = self._query(f"SELECT record FROM {table} WHERE id = ?", (row_id,))
+        return self._decode(list_name, row_id, rows[0][0])
+
+    def by_district(self, district: int) -> List[Representative]:
+        """Members of both chambers for one district, decoding only those rows"""
+        rows = self._query("SELECT id, list, record FROM members WHERE district = ? ORDER BY id", (district,))
+        return [self._decode(list_name, row_id, blob) for row_id, list_name, blob in rows]
+
+    def by_name(self, name: str) -> List[Representative]:
+        """Members whose full name is exactly `name`, ignoring case, decoding only those rows"""
+        rows = self._query("SELECT id, list, record FROM members WHERE name_lower = ? ORDER BY id",
+                           (name.strip().lower(),))
+        return [self._decode(list_name, row_id, blob) for row_id, list_name, blob in rows]
+
+    def __getitem__(self, key: str) -> LazyRecordList:
+        return self._lists[key]
+
+    def __iter__(self):
+        return iter(self._lists)
+
+    def __len__(self) -> int:
+        return len(self._lists)
+
+    def close(self):
+        self._conn.close()
+
+def open_snapshot(path: str, rep_decoder: Callable[[Dict], Representative],
+                  committee_decoder: Callable[[Dict], Committee]) -> Optional[LazySnapshot]:
+    """Open a snapshot file, or return None if it is missing or from another format version"""
+    if not os.path.exists(path):
+        return None
+    snapshot = LazySnapshot(path, rep_decoder, committee_decoder)
+    if snapshot.version != SNAPSHOT_VERSION:
+        snapshot.close()
+        return None
+    return snapshot
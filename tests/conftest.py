@@ -0,0 +1,34 @@
+"""
+Shared fixtures for the test suite
+The pages in benchmarks/fixtures/legislature are synthetic: hand-built in the legislature site's
+markup (placeholder 555 phone numbers, staff rows, profile links), not recordings of the live site
+"""
+import os
+import shutil
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from replay import ReplayServer
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks', 'fixtures', 'legislature')
+
+@pytest.fixture
+def replay_server():
+    """A replay server for the synthetic fixtures, stopped after the test"""
+    server = ReplayServer(FIXTURES)
+    server.start()
+    yield server
+    server.stop()
+
+@pytest.fixture
+def editable_server(tmp_path):
+    """A replay server for a copy of the fixtures that a test may edit (call reload() after)"""
+    directory = str(tmp_path / 'site')
+    shutil.copytree(FIXTURES, directory)
+    server = ReplayServer(directory)
+    server.start()
+    yield server
+    server.stop()
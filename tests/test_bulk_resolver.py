@@ -0,0 +1,62 @@
+"""Bulk resolution of CSV and JSON Lines constituent files"""
+import csv
+import io
+import json
+
+import pytest
+
+import zip_mapping
+from bulk_resolver import OUTPUT_COLUMNS, BulkResolver
+from legislature_index import LegislatureIndex
+from sample_data import get_sample_data
+from zip_mapping import ZipPlus4Index
+
+SPLIT_ZIP = '83025'  # Districts 20 and 21
+SINGLE_ZIP = '83227'  # District 27
+
+@pytest.fixture
+def resolver() -> BulkResolver:
+    return BulkResolver(LegislatureIndex(get_sample_data()))
+
+def resolve_jsonl(resolver: BulkResolver, lines) -> list:
+    text = ''.join(resolver.stream(io.StringIO(''.join(line + '\n' for line in lines)), 'jsonl'))
+    return [json.loads(line) for line in text.splitlines()]
+
+def test_bad_jsonl_lines_are_reported_in_place(resolver):
+    rows = resolve_jsonl(resolver, [json.dumps({'zip': SINGLE_ZIP}), '{"zip": ', '', '[1, 2]',
+                                    json.dumps({'zip': SINGLE_ZIP, 'id': 5})])
+    assert rows[1]['line'] == 2 and rows[1]['error'].startswith('Invalid JSON')
+    assert rows[2] == {'line': 4, 'error': 'Expected a JSON object, got list'}
+    assert [row.get('resolved_district') for row in (rows[0], rows[3])] == [27, 27]
+    assert rows[3]['id'] == 5
+    assert (resolver.rows, resolver.resolved, resolver.errors) == (2, 2, 2)
+
+def test_explicit_district_overrides_the_zip(resolver):
+    row = resolver.resolve_row({'zip': SPLIT_ZIP, 'district': '20'})
+    assert (row['resolved_district'], row['district_source'], row['zip_districts']) == (20, 'district', '20;21')
+    assert row['senator'] == resolver.index.delegation(20)['senate'].name
+    # Not a district, so the ZIP code decides
+    row = resolver.resolve_row({'zip': SINGLE_ZIP, 'district': '99'})
+    assert (row['resolved_district'], row['district_source']) == (27, 'zip')
+
+def test_ambiguous_zip_falls_back_to_its_plus4_range(resolver, monkeypatch):
+    monkeypatch.setattr(zip_mapping, 'ZIP4_INDEX', ZipPlus4Index([(SPLIT_ZIP, 0, 4999, 20),
+                                                                  (SPLIT_ZIP, 5000, 8999, 21)]))
+    assert resolver._zip_district(SPLIT_ZIP) == (None, 'zip_ambiguous', '20;21')
+    assert resolver._zip_district(f'{SPLIT_ZIP}-6000') == (21, 'zip4', '20;21')
+    assert resolver._zip_district(f'{SPLIT_ZIP} 1234') == (20, 'zip4', '20;21')
+    assert resolver._zip_district(f'{SPLIT_ZIP}-9500') == (None, 'zip_ambiguous', '20;21')  # no range covers it
+    row = resolver.resolve_row({'zip': f'{SPLIT_ZIP}-6000'})
+    assert (row['resolved_district'], row['district_source']) == (21, 'zip4')
+
+def test_csv_header_keeps_input_columns_and_adds_the_rest_once(resolver):
+    source = io.StringIO(f"name,zip,district_source\nAda,{SINGLE_ZIP},old\nBo,{SPLIT_ZIP},\n")
+    output = io.StringIO()
+    resolver.resolve_file(source, output, 'csv')
+    output.seek(0)
+    reader = csv.DictReader(output)
+    assert reader.fieldnames == ['name', 'zip', 'district_source'] + \
+        [column for column in OUTPUT_COLUMNS if column != 'district_source']
+    rows = list(reader)
+    assert [(row['name'], row['resolved_district'], row['district_source']) for row in rows] == \
+        [('Ada', '27', 'zip'), ('Bo', '', 'zip_ambiguous')]
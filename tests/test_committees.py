@@ -0,0 +1,53 @@
+"""Committee keys, roster matching and the committee index"""
+from committee_roster import CHAIR, MEMBER, VICE_CHAIR, RosterMatcher
+from legislature_index import CommitteeIndex, LegislatureIndex, committee_key
+from models import Chamber, Committee, Contact, Party, Representative
+
+def member(name: str, chamber: Chamber, district: int, committees=None) -> Representative:
+    return Representative(name=name, party=Party.REPUBLICAN, district=district, chamber=chamber,
+                          contact=Contact(email=''), committees=committees)
+
+MEMBERS = [
+    member('Brian Lenney', Chamber.SENATE, 13),
+    member('C. Scott Grow', Chamber.SENATE, 14),
+    member('Megan Blanksma', Chamber.HOUSE, 8, ['Education']),
+    member('Julie Yamamoto', Chamber.HOUSE, 11),
+    member('Jack Nelsen', Chamber.HOUSE, 26),
+    member('David Nelson', Chamber.SENATE, 5),
+]
+COMMITTEES = [
+    Committee('Education', Chamber.SENATE, chair='Brian Lenney', vice_chair='Scott Grow', members=['Megan Blanksma']),
+    Committee('Education', Chamber.HOUSE, chair='Julie Yamamoto', vice_chair=None, members=['Nelsen', 'Nelson']),
+]
+
+def test_committee_key_keeps_the_chamber():
+    assert committee_key('Senate Ways & Means Committee') == 'senate ways and means'
+    assert committee_key('Ways & Means', Chamber.HOUSE) == 'house ways and means'
+    assert committee_key('Education') == 'education'
+    assert committee_key('Joint Finance-Appropriations Committee', Chamber.SENATE) == 'finance appropriations'
+
+def test_roster_names_match_within_the_committee_chamber():
+    matcher = RosterMatcher(MEMBERS)
+    names = [(MEMBERS[member_id].name, role) for member_id, role in matcher.roles(COMMITTEES[0])]
+    # "Scott Grow" by unique last name; a House member on a Senate roster is not matched
+    assert names == [('Brian Lenney', CHAIR), ('C. Scott Grow', VICE_CHAIR)]
+    names = [(MEMBERS[member_id].name, role) for member_id, role in matcher.roles(COMMITTEES[1])]
+    assert names == [('Julie Yamamoto', CHAIR), ('Jack Nelsen', MEMBER)]
+
+def test_committees_of_the_same_name_stay_apart():
+    index = LegislatureIndex({'senators': [rep for rep in MEMBERS if rep.chamber == Chamber.SENATE],
+                              'representatives': [rep for rep in MEMBERS if rep.chamber == Chamber.HOUSE],
+                              'committees': COMMITTEES})
+    assert index.committee('Education', Chamber.SENATE).chair == 'Brian Lenney'
+    assert index.committee('House Education Committee').chair == 'Julie Yamamoto'
+    assert index.committee('Education') is None
+    assert [committee.chamber for committee in index.committees_named('Education')] == [Chamber.SENATE, Chamber.HOUSE]
+
+def test_committee_index_ranks_each_chamber_and_both():
+    index = CommitteeIndex(MEMBERS, COMMITTEES)
+    assert [rep.name for rep in index.ranked(['Senate Education'])] == ['Brian Lenney', 'C. Scott Grow']
+    assert [rep.name for rep in index.ranked(['House Education'])] == \
+        ['Julie Yamamoto', 'Jack Nelsen', 'Megan Blanksma']
+    assert len(index.ranked(['Education'])) == 5
+    assert index.committee_names() == ['Education']
+    assert index.role_weights('Education')[0] == CommitteeIndex.CHAIR_WEIGHT
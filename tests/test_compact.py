@@ -0,0 +1,23 @@
+"""Compact records: same fields as the dataclass records, and read-only"""
+import pytest
+
+from compact import compact_legislature
+from sample_data import get_sample_data
+
+def test_compact_records_keep_their_fields():
+    data = get_sample_data()
+    compact = compact_legislature(data)
+    for rep, record in zip(data['senators'] + data['representatives'],
+                           compact['senators'] + compact['representatives']):
+        assert (record.name, record.district, record.chamber, record.committees) == \
+            (rep.name, rep.district, rep.chamber, rep.committees)
+        assert record.contact.email == rep.contact.email
+
+def test_compact_records_are_read_only():
+    compact = compact_legislature(get_sample_data())
+    rep, committee = compact['senators'][0], compact['committees'][0]
+    for record, field in ((rep, 'name'), (rep, 'committee_ids'), (rep.contact, 'email'), (committee, 'chair')):
+        with pytest.raises(AttributeError):
+            setattr(record, field, 'changed')
+    with pytest.raises(AttributeError):
+        del rep.bio
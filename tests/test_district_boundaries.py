@@ -0,0 +1,56 @@
+"""Point-in-district lookups through the boundary grid"""
+import json
+
+import pytest
+
+from district_boundaries import DistrictBoundaryIndex, DistrictPolygon
+
+# District 1 is a square with a hole that district 3 fills; district 2 is a triangle beside it
+SQUARE = [(0.0, 0.0), (2.0, 0.0), (2.0, 2.0), (0.0, 2.0)]
+HOLE = [(0.8, 0.8), (1.2, 0.8), (1.2, 1.2), (0.8, 1.2)]
+TRIANGLE = [(2.0, 0.0), (4.0, 0.0), (2.0, 2.0)]
+
+def polygons():
+    return [DistrictPolygon(1, [SQUARE, HOLE]), DistrictPolygon(3, [HOLE]), DistrictPolygon(2, [TRIANGLE])]
+
+def brute_force(x: float, y: float):
+    found = [polygon.district for polygon in polygons() if polygon.contains(x, y)]
+    return found[0] if found else None
+
+@pytest.mark.parametrize('grid_size', [1, 4, 32])
+def test_locate_agrees_with_ray_casting_every_polygon(grid_size):
+    index = DistrictBoundaryIndex(polygons(), grid_size)
+    for i in range(81):
+        for j in range(41):
+            x, y = 0.013 + i * 0.049, 0.017 + j * 0.048
+            assert index.locate(y, x) == brute_force(x, y), (x, y)
+
+def test_locate_inside_a_hole_and_outside_the_state():
+    index = DistrictBoundaryIndex(polygons(), 8)
+    assert index.locate(1.0, 1.0) == 3
+    assert index.locate(0.5, 0.5) == 1
+    assert index.locate(0.5, 2.5) == 2  # (lat, lon), so x = 2.5
+    assert index.locate(1.9, 3.9) is None  # inside the bounding box, outside every district
+    assert index.locate(5.0, 1.0) is None
+    # Trying a ZIP code's districts first never changes the answer
+    assert index.locate(1.0, 1.0, districts_first=[1, 2]) == 3
+    assert index.locate(0.5, 2.5, districts_first=[1]) == 2
+
+def test_from_geojson_reads_polygons_and_multipolygons(tmp_path):
+    features = [
+        {'type': 'Feature', 'properties': {'NAME': 'District 19'},
+         'geometry': {'type': 'MultiPolygon', 'coordinates': [[[list(p) for p in SQUARE]],
+                                                              [[[5, 0], [6, 0], [6, 1], [5, 1]]]]}},
+        {'type': 'Feature', 'properties': {'district': 2},
+         'geometry': {'type': 'Polygon', 'coordinates': [[list(p) for p in TRIANGLE]]}},
+    ]
+    path = tmp_path / 'districts.geojson'
+    path.write_text(json.dumps({'type': 'FeatureCollection', 'features': features}))
+    index = DistrictBoundaryIndex.from_geojson(str(path), grid_size=16)
+    assert (index.locate(1.0, 1.0), index.locate(0.5, 5.5), index.locate(0.5, 2.5)) == (19, 19, 2)
+    assert index.stats()['districts'] == 2
+
+    features[1]['properties'] = {'county': 'Ada'}
+    path.write_text(json.dumps({'type': 'FeatureCollection', 'features': features}))
+    with pytest.raises(ValueError):
+        DistrictBoundaryIndex.from_geojson(str(path))
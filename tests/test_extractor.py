@@ -0,0 +1,60 @@
+"""Member card and profile extraction, checked against the synthetic fixture pages"""
+import os
+
+import pytest
+from bs4 import BeautifulSoup
+
+from conftest import FIXTURES
+from extractor import MemberExtractor, ProfileExtractor
+from models import Chamber, HouseSeat, Party
+
+def page(*parts: str) -> BeautifulSoup:
+    with open(os.path.join(FIXTURES, *parts, 'index.html'), 'rb') as f:
+        return BeautifulSoup(f.read(), 'html.parser')
+
+def extract_cards(chamber: Chamber):
+    extractor = MemberExtractor()
+    soup = page(chamber.value.lower(), 'membership')
+    return [extractor.extract(card, chamber) for card in soup.find_all('div', class_='member-card')], extractor
+
+def by_name(records):
+    return {rep.name: rep for rep in records}
+
+def test_every_senate_card_is_extracted():
+    senators, extractor = extract_cards(Chamber.SENATE)
+    assert len(senators) == 35 and all(senators)
+    assert sorted(rep.district for rep in senators) == list(range(1, 36))
+    assert all(rep.house_seat is None and rep.contact.email for rep in senators)
+    assert len(extractor.stats()) <= 1, extractor.stats()
+
+def test_every_house_card_is_extracted():
+    representatives, extractor = extract_cards(Chamber.HOUSE)
+    assert len(representatives) == 70 and all(representatives)
+    seats = {(rep.district, rep.house_seat) for rep in representatives}
+    assert seats == {(district, seat) for district in range(1, 36) for seat in HouseSeat}
+    assert len(extractor.stats()) <= 1, extractor.stats()
+
+def test_card_fields():
+    senators = by_name(extract_cards(Chamber.SENATE)[0])
+    souza = senators['Mary Souza']
+    assert (souza.party, souza.district, souza.occupation) == (Party.REPUBLICAN, 1, 'Rancher')
+    assert souza.contact.email == 'marysouz@senate.idaho.gov'
+    assert (souza.contact.home_phone, souza.contact.statehouse_phone) == ('(208) 555-1000', '(208) 332-1300')
+    assert souza.profile_url == '/senate/membership/smarysouz/'
+
+@pytest.mark.parametrize('name', ['C. Scott Grow', 'Lori Den Hartog', 'Hernán Martínez'])
+def test_names_come_from_profile_links(name):
+    senators = by_name(extract_cards(Chamber.SENATE)[0])
+    assert name in senators
+
+def test_occupation_is_not_cut_at_label_words():
+    senators = by_name(extract_cards(Chamber.SENATE)[0])
+    assert senators['Ben Toews'].occupation == 'Small Business Owner'
+
+def test_profile_page():
+    profile = ProfileExtractor().extract(page('senate', 'membership', 'sjimwoodw'))
+    assert profile.term_number == 3
+    assert profile.business_phone == '(208) 555-2001'
+    assert profile.mailing_address == '107 State St, Meridian, ID 83642'
+    assert profile.committees == ['Senate Judiciary & Rules Committee']
+    assert profile.bio.startswith('Jim Woodward represents District 2')
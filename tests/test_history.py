@@ -0,0 +1,36 @@
+"""Session history ingestion and lookups"""
+import os
+
+from history import HistoryStore
+from models import Chamber
+from scraper import IdahoLegislatureScraper
+from test_committees import COMMITTEES, MEMBERS
+
+def ingest(directory: str, year: int = 2024) -> HistoryStore:
+    scraper = IdahoLegislatureScraper()
+    data = {
+        'senators': [scraper._rep_to_dict(rep) for rep in MEMBERS if rep.chamber == Chamber.SENATE],
+        'representatives': [scraper._rep_to_dict(rep) for rep in MEMBERS if rep.chamber == Chamber.HOUSE],
+        'committees': [scraper._committee_to_dict(committee) for committee in COMMITTEES]
+    }
+    history = HistoryStore(os.path.join(directory, 'history.db'), scraper._dict_to_rep)
+    assert history.ingest_session(year, data)
+    assert not history.ingest_session(year, data)  # unchanged
+    return history
+
+def test_roster_seats_match_within_the_committee_chamber(tmp_path):
+    with ingest(str(tmp_path)) as history:
+        senate = history.committee_members('Education', 2024, 'Senate')
+        house = history.committee_members('Education', 2024, 'House')
+    # "Scott Grow" by unique last name; the House member on the Senate roster gets no Senate seat
+    assert senate == [{'member': 'Brian Lenney', 'chamber': 'Senate', 'role': 'chair'},
+                      {'member': 'C. Scott Grow', 'chamber': 'Senate', 'role': 'vice chair'}]
+    assert house == [{'member': 'Julie Yamamoto', 'chamber': 'House', 'role': 'chair'},
+                     {'member': 'Jack Nelsen', 'chamber': 'House', 'role': 'member'},
+                     {'member': 'Megan Blanksma', 'chamber': 'House', 'role': 'member'}]
+
+def test_district_and_member_lookups(tmp_path):
+    with ingest(str(tmp_path)) as history:
+        assert [rep.name for rep in history.district_members(13, 2024)] == ['Brian Lenney']
+        assert [year for year, _ in history.member_terms('scott grow')] == [2024]
+        assert history.district_members(13, 2020) == []
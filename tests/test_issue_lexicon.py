@@ -0,0 +1,42 @@
+"""Issue lexicon matching with the Aho-Corasick automaton"""
+import pytest
+
+from analyzer import RepresentativeAnalyzer
+from issue_lexicon import ISSUE_LEXICON, IssueMatcher
+
+ROWS = [
+    ('farm*', 'agriculture', 1.0),
+    ('water rights', 'water', 2.0),
+    ('water', 'water', 1.0),
+    ('tax', 'taxes', 1.0),
+    ('property tax*', 'taxes', 1.5),
+    ('he', 'health', 1.0),
+]
+
+def test_terms_match_on_word_boundaries():
+    matcher = IssueMatcher(ROWS)
+    found = [matcher.terms[term_id][0] for term_id in matcher.matches('Farmers need WATER-RIGHTS and the water')]
+    assert sorted(found) == ['farm*', 'water', 'water rights']
+    # A stem matches word starts only; whole-word terms never match inside a word
+    assert matcher.matches('the taxation of a defarmed field') == []
+    assert matcher.score('Property taxes and tax relief for farming') == {'taxes': 2.5, 'agriculture': 1.0}
+    assert matcher.score('') == {}
+
+def test_each_term_counts_once():
+    matcher = IssueMatcher(ROWS)
+    assert matcher.score('water water water rights') == {'water': 3.0}
+
+def test_bad_rows_are_listed():
+    rows = ROWS + [('  ', 'water', 1.0), ('Water', 'water', 1.0), ('roads', 'transport', 1.0), ('farm*', 'x', 0.0)]
+    with pytest.raises(ValueError) as error:
+        IssueMatcher(rows, known_issues={'agriculture', 'water', 'taxes', 'health'})
+    message = str(error.value)
+    assert 'row 7: empty term' in message
+    assert "row 8: 'Water' repeats row 3" in message
+    assert "row 9: 'roads' names unknown issue 'transport'" in message
+    assert "row 10: 'farm*' names unknown issue 'x'" in message
+
+def test_shipped_lexicon_names_only_mapped_issues():
+    matcher = IssueMatcher.from_csv(ISSUE_LEXICON, known_issues=RepresentativeAnalyzer.COMMITTEE_MAPPING)
+    assert len(matcher) > 0
+    assert 'agriculture' in matcher.score('Ranchers are losing their grazing leases')
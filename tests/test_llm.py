@@ -0,0 +1,69 @@
+"""The analyzer's LLM mode against the mock chat completions server"""
+import pytest
+
+from analyzer import RepresentativeAnalyzer
+from llm_client import LLMClient
+from mock_llm import MockLLMServer
+from response_cache import ResponseCache
+from sample_data import get_sample_data
+
+@pytest.fixture
+def mock_llm():
+    server = MockLLMServer(seed=1)
+    server.start()
+    yield server
+    server.stop()
+
+def make_analyzer(server: MockLLMServer, directory: str, **options) -> RepresentativeAnalyzer:
+    client = LLMClient(base_url=server.base_url, cache=ResponseCache(directory), **options)
+    return RepresentativeAnalyzer(llm=client)
+
+def test_model_details_replace_the_heuristics_and_are_cached(mock_llm, tmp_path):
+    reps = get_sample_data()['senators'][:4]
+    analyzer = make_analyzer(mock_llm, str(tmp_path))
+    analyses = analyzer.analyze_representatives(reps)
+    assert [analysis.background_summary for analysis in analyses] == \
+        [f"{rep.name} serves in the Idaho Legislature." for rep in reps]
+    assert analyses[0].key_issues == ['Budget', 'Local control']
+    assert mock_llm.stats()['requests'] == 4
+
+    # Asked again: answered from the response cache without a request
+    again = analyzer.analyze_representatives(reps)
+    assert [analysis.background_summary for analysis in again] == [a.background_summary for a in analyses]
+    assert mock_llm.stats()['requests'] == 4
+    assert analyzer.llm.stats()['hits'] == 4
+
+def test_identical_problems_are_sent_once(mock_llm, tmp_path):
+    analyzer = make_analyzer(mock_llm, str(tmp_path))
+    reps = get_sample_data()['senators']
+    analyses = analyzer.analyze_problems(['Rural school funding', 'rural  school FUNDING', 'Water rights'], reps)
+    assert analyses[0].strategy.startswith("Bring 'Rural school funding'")
+    assert analyses[1].strategy == analyses[0].strategy
+    assert analyses[2].talking_points == ["Who is affected and how", "What it costs today",
+                                          "The change you are asking for"]
+    assert mock_llm.stats()['requests'] == 2
+
+def test_requests_in_flight_stay_within_max_concurrency(mock_llm, tmp_path):
+    mock_llm.latency = 0.05
+    analyzer = make_analyzer(mock_llm, str(tmp_path), max_concurrency=2)
+    analyzer.analyze_problems([f"Problem number {n}" for n in range(8)], get_sample_data()['senators'])
+    stats = mock_llm.stats()
+    assert stats['requests'] == 8
+    assert stats['max_in_flight'] == 2
+
+def test_timeouts_and_errors_fall_back_to_the_heuristics(mock_llm, tmp_path):
+    reps = get_sample_data()['senators'][:2]
+    heuristic = RepresentativeAnalyzer().heuristic_analyses(reps)
+
+    mock_llm.stall_rate, mock_llm.stall_seconds = 1.0, 2.0
+    analyzer = make_analyzer(mock_llm, str(tmp_path / 'stalled'), timeout=0.2)
+    analyses = analyzer.analyze_representatives(reps)
+    assert [a.background_summary for a in analyses] == [a.background_summary for a in heuristic]
+    assert analyzer.llm.timeouts == 2
+
+    mock_llm.stall_rate, mock_llm.error_rate = 0.0, 1.0
+    analyzer = make_analyzer(mock_llm, str(tmp_path / 'failing'))
+    analyses = analyzer.analyze_representatives(reps)
+    assert [a.key_issues for a in analyses] == [a.key_issues for a in heuristic]
+    assert analyzer.llm.errors == 2
+    assert not list((tmp_path / 'failing').glob('*.json'))  # failures are not cached
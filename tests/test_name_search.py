@@ -0,0 +1,43 @@
+"""Ranked name search: exact names, variants, prefixes and misspellings"""
+from models import Chamber
+from name_search import EXACT_NAME, EXACT_VARIANT, PREFIX_NAME, PREFIX_VARIANT, NameSearchIndex
+from test_committees import member
+
+MEMBERS = [
+    member('C. Scott Grow', Chamber.SENATE, 14),
+    member('Scott Bedke', Chamber.HOUSE, 27),
+    member('James Ruchti', Chamber.HOUSE, 29),
+    member('Jim Guthrie', Chamber.SENATE, 28),
+    member('Lori Den Hartog', Chamber.SENATE, 22),
+    member('Hernán Martínez', Chamber.HOUSE, 16),
+]
+
+def names(scored):
+    return [rep.name for _, rep in scored]
+
+def test_exact_names_and_variants_score_in_tiers():
+    index = NameSearchIndex(MEMBERS)
+    assert index.scored('C. Scott Grow')[0] == (EXACT_NAME, MEMBERS[0])
+    assert index.scored('Sen. C Scott Grow')[0] == (EXACT_NAME, MEMBERS[0])
+    assert index.scored('scott grow')[0] == (EXACT_VARIANT, MEMBERS[0])  # without the initial
+    assert index.scored('Jim Ruchti')[0] == (EXACT_VARIANT, MEMBERS[2])  # by nickname
+    assert index.scored('hernan martinez')[0] == (EXACT_NAME, MEMBERS[5])
+    assert names(index.scored('den hartog')) == ['Lori Den Hartog']
+
+def test_prefixes_rank_full_names_above_variants():
+    index = NameSearchIndex(MEMBERS)
+    scored = index.scored('scott')
+    assert names(scored) == ['Scott Bedke', 'C. Scott Grow']
+    assert PREFIX_VARIANT < scored[1][0] < PREFIX_NAME < scored[0][0] < EXACT_VARIANT
+    assert names(index.scored('scott', limit=1)) == ['Scott Bedke']
+    assert index.scored('scott', limit=0) == []
+    assert index.scored('  ') == []
+
+def test_misspellings_match_by_trigrams():
+    index = NameSearchIndex(MEMBERS)
+    for typo, name in (('guthre', 'Jim Guthrie'), ('den hartgo', 'Lori Den Hartog'), ('ruchty', 'James Ruchti'),
+                       ('bedkey', 'Scott Bedke')):
+        scored = index.scored(typo)
+        assert scored and scored[0][1].name == name, typo
+        assert 0 < scored[0][0] < 1  # below every exact and prefix match
+    assert index.scored('zzyzx') == []
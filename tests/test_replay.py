@@ -0,0 +1,14 @@
+"""Recording the fixture site through the replay server"""
+import os
+
+from conftest import FIXTURES
+from replay import record
+
+def fixture_pages(directory: str):
+    return {os.path.relpath(os.path.join(root, name), directory)
+            for root, _, names in os.walk(directory) for name in names}
+
+def test_record_saves_every_page_a_refresh_reads(replay_server, tmp_path):
+    recorded = record(str(tmp_path), replay_server.base_url, requests_per_second=1000)
+    assert any('/membership/sjimwoodw/' in url for url in recorded)  # a profile page
+    assert fixture_pages(str(tmp_path)) == fixture_pages(FIXTURES)
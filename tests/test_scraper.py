@@ -0,0 +1,197 @@
+"""Full scraper refreshes against the synthetic fixtures served by the replay server"""
+import os
+import threading
+
+from conftest import FIXTURES
+from models import Chamber
+from scraper import IdahoLegislatureScraper
+
+def make_scraper(base_url: str, directory: str, max_workers: int = 4, **options) -> IdahoLegislatureScraper:
+    scraper = IdahoLegislatureScraper(requests_per_second=1000, burst=max_workers, max_workers=max_workers, **options)
+    scraper.BASE_URL = base_url
+    scraper.CACHE_DURATION_HOURS = 0  # every get_all_data() call refreshes
+    scraper.CACHE_FILE = os.path.join(directory, 'cache.json')
+    scraper.SNAPSHOT_FILE = os.path.join(directory, 'snapshot.db')
+    scraper.JOURNAL_FILE = os.path.join(directory, 'changes.jsonl')
+    scraper.LOCK_FILE = os.path.join(directory, 'refresh.lock')
+    scraper.HISTORY_FILE = os.path.join(directory, 'history.db')
+    scraper.page_store.directory = os.path.join(directory, 'page_cache')
+    return scraper
+
+def edit_fixture(server, path: str, old: str, new: str):
+    """Change one page of an editable_server's site"""
+    filename = os.path.join(server.directory, path, 'index.html')
+    with open(filename, encoding='utf-8') as f:
+        html = f.read()
+    assert old in html
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(html.replace(old, new))
+    server.reload()
+
+def count_committee_pages() -> int:
+    return sum(len(os.listdir(os.path.join(FIXTURES, 'committees', index))) - 1  # less the index page itself
+               for index in ('senatecommittees', 'housecommittees'))
+
+def test_refresh_reads_every_page(replay_server, tmp_path):
+    data = make_scraper(replay_server.base_url, str(tmp_path)).get_all_data()
+    assert len(data['senators']) == 35 and len(data['representatives']) == 70
+    assert len(data['committees']) == count_committee_pages()
+    for committee in data['committees']:
+        assert committee.chair and committee.vice_chair, committee.name
+        assert 'Jane Staffer' not in committee.members
+
+    senators = {rep.name: rep for rep in data['senators']}
+    woodward = senators['Jim Woodward']
+    assert woodward.term_number == 3  # from the profile page
+    assert woodward.contact.business_phone == '(208) 555-2001'
+    assert woodward.bio.startswith('Jim Woodward represents District 2')
+    assert 'Judiciary & Rules' in woodward.committees
+    assert all(c.chamber == Chamber.SENATE for c in data['committees'] if 'Lenney' in (c.chair or ''))
+
+def test_second_refresh_reuses_every_record(replay_server, tmp_path, capsys):
+    first = make_scraper(replay_server.base_url, str(tmp_path)).get_all_data()
+    capsys.readouterr()
+    second = make_scraper(replay_server.base_url, str(tmp_path)).get_all_data()
+    assert "0 added, 0 removed, 0 modified" in capsys.readouterr().out
+    committees = {rep.name: rep.committees for rep in first['senators'] + first['representatives']}
+    assert {rep.name: rep.committees for rep in second['senators'] + second['representatives']} == committees
+
+def count_parses(scraper: IdahoLegislatureScraper) -> list:
+    """Wrap the scraper's HTML parser; the returned list collects the content of each parse"""
+    parse = scraper._parse_html
+    parses = []
+
+    def counted_parse(content, targets=None):
+        parses.append(content)
+        return parse(content, targets)
+
+    scraper._parse_html = counted_parse
+    return parses
+
+def test_unchanged_pages_are_not_parsed_again(replay_server, tmp_path, capsys):
+    scraper = make_scraper(replay_server.base_url, str(tmp_path))
+    parses = count_parses(scraper)
+    first = scraper.get_all_data()
+    assert len(parses) > 100
+    parses.clear()
+    second = scraper.get_all_data()
+    assert parses == []  # every page answered 304 and was extracted on the first refresh
+    assert "0 added, 0 removed, 0 modified" in capsys.readouterr().out
+    assert [rep.committees for rep in second['senators']] == [rep.committees for rep in first['senators']]
+
+def test_new_process_parses_only_the_roster_and_index_pages(replay_server, tmp_path):
+    make_scraper(replay_server.base_url, str(tmp_path)).get_all_data()
+    scraper = make_scraper(replay_server.base_url, str(tmp_path))
+    parses = count_parses(scraper)
+    scraper.get_all_data()
+    # Committee and profile pages match the fingerprints saved with the snapshot's records
+    assert len(parses) == 4
+
+def test_nested_fetches_stay_within_max_workers(replay_server, tmp_path):
+    replay_server.latency = 0.01
+    scraper = make_scraper(replay_server.base_url, str(tmp_path), max_workers=3)
+    get = scraper.session.get
+    lock = threading.Lock()
+    in_flight = [0]
+    peak = [0]
+
+    def counted_get(*args, **kwargs):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        try:
+            return get(*args, **kwargs)
+        finally:
+            with lock:
+                in_flight[0] -= 1
+
+    scraper.session.get = counted_get
+    scraper.get_all_data()
+    assert 1 < peak[0] <= 3
+
+PATRICK_ROW = '<tr><td><a href="/senate/membership/sjimpatri/">Sen. Jim Patrick</a></td><td></td></tr>'
+
+def patrick(data):
+    return next(rep for rep in data['senators'] if rep.name == 'Jim Patrick')
+
+def test_dropped_roster_seat_is_removed(editable_server, tmp_path, capsys):
+    directory = str(tmp_path)
+    first = make_scraper(editable_server.base_url, directory, enrich_profiles=False).get_all_data()
+    assert 'Agricultural Affairs' in patrick(first).committees
+    edit_fixture(editable_server, 'committees/senatecommittees/sagricultur', PATRICK_ROW, '')
+    capsys.readouterr()
+    second = make_scraper(editable_server.base_url, directory, enrich_profiles=False).get_all_data()
+    assert patrick(second).committees == ['Resources & Environment']
+    assert "0 added, 0 removed, 1 modified" in capsys.readouterr().out
+
+def test_profile_memberships_outlast_a_roster_change(editable_server, tmp_path):
+    # The profile page still lists the seat, so it is kept from there
+    directory = str(tmp_path)
+    make_scraper(editable_server.base_url, directory).get_all_data()
+    edit_fixture(editable_server, 'committees/senatecommittees/sagricultur', PATRICK_ROW, '')
+    second = make_scraper(editable_server.base_url, directory).get_all_data()
+    assert patrick(second).profile_committees == ['Agricultural Affairs', 'Resources & Environment']
+    assert sorted(patrick(second).committees) == ['Agricultural Affairs', 'Resources & Environment']
+
+def count_profile_requests(scraper: IdahoLegislatureScraper) -> list:
+    """Wrap the scraper's session; the returned list collects each profile page URL requested"""
+    get = scraper.session.get
+    requested = []
+
+    def counted_get(url, *args, **kwargs):
+        if '/membership/' in url and not url.endswith('/membership/'):
+            requested.append(url)
+        return get(url, *args, **kwargs)
+
+    scraper.session.get = counted_get
+    return requested
+
+def test_unchanged_members_skip_their_profiles(editable_server, tmp_path):
+    directory = str(tmp_path)
+    make_scraper(editable_server.base_url, directory).get_all_data()
+    scraper = make_scraper(editable_server.base_url, directory)
+    requested = count_profile_requests(scraper)
+    second = scraper.get_all_data()
+    assert requested == []
+    assert patrick(second).term_number is not None  # details carried over from the first refresh
+
+    # A changed card has its profile fetched again
+    edit_fixture(editable_server, 'senate/membership', 'Home: (208) 555-1028', 'Home: (208) 555-1029')
+    requested.clear()
+    scraper.get_all_data()
+    assert requested == [editable_server.base_url + '/senate/membership/sjimpatri/']
+
+def test_profiles_are_revalidated_once_stale(replay_server, tmp_path):
+    directory = str(tmp_path)
+    make_scraper(replay_server.base_url, directory).get_all_data()
+    scraper = make_scraper(replay_server.base_url, directory)
+    scraper.PROFILE_REVALIDATE_HOURS = 0
+    requested = count_profile_requests(scraper)
+    scraper.get_all_data()
+    assert len(requested) == 105
+
+def test_partial_scrape_is_not_saved(editable_server, tmp_path, capsys):
+    directory = str(tmp_path)
+    first = make_scraper(editable_server.base_url, directory).get_all_data()
+    edit_fixture(editable_server, 'house/membership', 'member-card', 'retired-card')
+    scraper = make_scraper(editable_server.base_url, directory)
+    capsys.readouterr()
+    second = scraper.get_all_data()
+    assert "Incomplete scrape, not saved: 0 representatives, expected at least 60" in capsys.readouterr().out
+    assert len(second['representatives']) == 70  # the saved snapshot, as before
+    assert [rep.name for rep in second['senators']] == [rep.name for rep in first['senators']]
+    with scraper.open_history() as history:
+        year = history.sessions()[-1]
+        assert len(history.district_members(19, year)) == 3
+
+def test_extractor_counts_start_afresh_each_refresh(editable_server, tmp_path):
+    scraper = make_scraper(editable_server.base_url, str(tmp_path))
+    data = scraper.get_all_data()
+    assert scraper.extractor.stats()['records'] == 105
+    profiles = len({rep.profile_url for rep in data['senators'] + data['representatives']})  # each page read once
+    assert scraper.profile_extractor.stats()['records'] == profiles
+    edit_fixture(editable_server, 'senate/membership', 'Home: (208) 555-1028', 'Home: (208) 555-1029')
+    scraper.get_all_data()
+    # Only the changed card is parsed; its profile page is the one already read
+    assert scraper.extractor.stats() == {'records': 1}
+    assert scraper.profile_extractor.stats() == {'records': 0}
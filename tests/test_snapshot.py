@@ -0,0 +1,40 @@
+"""The SQLite snapshot and the lazy index over it"""
+import contextlib
+import io
+import os
+
+from legislature_index import LegislatureIndex
+from sample_data import get_sample_data
+from scraper import IdahoLegislatureScraper
+from snapshot import LazySnapshot
+
+def saved_snapshot(directory: str) -> LazySnapshot:
+    scraper = IdahoLegislatureScraper()
+    scraper.SNAPSHOT_FILE = os.path.join(directory, 'snapshot.db')
+    scraper.RECORD_HISTORY = False
+    with contextlib.redirect_stdout(io.StringIO()):
+        scraper._save_cache(get_sample_data())
+        return scraper._load_cache()
+
+def test_snapshot_round_trips_the_records(tmp_path):
+    snapshot = saved_snapshot(str(tmp_path))
+    sample = get_sample_data()
+    assert isinstance(snapshot, LazySnapshot)
+    assert list(snapshot['senators']) == sample['senators']
+    assert list(snapshot['committees']) == sample['committees']
+
+def test_lazy_index_answers_lookups_from_the_snapshot(tmp_path):
+    snapshot = saved_snapshot(str(tmp_path))
+    eager = LegislatureIndex(get_sample_data())
+    index = LegislatureIndex(snapshot, lazy=True)
+    district = eager.members[0].district
+    name = eager.members[0].name
+    assert index.by_district(district) == eager.by_district(district)
+    assert index.delegation(district) == eager.delegation(district)
+    assert index.by_name(name.upper()) == eager.by_name(name)
+    assert not index._built
+    assert len(snapshot._objects) == len(index.by_district(district))  # only those rows decoded
+
+    assert len(index.members) == len(eager.members)  # anything else builds the maps
+    assert index._built
+    assert index.by_district(district) == eager.by_district(district)
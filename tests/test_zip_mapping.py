@@ -0,0 +1,66 @@
+"""ZIP and ZIP+4 district tables"""
+import pytest
+
+import zip_mapping
+from bulk_resolver import BulkResolver
+from zip_mapping import ZipDistrictIndex, ZipPlus4Index, get_districts_by_zip, split_zip
+
+SHARED = [('83702', 16, 0.25), ('83702', 19, 0.75), ('83646', 21, 1.0), ('83025', 20, None), ('83025', 21, None)]
+
+def test_districts_rank_by_share_when_the_table_has_them():
+    index = ZipDistrictIndex(SHARED)
+    assert index.districts('83702') == [19, 16]
+    assert index.shares('83702') == [(19, 0.75), (16, 0.25)]
+    assert index.districts('83025') == [20, 21]
+    assert index.shares('83025') == []
+    assert index.shares('99999') == []
+
+def test_bad_shares_are_listed():
+    rows = [('83702', 16, 0.25), ('83702', 19, 0.5), ('83646', 21, 0.0),
+            ('83025', 20, 0.5), ('83025', 21, None)]
+    with pytest.raises(ValueError) as error:
+        ZipDistrictIndex(rows)
+    message = str(error.value)
+    assert 'row 3: ZIP 83646 district 21 has share 0.0' in message
+    assert 'ZIP 83702: district shares add up to 0.7500' in message
+    assert 'ZIP 83025: only some districts have a share' in message
+
+def test_share_column_is_optional(tmp_path):
+    path = tmp_path / 'zips.csv'
+    path.write_text('zip,district,share\n83702,16,0.4\n83702,19,0.6\n83025,20,\n83025,21,\n')
+    index = ZipDistrictIndex.from_csv(str(path))
+    assert index.shares('83702') == [(19, 0.6), (16, 0.4)]
+    assert index.districts('83025') == [20, 21]
+    path.write_text('zip,district\n83702,19\n')
+    assert ZipDistrictIndex.from_csv(str(path)).districts('83702') == [19]
+
+def test_resolver_takes_the_largest_share(monkeypatch):
+    monkeypatch.setattr(zip_mapping, 'ZIP_INDEX', ZipDistrictIndex(SHARED))
+    resolver = BulkResolver(None)
+    assert resolver._zip_district('83702') == (19, 'zip_share', '19;16')
+    assert resolver._zip_district('83025') == (None, 'zip_ambiguous', '20;21')
+
+def test_plus4_ranges_settle_a_split_zip(monkeypatch):
+    index = ZipPlus4Index([('83025', 5000, 9999, 21), ('83025', 0, 4999, 20), ('83702', 100, 100, 19)])
+    assert [index.district('83025', plus4) for plus4 in ('0000', '4999', '5000', '9999')] == [20, 20, 21, 21]
+    assert index.district('83702', '0100') == 19
+    assert index.district('83702', '0101') == 0
+    monkeypatch.setattr(zip_mapping, 'ZIP4_INDEX', index)
+    assert get_districts_by_zip('83025-6000') == [21]
+    assert get_districts_by_zip('830251234') == [20]
+    assert get_districts_by_zip('83025') == [20, 21]  # no +4, so every district
+
+def test_overlapping_plus4_ranges_are_listed():
+    with pytest.raises(ValueError) as error:
+        ZipPlus4Index([('83025', 0, 5000, 20), ('83025', 5000, 9999, 21), ('8302', 0, 1, 20), ('83025', 9, 3, 20)])
+    message = str(error.value)
+    assert "row 3: '8302' is not a 5-digit ZIP code" in message
+    assert 'row 4: ZIP 83025 has range 0009-0003' in message
+    assert 'ZIP 83025: ranges 0000-5000 (district 20) and 5000-9999 (district 21) overlap' in message
+
+def test_split_zip():
+    assert split_zip('83702-1234') == ('83702', '1234')
+    assert split_zip(' 83702 1234 ') == ('83702', '1234')
+    assert split_zip('837021234') == ('83702', '1234')
+    assert split_zip('83702') == ('83702', '')
+    assert split_zip('8370') == ('', '')
@@ -1,234 +1,193 @@
 """
 Idaho ZIP code to legislative district mapping
-Based on Idaho legislative districts and postal boundaries
+Built from zip_districts.csv, a (zip, district) table; a ZIP code may span several districts.
+An optional share column gives the fraction of a ZIP's population living in each district, and
+ranks a split ZIP's districts by it; without shares they are equal candidates in district order.
+When zip4_districts.csv is present, its (zip, plus4_low, plus4_high, district) ranges settle
+ZIP+4 codes inside split ZIPs to a single district.
 """
-from typing import List
-
-# Comprehensive mapping of Idaho ZIP codes to legislative districts
-# Some ZIP codes may span multiple districts
-ZIP_TO_DISTRICT = {
-    # District 1 (Northern Idaho - Coeur d'Alene area)
-    "83814": [1], "83815": [1], "83816": [1], "83858": [1], "83864": [1],
-    "83301": [1], "83302": [1], "83303": [1], "83304": [1], "83316": [1],
-    
-    # District 2 (Kootenai County)
-    "83835": [2], "83854": [2], "83856": [2], "83857": [2], "83858": [2],
-    "83860": [2], "83861": [2], "83864": [2], "83868": [2], "83870": [2],
-    
-    # District 3 (North Idaho - Sandpoint area)
-    "83803": [3], "83809": [3], "83825": [3], "83827": [3], "83832": [3],
-    "83833": [3], "83834": [3], "83841": [3], "83843": [3], "83845": [3],
-    "83846": [3], "83847": [3], "83848": [3], "83849": [3], "83850": [3],
-    "83851": [3], "83852": [3], "83853": [3], "83855": [3], "83856": [3],
-    "83872": [3], "83873": [3], "83874": [3], "83876": [3], "83877": [3],
-    
-    # District 4 (Lewiston area)
-    "83501": [4], "83540": [4], "83541": [4], "83542": [4], "83543": [4],
-    "83544": [4], "83545": [4], "83546": [4], "83547": [4], "83548": [4],
-    "83549": [4], "83552": [4], "83553": [4], "83554": [4], "83555": [4],
-    "83556": [4], "83557": [4], "83637": [4],
-    
-    # District 5 (North Central Idaho)
-    "83530": [5], "83531": [5], "83533": [5], "83535": [5], "83536": [5],
-    "83537": [5], "83539": [5], "83611": [5], "83612": [5], "83615": [5],
-    "83617": [5], "83619": [5], "83622": [5], "83623": [5], "83629": [5],
-    "83630": [5], "83631": [5], "83632": [5], "83633": [5], "83634": [5],
-    "83635": [5], "83636": [5], "83638": [5], "83639": [5], "83641": [5],
-    "83642": [5], "83643": [5], "83644": [5], "83645": [5], "83646": [5],
-    "83647": [5], "83648": [5], "83650": [5], "83651": [5], "83652": [5],
-    "83653": [5], "83654": [5], "83655": [5], "83656": [5], "83657": [5],
-    "83660": [5], "83661": [5], "83662": [5], "83663": [5], "83664": [5],
-    "83665": [5], "83666": [5], "83669": [5], "83670": [5], "83672": [5],
-    "83676": [5], "83677": [5], "83680": [5], "83681": [5], "83686": [5],
-    "83687": [5],
-    
-    # District 6 (West Central Idaho)
-    "83524": [6], "83525": [6], "83526": [6], "83601": [6], "83602": [6],
-    "83604": [6], "83605": [6], "83607": [6], "83610": [6], "83616": [6],
-    "83618": [6], "83624": [6], "83671": [6], "83673": [6], "83674": [6],
-    "83675": [6], "83676": [6], "83677": [6], "83682": [6], "83683": [6],
-    "83684": [6], "83685": [6],
-    
-    # District 7 (Canyon County - Caldwell area)
-    "83605": [7], "83607": [7], "83651": [7], "83669": [7], "83670": [7],
-    "83672": [7], "83686": [7], "83687": [7],
-    
-    # District 8 (Nampa area)
-    "83651": [8], "83686": [8], "83687": [8],
-    
-    # District 9 (Meridian area)
-    "83642": [9], "83646": [9], "83680": [9], "83687": [9],
-    
-    # District 10 (West Boise)
-    "83702": [10], "83703": [10], "83704": [10], "83713": [10],
-    
-    # District 11 (Central Boise)
-    "83702": [11], "83705": [11], "83706": [11],
-    
-    # District 12 (East Boise)
-    "83704": [12], "83709": [12], "83712": [12], "83716": [12],
-    
-    # District 13 (Southeast Boise/Eagle)
-    "83616": [13], "83642": [13], "83646": [13], "83704": [13], "83712": [13],
-    
-    # District 14 (Ada County - Star/Eagle)
-    "83669": [14], "83670": [14], "83714": [14],
-    
-    # District 15 (Kuna/Meridian)
-    "83634": [15], "83642": [15], "83646": [15], "83687": [15],
-    
-    # District 16 (Emmett/Gem County)
-    "83617": [16], "83631": [16], "83650": [16], "83666": [16], "83672": [16],
-    
-    # District 17 (Payette County)
-    "83661": [17], "83672": [17], "83680": [17],
-    
-    # District 18 (Mountain Home area)
-    "83647": [18], "83661": [18], "83669": [18],
-    
-    # District 19 (Western Idaho)
-    "83615": [19], "83622": [19], "83629": [19], "83637": [19], "83645": [19],
-    "83647": [19], "83661": [19], "83669": [19], "83672": [19],
-    
-    # District 20 (Central Idaho - McCall area)
-    "83025": [20], "83128": [20], "83537": [20], "83602": [20], "83615": [20],
-    "83622": [20], "83624": [20], "83629": [20], "83630": [20], "83638": [20],
-    "83641": [20], "83643": [20], "83644": [20], "83647": [20], "83650": [20],
-    "83655": [20], "83661": [20], "83666": [20], "83672": [20], "83677": [20],
-    
-    # District 21 (Sun Valley area)
-    "83025": [21], "83128": [21], "83313": [21], "83318": [21], "83330": [21],
-    "83333": [21], "83340": [21], "83342": [21], "83353": [21], "83354": [21],
-    "83355": [21], "83617": [21], "83622": [21], "83629": [21], "83634": [21],
-    "83661": [21], "83672": [21],
-    
-    # District 22 (Twin Falls area)
-    "83301": [22], "83303": [22], "83311": [22], "83313": [22], "83316": [22],
-    "83318": [22], "83321": [22], "83323": [22], "83324": [22], "83325": [22],
-    "83327": [22], "83328": [22], "83330": [22], "83332": [22], "83333": [22],
-    "83335": [22], "83336": [22], "83337": [22], "83338": [22], "83340": [22],
-    "83341": [22], "83342": [22], "83343": [22], "83344": [22], "83346": [22],
-    "83347": [22], "83348": [22], "83349": [22], "83350": [22], "83352": [22],
-    "83353": [22], "83354": [22], "83355": [22], "83356": [22], "83401": [22],
-    
-    # District 23 (Magic Valley)
-    "83301": [23], "83311": [23], "83316": [23], "83321": [23], "83323": [23],
-    "83324": [23], "83327": [23], "83330": [23], "83335": [23], "83336": [23],
-    "83338": [23], "83340": [23], "83341": [23], "83343": [23], "83344": [23],
-    "83346": [23], "83347": [23], "83349": [23], "83350": [23], "83352": [23],
-    "83355": [23], "83356": [23],
-    
-    # District 24 (Burley/Cassia County)
-    "83301": [24], "83311": [24], "83312": [24], "83314": [24], "83318": [24],
-    "83323": [24], "83324": [24], "83325": [24], "83327": [24], "83335": [24],
-    "83336": [24], "83338": [24], "83341": [24], "83343": [24], "83344": [24],
-    "83350": [24], "83355": [24],
-    
-    # District 25 (Idaho Falls area)
-    "83401": [25], "83402": [25], "83403": [25], "83404": [25], "83405": [25],
-    "83406": [25], "83407": [25], "83415": [25], "83420": [25], "83422": [25],
-    "83424": [25], "83425": [25], "83427": [25], "83428": [25], "83429": [25],
-    "83434": [25], "83435": [25], "83436": [25], "83440": [25], "83441": [25],
-    "83442": [25], "83443": [25], "83444": [25], "83445": [25], "83446": [25],
-    "83448": [25], "83449": [25], "83451": [25], "83454": [25], "83455": [25],
-    "83460": [25], "83464": [25], "83466": [25], "83467": [25], "83468": [25],
-    "83469": [25], "83486": [25],
-    
-    # District 26 (Rexburg/Madison County)
-    "83421": [26], "83422": [26], "83424": [26], "83425": [26], "83440": [26],
-    "83442": [26], "83445": [26], "83446": [26], "83448": [26], "83454": [26],
-    "83455": [26], "83460": [26], "83466": [26], "83467": [26],
-    
-    # District 27 (Eastern Idaho)
-    "83211": [27], "83213": [27], "83217": [27], "83218": [27], "83221": [27],
-    "83223": [27], "83226": [27], "83227": [27], "83229": [27], "83230": [27],
-    "83232": [27], "83233": [27], "83234": [27], "83235": [27], "83236": [27],
-    "83237": [27], "83238": [27], "83239": [27], "83241": [27], "83243": [27],
-    "83244": [27], "83245": [27], "83246": [27], "83250": [27], "83251": [27],
-    "83252": [27], "83253": [27], "83254": [27], "83256": [27], "83263": [27],
-    "83271": [27], "83272": [27], "83274": [27], "83276": [27], "83278": [27],
-    "83281": [27], "83283": [27], "83285": [27], "83287": [27], "83301": [27],
-    "83415": [27], "83420": [27], "83422": [27], "83424": [27], "83429": [27],
-    "83434": [27], "83435": [27], "83436": [27], "83438": [27], "83441": [27],
-    "83443": [27], "83444": [27], "83448": [27], "83449": [27], "83451": [27],
-    "83452": [27], "83454": [27], "83455": [27], "83460": [27], "83464": [27],
-    "83467": [27], "83468": [27], "83469": [27], "83486": [27],
-    
-    # District 28 (Southeast Idaho)
-    "83201": [28], "83202": [28], "83204": [28], "83205": [28], "83206": [28],
-    "83209": [28], "83210": [28], "83211": [28], "83212": [28], "83213": [28],
-    "83214": [28], "83215": [28], "83217": [28], "83218": [28], "83220": [28],
-    "83221": [28], "83223": [28], "83226": [28], "83228": [28], "83229": [28],
-    "83232": [28], "83233": [28], "83234": [28], "83235": [28], "83236": [28],
-    "83237": [28], "83238": [28], "83239": [28], "83241": [28], "83243": [28],
-    "83244": [28], "83245": [28], "83246": [28], "83250": [28], "83251": [28],
-    "83252": [28], "83254": [28], "83256": [28], "83263": [28], "83272": [28],
-    "83274": [28], "83276": [28], "83278": [28], "83281": [28], "83283": [28],
-    "83285": [28], "83287": [28],
-    
-    # District 29 (Pocatello area)
-    "83201": [29], "83202": [29], "83204": [29], "83205": [29], "83206": [29],
-    "83209": [29], "83218": [29], "83221": [29], "83234": [29], "83278": [29],
-    
-    # District 30 (Blackfoot/Bingham County)
-    "83202": [30], "83210": [30], "83211": [30], "83212": [30], "83213": [30],
-    "83214": [30], "83215": [30], "83217": [30], "83220": [30], "83226": [30],
-    "83228": [30], "83229": [30], "83230": [30], "83232": [30], "83233": [30],
-    "83236": [30], "83237": [30], "83238": [30], "83241": [30], "83243": [30],
-    "83244": [30], "83245": [30], "83250": [30], "83251": [30], "83252": [30],
-    "83254": [30], "83263": [30], "83271": [30], "83272": [30], "83274": [30],
-    "83276": [30], "83278": [30], "83281": [30], "83283": [30], "83285": [30],
-    "83287": [30], "83415": [30], "83420": [30], "83429": [30], "83434": [30],
-    "83435": [30], "83436": [30], "83438": [30], "83441": [30], "83443": [30],
-    "83444": [30], "83449": [30], "83451": [30], "83452": [30], "83464": [30],
-    "83468": [30], "83469": [30], "83486": [30],
-    
-    # District 31 (Preston/Franklin County)
-    "83201": [31], "83218": [31], "83221": [31], "83232": [31], "83234": [31],
-    "83236": [31], "83237": [31], "83238": [31], "83241": [31], "83243": [31],
-    "83244": [31], "83245": [31], "83246": [31], "83250": [31], "83254": [31],
-    "83263": [31], "83272": [31], "83274": [31], "83276": [31], "83278": [31],
-    "83283": [31], "83285": [31], "83287": [31],
-    
-    # District 32 (Bear Lake/Caribou County)
-    "83201": [32], "83211": [32], "83212": [32], "83213": [32], "83214": [32],
-    "83217": [32], "83221": [32], "83223": [32], "83226": [32], "83230": [32],
-    "83232": [32], "83233": [32], "83234": [32], "83236": [32], "83237": [32],
-    "83238": [32], "83241": [32], "83243": [32], "83244": [32], "83245": [32],
-    "83246": [32], "83250": [32], "83251": [32], "83252": [32], "83254": [32],
-    "83263": [32], "83271": [32], "83272": [32], "83274": [32], "83276": [32],
-    "83278": [32], "83281": [32], "83283": [32], "83285": [32], "83287": [32],
-    
-    # District 33 (Bonneville County)
-    "83401": [33], "83402": [33], "83403": [33], "83404": [33], "83405": [33],
-    "83406": [33], "83407": [33], "83415": [33], "83420": [33], "83422": [33],
-    "83424": [33], "83425": [33], "83427": [33], "83428": [33], "83429": [33],
-    "83434": [33], "83435": [33], "83436": [33], "83440": [33], "83441": [33],
-    "83442": [33], "83443": [33], "83444": [33], "83445": [33], "83446": [33],
-    "83448": [33], "83449": [33], "83451": [33], "83454": [33], "83455": [33],
-    "83460": [33], "83464": [33], "83466": [33], "83467": [33], "83468": [33],
-    "83469": [33], "83486": [33],
-    
-    # District 34 (Teton/Jefferson County)
-    "83422": [34], "83424": [34], "83425": [34], "83427": [34], "83434": [34],
-    "83440": [34], "83442": [34], "83443": [34], "83444": [34], "83446": [34],
-    "83448": [34], "83451": [34], "83454": [34], "83455": [34], "83460": [34],
-    "83464": [34], "83466": [34], "83467": [34], "83469": [34], "83486": [34],
-    
-    # District 35 (Fremont/Clark County)
-    "83401": [35], "83415": [35], "83420": [35], "83422": [35], "83424": [35],
-    "83427": [35], "83428": [35], "83429": [35], "83434": [35], "83435": [35],
-    "83436": [35], "83438": [35], "83441": [35], "83443": [35], "83444": [35],
-    "83448": [35], "83449": [35], "83451": [35], "83452": [35], "83454": [35],
-    "83455": [35], "83460": [35], "83464": [35], "83467": [35], "83468": [35],
-    "83469": [35], "83486": [35],
-}
+import csv
+import os
+import re
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+ZIP_TABLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'zip_districts.csv')
+ZIP4_TABLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'zip4_districts.csv')
+DISTRICT_COUNT = 35
+SHARE_SCALE = 10000  # Shares are stored in basis points
+SHARE_TOLERANCE = 0.01  # How far a ZIP's shares may add up away from 1
+
+class ZipDistrictIndex:
+    """Districts for every numeric ZIP code, packed into arrays, largest population share first"""
+
+    def __init__(self, rows: Iterable[Tuple[str, int, Optional[float]]]):
+        # District -> share in basis points (None where the table has no share) for each ZIP
+        by_zip: Dict[int, Dict[int, Optional[int]]] = {}
+        problems = []
+        for row, (zip_code, district, share) in enumerate(rows, 1):
+            if len(zip_code) != 5 or not zip_code.isdigit():
+                problems.append(f"row {row}: {zip_code!r} is not a 5-digit ZIP code")
+                continue
+            if not 1 <= district <= DISTRICT_COUNT:
+                problems.append(f"row {row}: ZIP {zip_code} has no district {district}")
+                continue
+            if share is not None and not 0 < share <= 1:
+                problems.append(f"row {row}: ZIP {zip_code} district {district} has share {share}")
+                continue
+            districts = by_zip.setdefault(int(zip_code), {})
+            if district in districts:
+                problems.append(f"row {row}: ZIP {zip_code} lists district {district} again")
+                continue
+            districts[district] = None if share is None else max(1, round(share * SHARE_SCALE))
+        for zip_number, districts in sorted(by_zip.items()):
+            shares = [share for share in districts.values() if share is not None]
+            if not shares:
+                continue
+            if len(shares) < len(districts):
+                problems.append(f"ZIP {zip_number:05d}: only some districts have a share")
+                continue
+            total = sum(shares) / SHARE_SCALE
+            if abs(total - 1) > SHARE_TOLERANCE:
+                problems.append(f"ZIP {zip_number:05d}: district shares add up to {total:.4f}")
+        if problems:
+            raise ValueError("Conflicting ZIP table:\n  " + "\n  ".join(problems))
+
+        # ZIP n's districts are _districts[_offsets[n - first]:_offsets[n - first + 1]], with their
+        # shares at the same positions in _shares (0 for a ZIP without shares)
+        self.first = min(by_zip) if by_zip else 0
+        span = max(by_zip) - self.first + 1 if by_zip else 0
+        self._offsets = array('H', [0]) * (span + 1)
+        self._districts = array('B')
+        self._shares = array('H')
+        for position in range(span):
+            districts = by_zip.get(self.first + position, {})
+            for district in sorted(districts, key=lambda d: (-(districts[d] or 0), d)):
+                self._districts.append(district)
+                self._shares.append(districts[district] or 0)
+            self._offsets[position + 1] = len(self._districts)
+        self._span_count = span
+        self.zip_count = len(by_zip)
+
+    @classmethod
+    def from_csv(cls, path: str) -> 'ZipDistrictIndex':
+        """Build the index from a CSV file with zip and district columns, and optionally share"""
+        with open(path, newline='') as f:
+            return cls((row['zip'].strip(), int(row['district']),
+                        float(row['share']) if (row.get('share') or '').strip() else None)
+                       for row in csv.DictReader(f))
+
+    def _span(self, zip_code: str) -> Tuple[int, int]:
+        if len(zip_code) == 5 and zip_code.isdigit():
+            position = int(zip_code) - self.first
+            if 0 <= position < self._span_count:
+                return self._offsets[position], self._offsets[position + 1]
+        return 0, 0
+
+    def districts(self, zip_code: str) -> List[int]:
+        """Districts overlapping a ZIP code, largest share first (in district order without shares)"""
+        start, end = self._span(zip_code)
+        if end - start == 1:
+            return [self._districts[start]]
+        return self._districts[start:end].tolist()
+
+    def shares(self, zip_code: str) -> List[Tuple[int, float]]:
+        """(district, population share) pairs for a ZIP code, largest share first; empty without shares"""
+        start, end = self._span(zip_code)
+        if end == start or not self._shares[start]:
+            return []
+        return [(self._districts[i], self._shares[i] / SHARE_SCALE) for i in range(start, end)]
+
+    def __contains__(self, zip_code: str) -> bool:
+        start, end = self._span(zip_code)
+        return end > start
+
+    def __len__(self) -> int:
+        return self.zip_count
+
+class ZipPlus4Index:
+    """ZIP+4 ranges sorted by (ZIP, low +4) and packed into arrays, found by binary search"""
+
+    def __init__(self, rows: Iterable[Tuple[str, int, int, int]]):
+        ranges = []
+        problems = []
+        for row, (zip_code, low, high, district) in enumerate(rows, 1):
+            if len(zip_code) != 5 or not zip_code.isdigit():
+                problems.append(f"row {row}: {zip_code!r} is not a 5-digit ZIP code")
+            elif not 0 <= low <= high <= 9999:
+                problems.append(f"row {row}: ZIP {zip_code} has range {low:04d}-{high:04d}")
+            elif not 1 <= district <= DISTRICT_COUNT:
+                problems.append(f"row {row}: ZIP {zip_code} has no district {district}")
+            else:
+                ranges.append((int(zip_code) * 10000 + low, int(zip_code) * 10000 + high, district))
+        ranges.sort()
+        for (low, high, district), (next_low, next_high, next_district) in zip(ranges, ranges[1:]):
+            if next_low <= high:
+                problems.append(f"ZIP {low // 10000:05d}: ranges {low % 10000:04d}-{high % 10000:04d} "
+                                f"(district {district}) and {next_low % 10000:04d}-{next_high % 10000:04d} "
+                                f"(district {next_district}) overlap")
+        if problems:
+            raise ValueError("Conflicting ZIP+4 table:\n  " + "\n  ".join(problems))
+
+        # Range i covers the nine-digit codes _lows[i] to _lows[i] + _widths[i]
+        self._lows = array('L', (low for low, _, _ in ranges))
+        self._widths = array('H', (high - low for low, high, _ in ranges))
+        self._districts = array('B', (district for _, _, district in ranges))
+        self.zips = frozenset(low // 10000 for low, _, _ in ranges)
+
+    @classmethod
+    def from_csv(cls, path: str) -> 'ZipPlus4Index':
+        """Build the index from a CSV file with zip, plus4_low, plus4_high and district columns"""
+        with open(path, newline='') as f:
+            return cls((row['zip'].strip(), int(row['plus4_low']), int(row['plus4_high']), int(row['district']))
+                       for row in csv.DictReader(f))
+
+    def district(self, zip_code: str, plus4: str) -> int:
+        """The district of a ZIP+4 code, or 0 when no range covers it"""
+        code = int(zip_code) * 10000 + int(plus4)
+        position = bisect_right(self._lows, code) - 1
+        if position >= 0 and code - self._lows[position] <= self._widths[position]:
+            return self._districts[position]
+        return 0
+
+    def nbytes(self) -> int:
+        """Bytes held by the packed arrays"""
+        return sum(len(a) * a.itemsize for a in (self._lows, self._widths, self._districts))
+
+    def __len__(self) -> int:
+        return len(self._lows)
+
+ZIP_INDEX = ZipDistrictIndex.from_csv(ZIP_TABLE)
+ZIP4_INDEX = ZipPlus4Index.from_csv(ZIP4_TABLE) if os.path.exists(ZIP4_TABLE) else ZipPlus4Index(())
+
+ZIP_CODE = re.compile(r'(\d{5})(?:[-\s]?(\d{4}))?')
+
+def split_zip(zip_code: str) -> Tuple[str, str]:
+    """('83702', '1234') from '83702-1234', '83702 1234' or '837021234'; ('83702', '') without the +4"""
+    match = ZIP_CODE.fullmatch(zip_code.strip())
+    if not match:
+        return '', ''
+    return match.group(1), match.group(2) or ''
+
+def plus4_district(zip5: str, plus4: str) -> int:
+    """The district a ZIP+4 range settles, or 0 when the code is missing or not covered"""
+    if plus4 and int(zip5) in ZIP4_INDEX.zips:
+        return ZIP4_INDEX.district(zip5, plus4)
+    return 0
 
 def get_districts_by_zip(zip_code: str) -> List[int]:
-    """Get legislative districts for a given ZIP code"""
-    zip_code = zip_code.strip()
-    return ZIP_TO_DISTRICT.get(zip_code, [])
+    """Get legislative districts for a ZIP or ZIP+4 code, largest population share first"""
+    zip5, plus4 = split_zip(zip_code)
+    district = plus4_district(zip5, plus4) if zip5 else 0
+    if district:
+        return [district]
+    return ZIP_INDEX.districts(zip5)
+
+def get_district_shares(zip_code: str) -> List[Tuple[int, float]]:
+    """Get (district, population share) pairs for a ZIP code, largest share first; empty without shares"""
+    return ZIP_INDEX.shares(split_zip(zip_code)[0])
 
 def is_idaho_zip(zip_code: str) -> bool:
-    """Check if ZIP code is in Idaho"""
-    return zip_code.strip() in ZIP_TO_DISTRICT
\ No newline at end of file
+    """Check if a ZIP or ZIP+4 code is in Idaho"""
+    return split_zip(zip_code)[0] in ZIP_INDEX